@@ -193,7 +193,9 @@ def insert_paper(conn, work, category_id, institution_id):
                        locations, announcement_date, submit, alex_paper_id, weekly_count)
     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 0)
     ON CONFLICT (alex_paper_id) DO UPDATE
-    SET title = EXCLUDED.title
+    SET title = EXCLUDED.title,
+        updated_at = CASE WHEN paper.title IS DISTINCT FROM EXCLUDED.title
+                          THEN now() ELSE paper.updated_at END
     RETURNING paper_id;
     """
 
@@ -216,12 +218,15 @@ def insert_abstract(conn, paper_id, work):
     sql = """
     INSERT INTO abstract (paper_id, context)
     VALUES (%s, %s)
-    ON CONFLICT (paper_id) DO UPDATE SET context = EXCLUDED.context;
+    ON CONFLICT (paper_id) DO UPDATE SET context = EXCLUDED.context
+    WHERE abstract.context IS DISTINCT FROM EXCLUDED.context;
     """
 
     with conn.cursor() as cur:
         cur.execute(sql, (paper_id, text))
+        changed = cur.rowcount
         conn.commit()
+    return changed
 
 # 연도 순서대로 정렬 / 없는 년도라면 0으로
 def insert_year_citation(conn, paper_id, work):
@@ -239,12 +244,17 @@ def insert_year_citation(conn, paper_id, work):
     ON CONFLICT (paper_id) DO UPDATE
     SET recent_year1_count = EXCLUDED.recent_year1_count,
         recent_year2_count = EXCLUDED.recent_year2_count,
-        recent_year3_count = EXCLUDED.recent_year3_count;
+        recent_year3_count = EXCLUDED.recent_year3_count
+    WHERE (yearcitation.recent_year1_count, yearcitation.recent_year2_count, yearcitation.recent_year3_count)
+          IS DISTINCT FROM
+          (EXCLUDED.recent_year1_count, EXCLUDED.recent_year2_count, EXCLUDED.recent_year3_count);
     """
 
     with conn.cursor() as cur:
         cur.execute(sql, (paper_id, y1, y2, y3))
+        changed = cur.rowcount
         conn.commit()
+    return changed
 
 
 def insert_author_paper(conn, paper_id, author_id):
@@ -255,6 +265,46 @@ def insert_author_paper(conn, paper_id, author_id):
     """
     with conn.cursor() as cur:
         cur.execute(sql, (paper_id, author_id))
+        changed = cur.rowcount
+        conn.commit()
+    return changed
+
+
+# 인용 그래프 (influence 계산용), 인용 대상은 DB 에 아직 없어도 alex id 로 저장
+#   → 나중에 그 논문이 들어오면 계산 때 paper.alex_paper_id 로 이어짐
+#   목록에서 빠진 인용은 삭제 (상세 응답에는 안 나가므로 touch_paper 안 함)
+def insert_references(conn, paper_id, work):
+    referenced = sorted({
+        url.split("/")[-1].replace("W", "") for url in (work.get("referenced_works") or []) if url
+    })
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "DELETE FROM paperreference WHERE paper_id = %s AND NOT (referenced_alex_id = ANY(%s))",
+            (paper_id, referenced),
+        )
+        cur.execute(
+            """
+            INSERT INTO paperreference (paper_id, referenced_alex_id)
+            SELECT %s, unnest(%s::text[])
+            ON CONFLICT (paper_id, referenced_alex_id) DO NOTHING;
+            """,
+            (paper_id, referenced),
+        )
+        conn.commit()
+
+
+# 상세 API 의 ETag / Last-Modified 용 (abstract / yearcitation / authorpaper 가 바뀐 경우)
+def touch_paper(conn, paper_id):
+    with conn.cursor() as cur:
+        cur.execute("UPDATE paper SET updated_at = now() WHERE paper_id = %s", (paper_id,))
+        conn.commit()
+
+
+# API 결과 캐시 무효화 (papers/caching.py 의 data version +1)
+def bump_data_version(conn):
+    with conn.cursor() as cur:
+        cur.execute("UPDATE data_version SET version = version + 1, changed_at = now() WHERE id = 1")
         conn.commit()
 
 
@@ -297,10 +347,10 @@ def pipeline(work_id):
     paper_id = insert_paper(conn, work, category_id, institution_id)
 
     # 4) abstract
-    insert_abstract(conn, paper_id, work)
+    changed = insert_abstract(conn, paper_id, work)
 
     # 5) year citation
-    insert_year_citation(conn, paper_id, work)
+    changed += insert_year_citation(conn, paper_id, work)
 
     # 6) authors & author_paper
     for auth in authorships:
@@ -321,8 +371,14 @@ def pipeline(work_id):
 
         author_id = insert_author(conn, author_basic)
         if author_id:
-            insert_author_paper(conn, paper_id, author_id)
+            changed += insert_author_paper(conn, paper_id, author_id)
+
+    # 7) 인용 목록
+    insert_references(conn, paper_id, work)
 
+    if changed:
+        touch_paper(conn, paper_id)
+    bump_data_version(conn)
 
     conn.close()
 
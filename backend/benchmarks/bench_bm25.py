@@ -0,0 +1,86 @@
+"""
+search_papers 관련도 검색: Postgres full-text(SQL) vs worker 메모리 BM25 지연시간 비교
+
+    python benchmarks/bench_bm25.py --queries 200
+
+실제 paper/abstract 데이터에서 제목 단어를 뽑아 질의를 만들고 상위 10건 조회 시간을 측정.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "paper_service.settings")
+
+import django
+
+django.setup()
+
+from papers.models import Paper
+from papers.search import fulltext_search
+from papers.services.bm25 import BM25Index, tokenize
+
+
+def percentile(samples, p):
+    return statistics.quantiles(samples, n=100)[p - 1]
+
+
+def measure(fn, queries):
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    print(
+        f"{name:<10} p50={percentile(samples, 50):8.2f}ms  "
+        f"p95={percentile(samples, 95):8.2f}ms  p99={percentile(samples, 99):8.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(42)
+    start = time.perf_counter()
+    index = BM25Index()
+    index.add_from_db()
+    print(f"🔎 BM25 빌드: {len(index)}건 ({time.perf_counter() - start:.1f}s)")
+
+    titles = list(Paper.objects.order_by("?").values_list("title", flat=True)[: args.queries])
+    queries = []
+    for title in titles:
+        tokens = tokenize(title)
+        if tokens:
+            queries.append(" ".join(random.sample(tokens, min(len(tokens), random.randint(1, 3)))))
+    if len(queries) < 2:
+        print("질의를 만들 논문이 부족함")
+        return
+
+    def sql(q):
+        return list(fulltext_search(Paper.objects.all(), q).order_by("-rank", "-pk")[: args.k])
+
+    def bm25(q):
+        hits = index.search(q, args.k)
+        return Paper.objects.in_bulk([pid for pid, _ in hits])
+
+    # 워밍업
+    measure(sql, queries[:10])
+    measure(bm25, queries[:10])
+
+    report("sql", measure(sql, queries))
+    report("bm25", measure(bm25, queries))
+    report("bm25-only", measure(lambda q: index.search(q, args.k), queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+공동 저자 그래프 (services/coauthor.py) 빌드 / 증분 갱신 / 조회 시간
+
+    python benchmarks/bench_coauthor.py                                   # 2M 논문 × 500k 저자
+    python benchmarks/bench_coauthor.py --papers 200000 --authors 50000 --new 1000
+
+DB 없이 가짜 authorpaper 로 측정 (SQL 읽기 시간 제외).
+논문당 저자 수는 1~12 명 (가끔 COAUTHOR_MAX_AUTHORS 를 넘는 대형 공동연구), 저자 생산성은 멱함수 분포.
+조회는 공동 저자가 가장 많은 저자들 (가장 느린 경우) 의 collaborators / 1-hop / 2-hop.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "paper_service.settings")
+
+import django
+
+django.setup()
+
+from papers.services.coauthor import COAUTHOR_MAX_AUTHORS, CoauthorGraph
+
+
+def fake_authorpaper(papers, authors, rng, first_paper=0):
+    # (paper_id, author_id) 중복 없이, 번호가 작은 저자일수록 논문이 많음
+    per_paper = rng.integers(1, 13, papers)
+    per_paper[rng.random(papers) < 0.001] = COAUTHOR_MAX_AUTHORS * 3
+    paper_ids = np.repeat(np.arange(first_paper, first_paper + papers), per_paper)
+    author_ids = (authors * rng.random(len(paper_ids)) ** 2).astype(np.int64)
+    pairs = np.unique(np.stack([paper_ids, author_ids], axis=1), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--papers", type=int, default=2000000)
+    parser.add_argument("--authors", type=int, default=500000)
+    parser.add_argument("--new", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    paper_ids, author_ids = fake_authorpaper(args.papers, args.authors, rng)
+    ap_ids = np.arange(1, len(paper_ids) + 1)
+    print(f"{args.papers:,} papers, {len(np.unique(author_ids)):,} authors, {len(paper_ids):,} authorpaper rows")
+
+    graph, seconds = timed(lambda: CoauthorGraph.from_pairs(
+        paper_ids, author_ids, last_ap_id=int(ap_ids[-1]), rows=len(ap_ids)
+    ))
+    size = sum(a.nbytes for a in (graph.authors, graph.indptr, graph.indices, graph.weights)) / 2 ** 20
+    print(f"\n{'full build':<16} {seconds:>8.2f} s   {graph.edges:,} edges, {size:,.0f} MB")
+
+    # 증분: 새 논문 (기존 저자 + 새 저자) + 기존 논문에 저자 추가 (반반)
+    print(f"\n{'new rows':>10} {'seconds':>8}")
+    for n in args.new:
+        new_p, new_a = fake_authorpaper(max(1, n // 12), args.authors * 2, rng, first_paper=args.papers)
+        old_p = rng.integers(0, args.papers, n // 2)
+        old_a = rng.integers(0, args.authors, n // 2)
+        add_p, add_a = np.r_[new_p, old_p], np.r_[new_a, old_a]
+        # CHANGED_SQL 과 같이: 새 행이 붙은 논문의 기존 행 전부 + 새 행
+        touched = np.isin(paper_ids, add_p)
+        p = np.r_[paper_ids[touched], add_p]
+        a = np.r_[author_ids[touched], add_a]
+        ap = np.r_[ap_ids[touched], ap_ids[-1] + 1 + np.arange(len(add_p))]
+        _, seconds = timed(lambda: graph.apply(p, a, ap, int(ap[-1])))
+        print(f"{len(add_p):>10,} {seconds:>8.2f}")
+
+    degree = np.diff(graph.indptr)
+    print(f"\n{'author':>8} {'degree':>8} {'collab ms':>10} {'1-hop ms':>9} {'2-hop ms':>9} {'nodes':>6} {'edges':>6}")
+    for row in np.argsort(-degree)[:args.top]:
+        aid = int(graph.authors[row])
+        _, collab = timed(lambda: graph.collaborators(aid, 20), repeat=20)
+        _, one = timed(lambda: graph.ego_network(aid, 1, 20), repeat=20)
+        (nodes, edges), two = timed(lambda: graph.ego_network(aid, 2, 20), repeat=20)
+        print(
+            f"{aid:>8} {degree[row]:>8,} {collab * 1000:>10.2f} {one * 1000:>9.2f} {two * 1000:>9.2f}"
+            f" {len(nodes):>6} {len(edges):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+목록 응답 포맷 / 압축 benchmark: payload 크기와 인코딩 시간 (렌더링 + 압축)
+
+    python benchmarks/bench_formats.py                 # 1k, 10k 행
+    python benchmarks/bench_formats.py --rows 500 --repeat 50
+
+DB 없이 bench_serializers.py 와 같은 가짜 paper 행을 RowSerializer 로 dict 로 만든 뒤 측정.
+gzip 은 GZipMiddleware 와 같은 level 6, brotli 는 CompressionMiddleware 의 BROTLI_QUALITY.
+가짜 행은 값이 반복적이라 압축률은 실제보다 좋게 나옴 (시간 비교용).
+"""
+import argparse
+import gzip
+import time
+
+from bench_serializers import as_row, fake_papers
+
+from rest_framework.renderers import JSONRenderer
+
+from papers.middleware import BROTLI_QUALITY, brotli
+from papers.renderers import MessagePackRenderer, ORJSONRenderer, msgpack
+from papers.serializers import PAPER_ROWS
+
+
+def encoders():
+    json_renderer, fast_renderer, msgpack_renderer = JSONRenderer(), ORJSONRenderer(), MessagePackRenderer()
+    yield "json (DRF)", json_renderer.render
+    yield "json (orjson)", fast_renderer.render
+    yield "json + gzip", lambda data: gzip.compress(fast_renderer.render(data), compresslevel=6, mtime=0)
+    if brotli is not None:
+        yield f"json + br (q{BROTLI_QUALITY})", lambda data: brotli.compress(
+            fast_renderer.render(data), quality=BROTLI_QUALITY
+        )
+    if msgpack is not None:
+        yield "msgpack", msgpack_renderer.render
+        yield "msgpack + gzip", lambda data: gzip.compress(msgpack_renderer.render(data), compresslevel=6, mtime=0)
+
+
+def bench(rows, repeat):
+    data = {"results": PAPER_ROWS.to_dicts([as_row(p) for p in fake_papers(rows)]), "next": None}
+    print(f"\n--- {rows:,} rows ---")
+    print(f"{'format':<20} {'bytes':>12} {'ratio':>7} {'encode ms':>10}")
+    base = None
+    for name, encode in encoders():
+        body = encode(data)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            encode(data)
+        ms = (time.perf_counter() - start) / repeat * 1000
+        base = base or len(body)
+        print(f"{name:<20} {len(body):>12,} {len(body) / base:>7.2f} {ms:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        bench(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
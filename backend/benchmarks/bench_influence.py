@@ -0,0 +1,83 @@
+"""
+인용 그래프 influence (services/influence.py) 계산 시간 / 메모리: 균등 시작 vs 이전 결과에서 시작 (warm start)
+
+    python benchmarks/bench_influence.py                          # 1M 논문 × 20M 인용
+    python benchmarks/bench_influence.py --papers 100000 --edges 2000000 --changed 0.01
+
+DB 없이 가짜 인용으로 측정 (SQL 읽기 / 쓰기 시간 제외).
+인용 대상은 멱함수 분포 (소수 논문에 인용이 몰림), 한 논문이 자기 자신을 인용하는 간선은 실제 계산과 같이 뺌.
+warm start 는 간선 --changed 비율을 새로 바꾼 그래프에서 이전 influence 로 시작.
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "paper_service.settings")
+
+import django
+
+django.setup()
+
+from papers.services.influence import pagerank, transition_matrix, warm_start
+
+
+def fake_edges(papers, edges, rng):
+    src = rng.integers(0, papers, edges, dtype=np.int32)
+    dst = (papers * rng.random(edges) ** 3).astype(np.int32)
+    keep = src != dst
+    return src[keep], dst[keep]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--papers", type=int, default=1000000)
+    parser.add_argument("--edges", type=int, default=20000000)
+    parser.add_argument("--changed", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    n = args.papers
+    src, dst = fake_edges(n, args.edges, rng)
+    print(f"{n:,} papers, {len(src):,} edges")
+
+    (M, dangling), seconds = timed(lambda: transition_matrix(n, src, dst))
+    print(f"\n{'matrix':<12} {seconds:>8.2f} s   peak RSS {peak_mb():,.0f} MB")
+
+    (x, iterations, delta), seconds = timed(lambda: pagerank(M, dangling))
+    print(f"{'cold':<12} {seconds:>8.2f} s   {iterations} iterations (delta {delta:.1e})")
+
+    # 간선 일부를 바꾼 그래프
+    changed = int(len(src) * args.changed)
+    idx = rng.choice(len(src), size=changed, replace=False)
+    src[idx] = rng.integers(0, n, changed, dtype=np.int32)
+    dst[idx] = (n * rng.random(changed) ** 3).astype(np.int32)
+    keep = src != dst
+    M, dangling = transition_matrix(n, src[keep], dst[keep])
+    del keep
+    previous = x * n  # paper.influence (float8) 와 같은 정밀도
+
+    (_, iterations, _), seconds = timed(lambda: pagerank(M, dangling))
+    print(f"\n{changed:,} edges changed")
+    print(f"{'cold':<12} {seconds:>8.2f} s   {iterations} iterations")
+    (_, iterations, _), seconds = timed(lambda: pagerank(M, dangling, warm_start(previous)))
+    print(f"{'warm':<12} {seconds:>8.2f} s   {iterations} iterations   peak RSS {peak_mb():,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
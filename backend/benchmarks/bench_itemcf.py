@@ -0,0 +1,96 @@
+"""
+"같이 저장한 논문" (services/itemcf.py) 계산 시간: 전체 재계산 vs dirty 논문 증분 갱신
+
+    python benchmarks/bench_itemcf.py                               # 100k guest × 1M 즐겨찾기
+    python benchmarks/bench_itemcf.py --guests 10000 --favorites 100000 --dirty 10 100
+
+DB 없이 가짜 즐겨찾기로 측정 (SQL 읽기 / 쓰기 시간 제외).
+논문 인기는 멱함수 분포 (소수 논문에 즐겨찾기가 몰림), guest 당 즐겨찾기 수도 한쪽으로 치우침.
+CF_MAX_GUEST_FAVORITES 를 넘는 guest 는 실제 계산과 같이 빠짐.
+증분은 refresh() 와 같은 순서: dirty → 같이 저장된 논문 → 그 논문을 저장한 guest 의 즐겨찾기만으로 행렬.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "paper_service.settings")
+
+import django
+
+django.setup()
+
+from papers.services.itemcf import (
+    CF_CHUNK_ROWS, CF_MAX_GUEST_FAVORITES, CF_TOP_K, favorites_matrix, top_neighbours,
+)
+
+
+def fake_favorites(guests, favorites, papers, rng):
+    # (guest_id, paper_id) 중복 없이 약 favorites 개, 번호가 작을수록 많이 저장 / 많이 저장됨
+    g = (guests * rng.random(favorites * 2) ** 1.5).astype(np.int64)
+    p = (papers * rng.random(favorites * 2) ** 3).astype(np.int64)
+    pairs = np.unique(np.stack([g, p], axis=1), axis=0)
+    return pairs[rng.permutation(len(pairs))[:favorites]]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def full(pairs):
+    X, items = favorites_matrix(pairs)
+    degree = np.asarray(X.sum(axis=0)).ravel()
+    X = X.tocsc()
+    written = 0
+    for start in range(0, len(items), CF_CHUNK_ROWS):
+        rows = np.arange(start, min(start + CF_CHUNK_ROWS, len(items)))
+        written += len(top_neighbours(X, items, rows, degree, CF_TOP_K)[0])
+    return written
+
+
+def incremental(pairs, dirty):
+    # refresh() 의 AFFECTED_SQL / PAIRS_SQL / DEGREE_SQL 을 NumPy 로
+    guest_ids, per_guest = np.unique(pairs[:, 0], return_counts=True)
+    light = pairs[np.isin(pairs[:, 0], guest_ids[per_guest <= CF_MAX_GUEST_FAVORITES])]
+    savers = np.unique(light[np.isin(light[:, 1], dirty), 0])
+    affected = np.union1d(dirty, light[np.isin(light[:, 0], savers), 1])
+    guests = np.unique(light[np.isin(light[:, 1], affected), 0])
+    X, items = favorites_matrix(light[np.isin(light[:, 0], guests)])
+    counts = np.bincount(light[:, 1], minlength=pairs[:, 1].max() + 1)
+    degree = counts[items].astype(np.float32)
+    rows = np.flatnonzero(np.isin(items, affected))
+    return len(affected), len(top_neighbours(X.tocsc(), items, rows, degree, CF_TOP_K)[0])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--guests", type=int, default=100000)
+    parser.add_argument("--favorites", type=int, default=1000000)
+    parser.add_argument("--papers", type=int, default=200000)
+    parser.add_argument("--dirty", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    pairs = fake_favorites(args.guests, args.favorites, args.papers, rng)
+    saved = np.unique(pairs[:, 1])
+    print(f"{len(np.unique(pairs[:, 0])):,} guests, {len(saved):,} papers, {len(pairs):,} favorites")
+
+    written, seconds = timed(lambda: full(pairs))
+    print(f"\n{'full rebuild':<24} {seconds:>8.2f} s   {written:,} neighbours")
+
+    print(f"\n{'dirty papers':>12} {'affected':>10} {'neighbours':>11} {'seconds':>8}")
+    for n in args.dirty:
+        # 최근 즐겨찾기와 비슷하게 인기 논문 / 나머지 섞어서
+        dirty = rng.choice(saved, size=min(n, len(saved)), replace=False)
+        (affected, written), seconds = timed(lambda: incremental(pairs, dirty))
+        print(f"{n:>12,} {affected:>10,} {written:>11,} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
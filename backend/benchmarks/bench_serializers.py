@@ -0,0 +1,96 @@
+"""
+목록 응답 직렬화 micro-benchmark: ModelSerializer + JSONRenderer vs RowSerializer + ORJSONRenderer
+
+    python benchmarks/bench_serializers.py --rows 100 --repeat 2000
+    python benchmarks/bench_serializers.py --db      # 실제 paper 테이블에서 쿼리 포함 측정
+
+기본은 DB 없이 메모리에서 만든 행으로 직렬화 + 렌더링만 측정 (행/초).
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "paper_service.settings")
+
+import django
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from papers.models import Paper
+from papers.renderers import ORJSONRenderer
+from papers.serializers import PAPER_ROWS, PaperSerializer
+
+
+def fake_papers(n):
+    return [
+        Paper(
+            paper_id=i + 1, title=f"Paper title number {i} about graph neural networks",
+            category_id=i % 20 + 1, institution_id=i % 50 + 1, citation=i * 7 % 500,
+            open_access=i % 2 == 0, locations="https://example.org/paper", weekly_count=i % 31,
+            announcement_date=datetime.date(2020, 1, 1) + datetime.timedelta(days=i),
+            submit="NeurIPS", alex_paper_id=f"W{i}",
+        )
+        for i in range(n)
+    ]
+
+
+def as_row(paper):
+    # values_list(*PAPER_ROWS.columns) 가 돌려주는 튜플과 같은 모양
+    return tuple(getattr(paper, col if col not in ("category", "institution") else f"{col}_id")
+                 for col in PAPER_ROWS.columns)
+
+
+def bench(name, fn, rows, repeat):
+    fn()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_page = elapsed / repeat * 1000
+    print(f"{name:<24} {per_page:8.3f} ms/page  {rows * repeat / elapsed:12,.0f} rows/s")
+    return per_page
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--db", action="store_true", help="paper 테이블에서 쿼리까지 포함해서 측정")
+    args = parser.parse_args()
+
+    drf_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+
+    if args.db:
+        qs = Paper.objects.order_by("-paper_id")[: args.rows]
+
+        def drf():
+            return drf_renderer.render(PaperSerializer(list(qs), many=True).data)
+
+        def fast():
+            return fast_renderer.render(PAPER_ROWS.to_dicts(PAPER_ROWS.values(qs)))
+    else:
+        papers = fake_papers(args.rows)
+        tuples = [as_row(p) for p in papers]
+
+        def drf():
+            return drf_renderer.render(PaperSerializer(papers, many=True).data)
+
+        def fast():
+            return fast_renderer.render(PAPER_ROWS.to_dicts(tuples))
+
+        assert drf() == JSONRenderer().render(PAPER_ROWS.to_dicts(tuples))
+
+    base = bench("ModelSerializer+json", drf, args.rows, args.repeat)
+    if not args.db:
+        bench("RowSerializer (dict만)", lambda: PAPER_ROWS.to_dicts(tuples), args.rows, args.repeat)
+    fast_ms = bench("RowSerializer+orjson", fast, args.rows, args.repeat)
+    print(f"speedup x{base / fast_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "paper_service.settings")
+django.setup()
+
+from papers.services.bm25 import BM25_INDEX_PATH, BM25Index, refresh
+
+
+# ===============================
+# BM25 인덱스 snapshot 생성
+#   python build_bm25_index.py                  → DB 전체
+#   python build_bm25_index.py --from-json data → export_to_json.py 결과에서 (abstract 를 DB 에서 안 읽음)
+#   python build_bm25_index.py --update         → 기존 snapshot 에 바뀐 논문만 반영 (ingest 후 cron)
+# worker 는 snapshot 이후 바뀐 논문(data_version / updated_at 기준)을 메모리에서만 반영
+# ===============================
+def main():
+    from papers.caching import data_changed_at, data_version
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--from-json", metavar="DATA_DIR")
+    parser.add_argument("--update", action="store_true")
+    parser.add_argument("--out", default=BM25_INDEX_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.update and os.path.exists(args.out):
+        index = BM25Index.load(args.out)
+        added = refresh(index)
+    elif args.from_json:
+        # json 에는 updated_at 이 없음 → 만든 시점의 version 으로 표시 (이후 바뀐 논문은 refresh 가 반영)
+        index = BM25Index()
+        version, changed_at = data_version(), data_changed_at()
+        added = index.add_from_json(args.from_json)
+        index.version, index.synced_at = version, changed_at
+    else:
+        index = BM25Index()
+        added = refresh(index)
+    index.save(args.out)
+
+    print(f"🔎 BM25 인덱스 {added}건, term {len(index.vocab)}개 → {args.out} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "paper_service.settings")
+django.setup()
+
+from papers.services.semantic import SEMANTIC_INDEX_DIR, SemanticIndex, build_from_db, refresh
+
+
+# ===============================
+# semantic(임베딩) 인덱스 생성
+#   python build_semantic_index.py            → TF-IDF/SVD/IVF 학습 + DB 전체 임베딩
+#   python build_semantic_index.py --update   → 기존 모델로 바뀐 논문(새 논문 포함)만 임베딩해서 append
+# worker 도 background thread 에서 SEMANTIC_REFRESH_INTERVAL 마다 --update 와 같은 증분 반영을 함
+# ===============================
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", default=SEMANTIC_INDEX_DIR)
+    parser.add_argument("--update", action="store_true")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--fit-sample", type=int, default=200000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.update:
+        old = SemanticIndex(args.out)
+        index = refresh(old)
+        print(f"🧭 semantic 인덱스 증분 {index.n_rows - old.n_rows}건 (전체 {len(index)}건)", end=" ")
+    else:
+        index = build_from_db(args.out, dim=args.dim, fit_sample=args.fit_sample)
+        print(
+            f"🧭 semantic 인덱스 {len(index)}건, dim {index.model.dim}, "
+            f"cluster {len(index.model.centroids)}개 → {args.out}", end=" "
+        )
+    print(f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
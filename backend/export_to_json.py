@@ -159,6 +159,21 @@ def export_authorpaper(cur):
     save_json("authorpaper.json", data)
 
 
+def export_paperreference(cur):
+    cur.execute("SELECT paper_id, referenced_alex_id FROM paperreference;")
+    rows = cur.fetchall()
+
+    cur.execute("SELECT paper_id, alex_paper_id FROM paper;")
+    paper_map = {r[0]: r[1] for r in cur.fetchall()}
+
+    data = [
+        {"alex_paper_id": paper_map[r[0]], "referenced_alex_id": r[1]}
+        for r in rows
+    ]
+
+    save_json("paperreference.json", data)
+
+
 def export_guest(cur):
     cur.execute("SELECT guest_id, guestname, pwd, interest_1, interest_2, interest_3 FROM guest;")
     rows = cur.fetchall()
@@ -235,6 +250,7 @@ def main():
     export_author(cur)
     export_paper(cur)                # abstract + yearcitation 포함
     export_authorpaper(cur)
+    export_paperreference(cur)
     export_guest(cur)
     export_guestfavorite(cur)
     export_guestcategorycount(cur)
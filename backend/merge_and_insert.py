@@ -152,6 +152,14 @@ def insert_author(cur, items):
     execute_batch(cur, sql, data)
 
 
+# ===============================
+# paper.updated_at 갱신 (상세 API 의 ETag / Last-Modified)
+#   paper 행은 upsert 에서 값이 바뀐 경우만, abstract / yearcitation / authorpaper 는 바뀌면 여기로
+# ===============================
+def touch_paper(cur, paper_id):
+    cur.execute("UPDATE paper SET updated_at = now() WHERE paper_id = %s", (paper_id,))
+
+
 # ===============================
 # INSERT PAPER (abstract + yearcitation 포함)
 # ===============================
@@ -174,7 +182,14 @@ def insert_paper(cur, items):
             open_access = EXCLUDED.open_access,
             locations = EXCLUDED.locations,
             announcement_date = EXCLUDED.announcement_date,
-            submit = EXCLUDED.submit;
+            submit = EXCLUDED.submit,
+            updated_at = CASE
+                WHEN (paper.title, paper.category_id, paper.institution_id, paper.citation,
+                      paper.open_access, paper.locations, paper.announcement_date, paper.submit)
+                     IS DISTINCT FROM
+                     (EXCLUDED.title, EXCLUDED.category_id, EXCLUDED.institution_id, EXCLUDED.citation,
+                      EXCLUDED.open_access, EXCLUDED.locations, EXCLUDED.announcement_date, EXCLUDED.submit)
+                THEN now() ELSE paper.updated_at END;
     """
 
     for p in items:
@@ -210,10 +225,13 @@ def insert_paper(cur, items):
                 INSERT INTO abstract (paper_id, context)
                 VALUES (%s, %s)
                 ON CONFLICT (paper_id) DO UPDATE
-                SET context = EXCLUDED.context;
+                SET context = EXCLUDED.context
+                WHERE abstract.context IS DISTINCT FROM EXCLUDED.context;
             """,
                 (pid, p["abstract"]),
             )
+            if cur.rowcount:
+                touch_paper(cur, pid)
 
         # -------------------
         # YEAR-CITATION 저장
@@ -231,10 +249,15 @@ def insert_paper(cur, items):
                 ON CONFLICT (paper_id) DO UPDATE
                 SET recent_year1_count = EXCLUDED.recent_year1_count,
                     recent_year2_count = EXCLUDED.recent_year2_count,
-                    recent_year3_count = EXCLUDED.recent_year3_count;
+                    recent_year3_count = EXCLUDED.recent_year3_count
+                WHERE (yearcitation.recent_year1_count, yearcitation.recent_year2_count, yearcitation.recent_year3_count)
+                      IS DISTINCT FROM
+                      (EXCLUDED.recent_year1_count, EXCLUDED.recent_year2_count, EXCLUDED.recent_year3_count);
             """,
                 (pid, counts[0], counts[1], counts[2]),
             )
+            if cur.rowcount:
+                touch_paper(cur, pid)
 
 
 # ===============================
@@ -259,6 +282,38 @@ def insert_authorpaper(cur, items):
         if pid and aid:
             data.append((pid, aid))
 
+    # 새로 들어간 관계(ap_id > 기존 최대값)의 논문만 updated_at 갱신
+    cur.execute("SELECT COALESCE(MAX(ap_id), 0) FROM authorpaper")
+    last_ap_id = cur.fetchone()[0]
+    execute_batch(cur, sql, data)
+    cur.execute(
+        "UPDATE paper SET updated_at = now() WHERE paper_id IN (SELECT paper_id FROM authorpaper WHERE ap_id > %s)",
+        (last_ap_id,),
+    )
+
+
+# ===============================
+# INSERT PAPER REFERENCE (인용 그래프)
+# ===============================
+def insert_paperreference(cur, items):
+    if not items:
+        return
+
+    print("📚 인용 관계 처리...")
+
+    sql = """
+        INSERT INTO paperreference (paper_id, referenced_alex_id)
+        VALUES (%s, %s)
+        ON CONFLICT (paper_id, referenced_alex_id) DO NOTHING;
+    """
+
+    # 인용 대상은 DB 에 없어도 그대로 저장 (influence 계산 때 alex_paper_id 로 join)
+    data = []
+    for r in items:
+        pid = get_paper_id(cur, r["alex_paper_id"])
+        if pid and r.get("referenced_alex_id"):
+            data.append((pid, r["referenced_alex_id"]))
+
     execute_batch(cur, sql, data)
 
 
@@ -346,6 +401,13 @@ def insert_guestcategory(cur, items):
     execute_batch(cur, sql, data)
 
 
+# ===============================
+# API 결과 캐시 무효화 (papers/caching.py 의 data version +1)
+# ===============================
+def bump_data_version(cur):
+    cur.execute("UPDATE data_version SET version = version + 1, changed_at = now() WHERE id = 1")
+
+
 # ===============================
 # MAIN
 # ===============================
@@ -360,9 +422,11 @@ def main():
     insert_author(cur, load_json("author.json"))
     insert_paper(cur, load_json("paper.json"))
     insert_authorpaper(cur, load_json("authorpaper.json"))
+    insert_paperreference(cur, load_json("paperreference.json"))
     insert_guest(cur, load_json("guest.json"))
     insert_guestfavorite(cur, load_json("guestfavorite.json"))
     insert_guestcategory(cur, load_json("guestcategorycount.json"))
+    bump_data_version(cur)
 
     conn.commit()
     cur.close()
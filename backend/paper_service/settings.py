@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'papers',
     'corsheaders',
@@ -45,6 +46,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # gzip / brotli 응답 압축 (본문을 바꾸는 다른 middleware 보다 바깥쪽)
+    'papers.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -122,6 +125,25 @@ USE_TZ = True
 
 USE_KAFKA = False
 
+# API 결과 캐시 (papers/caching.py)
+#   locmem: worker 별 메모리 (기본) / file: data/cache 디렉터리를 worker 끼리 공유
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv("CACHE_DIR", str(BASE_DIR / "data" / "cache")),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    } if CACHE_BACKEND == "file" else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'paper-service',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+# 테스트 DB 는 운영 DB 와 같은 SQL 스키마로 생성 (papers/test_runner.py)
+TEST_RUNNER = 'papers.test_runner.SchemaSQLTestRunner'
+SCHEMA_SQL_PATH = os.getenv("SCHEMA_SQL_PATH", str(BASE_DIR.parent / "docker" / "postgres" / "table_schema.sql"))
+
 CORS_ALLOW_ALL_ORIGINS = True
 
 # Static files (CSS, JavaScript, Images)
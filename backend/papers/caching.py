@@ -0,0 +1,184 @@
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.db.models.functions import Now
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+from rest_framework.response import Response
+
+from .models import DataVersion
+
+RESULT_CACHE_ALIAS = getattr(settings, "RESULT_CACHE_ALIAS", "default")
+RESULT_CACHE_TIMEOUT = getattr(settings, "RESULT_CACHE_TIMEOUT", 600)
+
+# 다른 프로세스(ingest 스크립트, 다른 worker)의 version 변경이 보이기까지 최대 지연 (초)
+DATA_VERSION_TTL = getattr(settings, "DATA_VERSION_TTL", 5)
+
+_version = None
+_changed_at = None
+_version_checked = 0.0
+
+# cached_view 로 감싼 endpoint 이름 (stats 용)
+CACHED_VIEWS = []
+
+
+# --------------------------------------------------------
+# 📌 전역 data version
+#   캐시 키에 version 을 넣어두면 +1 한 번으로 이전 결과 전체가 무효화됨 (scan/delete 없음)
+#   이전 키들은 timeout / backend 의 cull 로 자연히 정리
+# --------------------------------------------------------
+def _load_version():
+    global _version, _changed_at, _version_checked
+
+    if _version is None or time.monotonic() - _version_checked >= DATA_VERSION_TTL:
+        row = DataVersion.objects.filter(pk=1).values_list("version", "changed_at").first()
+        _version, _changed_at = row or (0, None)
+        _version_checked = time.monotonic()
+
+
+def data_version():
+    _load_version()
+    return _version
+
+
+def data_changed_at():
+    # 마지막 version 변경 시각 (목록 endpoint 의 Last-Modified)
+    _load_version()
+    return _changed_at
+
+
+def bump_data_version():
+    # ingest 스크립트(merge_and_insert.py, api_call.py)는 같은 UPDATE 를 SQL 로 직접 실행
+    global _version
+
+    DataVersion.objects.filter(pk=1).update(version=F("version") + 1, changed_at=Now())
+    _version = None
+
+
+# --------------------------------------------------------
+# 📌 결과 캐시 키: endpoint 이름 + data version + 정규화된 query 파라미터
+#   (파라미터 순서 무관, 빈 값은 없는 것과 같게)
+# --------------------------------------------------------
+def normalize_params(params, extra=None):
+    items = {k: params.getlist(k) for k in sorted(params) if any(params.getlist(k))}
+    if extra:
+        items["_"] = extra
+    return json.dumps(items, sort_keys=True, default=str, separators=(",", ":"))
+
+
+def result_cache_key(name, params, extra=None):
+    digest = hashlib.md5(normalize_params(params, extra).encode()).hexdigest()
+    return f"result:{name}:{data_version()}:{digest}"
+
+
+def _count(cache, name, outcome):
+    key = f"result-stats:{name}:{outcome}"
+    # add 는 키가 없을 때만 기록 → 그 뒤 incr (incr 은 없는 키에서 ValueError)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def cached_view(name, timeout=RESULT_CACHE_TIMEOUT):
+    # @api_view 아래에 붙임: GET 200 응답의 data 만 저장, 나머지(400 등)는 매번 계산
+    CACHED_VIEWS.append(name)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            cache = caches[RESULT_CACHE_ALIAS]
+            key = result_cache_key(name, request.GET, kwargs)
+            data = cache.get(key)
+            if data is not None:
+                _count(cache, name, "hit")
+                response = Response(data)
+                response["X-Cache"] = "HIT"
+                return response
+
+            _count(cache, name, "miss")
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout)
+            response["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    cache = caches[RESULT_CACHE_ALIAS]
+    stats = {}
+    for name in CACHED_VIEWS:
+        hits = cache.get(f"result-stats:{name}:hit", 0)
+        misses = cache.get(f"result-stats:{name}:miss", 0)
+        total = hits + misses
+        stats[name] = {"hit": hits, "miss": misses, "hit_ratio": round(hits / total, 4) if total else None}
+    return stats
+
+
+# --------------------------------------------------------
+# 📌 HTTP 조건부 요청 (ETag / Last-Modified)
+#   ETag 는 버전 정보(전역 data version, paper.updated_at)만으로 계산 → 응답 본문을 만들지 않고 비교
+#   If-None-Match / If-Modified-Since 가 맞으면 view(쿼리, serializer, 결과 캐시) 를 건너뛰고 304
+#   @api_view 위에 붙임 (304 는 DRF 를 거치지 않음)
+# --------------------------------------------------------
+def make_etag(*parts):
+    return hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def representation(request, kwargs=None):
+    # 같은 데이터라도 query 파라미터(fields, limit ...) / Accept(renderer) 가 다르면 다른 응답
+    return normalize_params(request.GET, kwargs), request.META.get("HTTP_ACCEPT", "")
+
+
+def list_etag(name, bucket=None):
+    # bucket(초): data version 을 올리지 않고 바뀌는 데이터용, 그 주기마다 ETag 도 바뀜
+    def etag(request, *args, **kwargs):
+        parts = [name, data_version(), *representation(request, kwargs)]
+        if bucket:
+            parts.append(int(time.time() // bucket))
+        return make_etag(*parts)
+    return etag
+
+
+def list_last_modified(request, *args, **kwargs):
+    return data_changed_at()
+
+
+def conditional_view(etag_func, last_modified_func=None, max_age=0, public=True):
+    # max_age 동안은 브라우저 / CDN 이 그대로 쓰고, 그 뒤에는 ETag 로 재검증
+    #   public=False 면 브라우저만 (요청마다 서버를 거쳐야 하는 view, 예: 조회수)
+    def decorator(view):
+        checked = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view)
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # 조건부 헤더가 없으면 미리 비교할 것이 없음 → view 먼저 실행, 헤더는 view 가 읽은 값으로
+            if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+                response = checked(request, *args, **kwargs)
+            else:
+                response = view(request, *args, **kwargs)
+
+            if response.status_code == 200:
+                if not response.has_header("ETag"):
+                    etag = etag_func(request, *args, **kwargs)
+                    if etag:
+                        response["ETag"] = quote_etag(etag)
+                if last_modified_func and not response.has_header("Last-Modified"):
+                    last_modified = last_modified_func(request, *args, **kwargs)
+                    if last_modified:
+                        response["Last-Modified"] = http_date(last_modified.timestamp())
+            if response.status_code in (200, 304):
+                patch_cache_control(response, max_age=max_age, **{"public" if public else "private": True})
+                patch_vary_headers(response, ("Accept",))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,45 @@
+import csv
+import json
+
+# PaperSerializer 와 같은 키 이름 (FK 는 id 값)
+EXPORT_COLUMNS = (
+    ("paper_id", "paper_id"),
+    ("title", "title"),
+    ("category", "category_id"),
+    ("institution", "institution_id"),
+    ("citation", "citation"),
+    ("open_access", "open_access"),
+    ("locations", "locations"),
+    ("announcement_date", "announcement_date"),
+    ("weekly_count", "weekly_count"),
+    ("submit", "submit"),
+    ("alex_paper_id", "alex_paper_id"),
+)
+EXPORT_KEYS = [key for key, _ in EXPORT_COLUMNS]
+EXPORT_FIELDS = [field for _, field in EXPORT_COLUMNS]
+
+# server-side cursor 에서 한 번에 가져올 행 수
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    # csv.writer 가 쓴 한 줄을 그대로 돌려주는 가짜 파일
+    def write(self, value):
+        return value
+
+
+def export_rows(qs):
+    # values_list + iterator: 모델 인스턴스 없이 chunk 단위로만 메모리에 올림
+    return qs.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_ndjson(qs):
+    for row in export_rows(qs):
+        yield json.dumps(dict(zip(EXPORT_KEYS, row)), default=str, ensure_ascii=False) + "\n"
+
+
+def stream_csv(qs):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_KEYS)
+    for row in export_rows(qs):
+        yield writer.writerow(row)
@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.db.models.functions import ExtractYear
+
+from .caching import data_version
+from .filters import apply_filters
+from .models import Paper
+
+FACET_CACHE_TIMEOUT = getattr(settings, "FACET_CACHE_TIMEOUT", 300)
+
+# 필터된 논문 집합을 한 번만 읽어서 모든 facet 을 GROUPING SETS 로 집계
+FACET_SQL = """
+SELECT GROUPING(category_id) = 0 AS by_category,
+       GROUPING(country_code) = 0 AS by_country,
+       GROUPING(year) = 0 AS by_year,
+       GROUPING(open_access) = 0 AS by_open_access,
+       category_id, category_name, country_code, year::int, open_access,
+       count(*)
+FROM ({inner}) f
+GROUP BY GROUPING SETS ((category_id, category_name), (country_code), (year), (open_access), ())
+"""
+
+
+def facet_cache_key(filters):
+    # data version 이 바뀌면(ingest) 키도 바뀜 → 이전 집계는 자연 만료
+    raw = json.dumps(filters, sort_keys=True, default=str)
+    return f"facets:{data_version()}:" + hashlib.md5(raw.encode()).hexdigest()
+
+
+def compute_facets(filters):
+    inner = (
+        apply_filters(Paper.objects.all(), filters)
+        .annotate(
+            category_name=F("category__category_name"),
+            country_code=F("institution__country_code"),
+            year=ExtractYear("announcement_date"),
+        )
+        .values("category_id", "category_name", "country_code", "year", "open_access")
+    )
+    sql, params = inner.query.sql_with_params()
+
+    facets = {"total": 0, "category": [], "country": [], "year": [], "open_access": []}
+    with connection.cursor() as cur:
+        cur.execute(FACET_SQL.format(inner=sql), params)
+        rows = cur.fetchall()
+
+    for by_category, by_country, by_year, by_oa, category_id, category_name, country_code, year, oa, count in rows:
+        if by_category:
+            facets["category"].append({"category_id": category_id, "category_name": category_name, "count": count})
+        elif by_country:
+            facets["country"].append({"country_code": country_code, "count": count})
+        elif by_year:
+            facets["year"].append({"year": year, "count": count})
+        elif by_oa:
+            facets["open_access"].append({"open_access": oa, "count": count})
+        else:
+            facets["total"] = count
+
+    for key in ("category", "country", "year", "open_access"):
+        facets[key].sort(key=lambda item: -item["count"])
+    return facets
+
+
+# --------------------------------------------------------
+# 📌 정규화된 필터 dict 기준으로 캐시
+# --------------------------------------------------------
+def get_facets(filters):
+    key = facet_cache_key(filters)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(filters)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
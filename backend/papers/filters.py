@@ -0,0 +1,53 @@
+from datetime import date
+
+
+# --------------------------------------------------------
+# 📌 상세 검색 필터 (advanced_search / export / facets 공용)
+#   잘못된 값은 ValueError → 호출하는 view 에서 400 처리
+# --------------------------------------------------------
+def parse_filters(params):
+    # query 파라미터 → 정규화된 필터 dict (캐시 키로도 사용)
+    filters = {}
+
+    # 기간 조건
+    start = params.get("start")
+    end = params.get("end")
+    if start:
+        filters["start"] = date.fromisoformat(start)
+    if end:
+        filters["end"] = date.fromisoformat(end)
+
+    # category 조건
+    category_id = params.get("category_id")
+    if category_id:
+        filters["category_id"] = int(category_id)
+
+    # 기관 국가코드
+    country = params.get("country")
+    if country:
+        filters["country"] = country
+
+    # 오픈액세스
+    oa = params.get("open_access")
+    if oa in ["true", "True", "1"]:
+        filters["open_access"] = True
+
+    return filters
+
+
+def apply_filters(qs, filters):
+    if "start" in filters:
+        qs = qs.filter(announcement_date__gte=filters["start"])
+    if "end" in filters:
+        qs = qs.filter(announcement_date__lte=filters["end"])
+    if "category_id" in filters:
+        qs = qs.filter(category_id=filters["category_id"])
+    if "country" in filters:
+        qs = qs.filter(institution__country_code=filters["country"])
+    if filters.get("open_access"):
+        qs = qs.filter(open_access=True)
+    return qs
+
+
+def filter_papers(qs, params):
+    return apply_filters(qs, parse_filters(params))
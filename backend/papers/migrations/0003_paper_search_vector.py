@@ -0,0 +1,86 @@
+# Generated by Django 4.2 on 2026-10-18
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# docker/postgres/table_schema.sql 의 FULL-TEXT SEARCH 섹션과 동일하게 유지할 것
+FORWARD_SQL = """
+ALTER TABLE paper ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+CREATE OR REPLACE FUNCTION paper_search_document(title TEXT, submit TEXT, context TEXT)
+RETURNS TSVECTOR AS $$
+  SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+         setweight(to_tsvector('english', coalesce(submit, '')), 'B') ||
+         setweight(to_tsvector('english', coalesce(context, '')), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION paper_search_vector_update() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.search_vector := paper_search_document(
+    NEW.title, NEW.submit,
+    (SELECT context FROM abstract WHERE paper_id = NEW.paper_id)
+  );
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION abstract_search_vector_update() RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE paper
+  SET search_vector = paper_search_document(title, submit, NEW.context)
+  WHERE paper_id = NEW.paper_id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS paper_search_vector_trigger ON paper;
+CREATE TRIGGER paper_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, submit ON paper
+FOR EACH ROW EXECUTE FUNCTION paper_search_vector_update();
+
+DROP TRIGGER IF EXISTS abstract_search_vector_trigger ON abstract;
+CREATE TRIGGER abstract_search_vector_trigger
+AFTER INSERT OR UPDATE OF context ON abstract
+FOR EACH ROW EXECUTE FUNCTION abstract_search_vector_update();
+
+-- 기존 행 채우기
+UPDATE paper p
+SET search_vector = paper_search_document(
+  p.title, p.submit,
+  (SELECT context FROM abstract a WHERE a.paper_id = p.paper_id)
+);
+
+CREATE INDEX IF NOT EXISTS paper_search_vector_idx ON paper USING GIN (search_vector);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS paper_search_vector_idx;
+DROP TRIGGER IF EXISTS abstract_search_vector_trigger ON abstract;
+DROP TRIGGER IF EXISTS paper_search_vector_trigger ON paper;
+DROP FUNCTION IF EXISTS abstract_search_vector_update();
+DROP FUNCTION IF EXISTS paper_search_vector_update();
+DROP FUNCTION IF EXISTS paper_search_document(TEXT, TEXT, TEXT);
+ALTER TABLE paper DROP COLUMN IF EXISTS search_vector;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0002_abstract_category_guest_institution_yearcitation_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.AddField(
+                    model_name='paper',
+                    name='search_vector',
+                    field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2 on 2026-10-18
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+# docker/postgres/table_schema.sql 의 TRIGRAM SEARCH 섹션과 동일하게 유지할 것
+FORWARD_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS paper_title_trgm_idx ON paper USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS paper_submit_trgm_idx ON paper USING GIN (submit gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS author_name_trgm_idx ON author USING GIN (author_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS authorpaper_author_id_idx ON authorpaper (author_id);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS authorpaper_author_id_idx;
+DROP INDEX IF EXISTS author_name_trgm_idx;
+DROP INDEX IF EXISTS paper_submit_trgm_idx;
+DROP INDEX IF EXISTS paper_title_trgm_idx;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0003_paper_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='paper_title_trgm_idx', opclasses=['gin_trgm_ops']),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['submit'], name='paper_submit_trgm_idx', opclasses=['gin_trgm_ops']),
+                ),
+                migrations.AddIndex(
+                    model_name='author',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['author_name'], name='author_name_trgm_idx', opclasses=['gin_trgm_ops']),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 4.2 on 2026-10-18
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+# docker/postgres/table_schema.sql 의 FILTER / SORT INDEXES 섹션과 동일하게 유지할 것
+FORWARD_SQL = """
+CREATE INDEX IF NOT EXISTS paper_announce_idx ON paper (announcement_date DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_citation_idx ON paper (citation DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_weekly_count_idx ON paper (weekly_count DESC, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_cat_announce_idx ON paper (category_id, announcement_date DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_cat_citation_idx ON paper (category_id, citation DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_oa_announce_idx ON paper (announcement_date DESC NULLS LAST, paper_id DESC) WHERE open_access;
+CREATE INDEX IF NOT EXISTS paper_oa_citation_idx ON paper (citation DESC NULLS LAST, paper_id DESC) WHERE open_access;
+CREATE INDEX IF NOT EXISTS paper_institution_idx ON paper (institution_id);
+CREATE INDEX IF NOT EXISTS institution_country_idx ON institution (country_code);
+CREATE INDEX IF NOT EXISTS guestfavorite_guest_idx ON guestfavorite (guest_id, favorite_id DESC);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS guestfavorite_guest_idx;
+DROP INDEX IF EXISTS institution_country_idx;
+DROP INDEX IF EXISTS paper_institution_idx;
+DROP INDEX IF EXISTS paper_oa_citation_idx;
+DROP INDEX IF EXISTS paper_oa_announce_idx;
+DROP INDEX IF EXISTS paper_cat_citation_idx;
+DROP INDEX IF EXISTS paper_cat_announce_idx;
+DROP INDEX IF EXISTS paper_weekly_count_idx;
+DROP INDEX IF EXISTS paper_citation_idx;
+DROP INDEX IF EXISTS paper_announce_idx;
+"""
+
+LATEST = django.db.models.expressions.OrderBy(django.db.models.expressions.F('announcement_date'), descending=True, nulls_last=True)
+CITED = django.db.models.expressions.OrderBy(django.db.models.expressions.F('citation'), descending=True, nulls_last=True)
+PK_DESC = django.db.models.expressions.OrderBy(django.db.models.expressions.F('paper_id'), descending=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0004_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                # 0003 에서 SQL 로만 만든 인덱스를 state 에 반영
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='paper_search_vector_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(LATEST, PK_DESC, name='paper_announce_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(CITED, PK_DESC, name='paper_citation_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(django.db.models.expressions.OrderBy(django.db.models.expressions.F('weekly_count'), descending=True), PK_DESC, name='paper_weekly_count_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(django.db.models.expressions.F('category'), LATEST, PK_DESC, name='paper_cat_announce_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(django.db.models.expressions.F('category'), CITED, PK_DESC, name='paper_cat_citation_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(LATEST, PK_DESC, condition=models.Q(('open_access', True)), name='paper_oa_announce_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(CITED, PK_DESC, condition=models.Q(('open_access', True)), name='paper_oa_citation_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(fields=['institution'], name='paper_institution_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='institution',
+                    index=models.Index(fields=['country_code'], name='institution_country_idx'),
+                ),
+                # guestfavorite_guest_idx 는 state 의 guestfavorite pk 가 아직 id 라서 SQL 로만 반영
+            ],
+        ),
+    ]
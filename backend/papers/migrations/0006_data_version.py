@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+
+
+# docker/postgres/table_schema.sql 의 DATA VERSION 섹션과 동일하게 유지할 것
+FORWARD_SQL = """
+CREATE TABLE IF NOT EXISTS data_version(
+  id SMALLINT PRIMARY KEY CHECK (id = 1),
+  version BIGINT NOT NULL DEFAULT 0,
+  changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO data_version (id) VALUES (1) ON CONFLICT DO NOTHING;
+"""
+
+REVERSE_SQL = """
+DROP TABLE IF EXISTS data_version;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0005_paper_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.CreateModel(
+                    name='DataVersion',
+                    fields=[
+                        ('id', models.SmallIntegerField(default=1, primary_key=True, serialize=False)),
+                        ('version', models.BigIntegerField(default=0)),
+                        ('changed_at', models.DateTimeField(auto_now=True)),
+                    ],
+                    options={
+                        'db_table': 'data_version',
+                    },
+                ),
+            ],
+        ),
+    ]
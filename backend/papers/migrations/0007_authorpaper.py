@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0006_data_version'),
+    ]
+
+    # authorpaper 테이블과 authorpaper_author_id_idx 는 table_schema.sql / 0004 에서 이미 생성됨 → state 만 추가
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='AuthorPaper',
+                    fields=[
+                        ('ap_id', models.AutoField(primary_key=True, serialize=False)),
+                        ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='papers.author')),
+                        ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='papers.paper')),
+                    ],
+                    options={
+                        'db_table': 'authorpaper',
+                        'unique_together': {('paper', 'author')},
+                    },
+                ),
+                migrations.AddIndex(
+                    model_name='authorpaper',
+                    index=models.Index(fields=['author'], name='authorpaper_author_id_idx'),
+                ),
+                migrations.AddField(
+                    model_name='paper',
+                    name='authors',
+                    field=models.ManyToManyField(related_name='papers', through='papers.AuthorPaper', to='papers.author'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+
+
+# docker/postgres/table_schema.sql 의 paper.updated_at 과 동일하게 유지할 것
+FORWARD_SQL = """
+ALTER TABLE paper ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+"""
+
+REVERSE_SQL = """
+ALTER TABLE paper DROP COLUMN IF EXISTS updated_at;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0007_authorpaper'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.AddField(
+                    model_name='paper',
+                    name='updated_at',
+                    field=models.DateTimeField(auto_now=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# docker/postgres/table_schema.sql 의 POPULARITY 섹션과 동일하게 유지할 것
+FORWARD_SQL = """
+CREATE TABLE IF NOT EXISTS paper_view_hourly(
+  id BIGSERIAL PRIMARY KEY,
+  paper_id INTEGER NOT NULL,
+  hour TIMESTAMPTZ NOT NULL,
+  hits INTEGER NOT NULL DEFAULT 0,
+  UNIQUE(paper_id, hour),
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS paper_view_hourly_hour_idx ON paper_view_hourly (hour);
+
+CREATE TABLE IF NOT EXISTS popular_paper(
+  rank SMALLINT PRIMARY KEY,
+  paper_id INTEGER NOT NULL UNIQUE,
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE
+);
+
+-- 기존 weekly_count 는 현재 시각 bucket 으로 옮겨둠 → 7일 뒤 창 밖으로 나가면서 자연히 빠짐
+INSERT INTO paper_view_hourly (paper_id, hour, hits)
+SELECT paper_id, date_trunc('hour', now()), weekly_count FROM paper WHERE weekly_count > 0
+ON CONFLICT (paper_id, hour) DO NOTHING;
+"""
+
+REVERSE_SQL = """
+DROP TABLE IF EXISTS popular_paper;
+DROP TABLE IF EXISTS paper_view_hourly;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0008_paper_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.CreateModel(
+                    name='PaperViewHourly',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('hour', models.DateTimeField()),
+                        ('hits', models.IntegerField(default=0)),
+                        ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='papers.paper')),
+                    ],
+                    options={
+                        'db_table': 'paper_view_hourly',
+                        'indexes': [models.Index(fields=['hour'], name='paper_view_hourly_hour_idx')],
+                        'unique_together': {('paper', 'hour')},
+                    },
+                ),
+                migrations.CreateModel(
+                    name='PopularPaper',
+                    fields=[
+                        ('rank', models.SmallIntegerField(primary_key=True, serialize=False)),
+                        ('paper', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='popular', to='papers.paper')),
+                    ],
+                    options={
+                        'db_table': 'popular_paper',
+                    },
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# docker/postgres/table_schema.sql 의 CATEGORY INTEREST ROLLUP 섹션과 동일하게 유지할 것
+FORWARD_SQL = """
+CREATE TABLE IF NOT EXISTS category_interest_daily(
+  id BIGSERIAL PRIMARY KEY,
+  category_id INTEGER NOT NULL,
+  day DATE NOT NULL,
+  delta INTEGER NOT NULL DEFAULT 0,
+  UNIQUE(category_id, day),
+  FOREIGN KEY (category_id) REFERENCES category(category_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS category_interest_day_idx ON category_interest_daily (day);
+
+CREATE OR REPLACE FUNCTION category_interest_add(cid INTEGER, amount INTEGER) RETURNS VOID AS $$
+  INSERT INTO category_interest_daily (category_id, day, delta)
+  VALUES (cid, (now() AT TIME ZONE 'UTC')::date, amount)
+  ON CONFLICT (category_id, day) DO UPDATE
+  SET delta = category_interest_daily.delta + EXCLUDED.delta;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION guestcategorycount_rollup() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'UPDATE' AND NEW.category_id = OLD.category_id THEN
+    IF NEW.count IS DISTINCT FROM OLD.count THEN
+      PERFORM category_interest_add(NEW.category_id, COALESCE(NEW.count, 0) - COALESCE(OLD.count, 0));
+    END IF;
+    RETURN NULL;
+  END IF;
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM category_interest_add(OLD.category_id, -COALESCE(OLD.count, 0));
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM category_interest_add(NEW.category_id, COALESCE(NEW.count, 0));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS guestcategorycount_rollup_trigger ON guestcategorycount;
+CREATE TRIGGER guestcategorycount_rollup_trigger
+AFTER INSERT OR UPDATE OF count, category_id OR DELETE ON guestcategorycount
+FOR EACH ROW EXECUTE FUNCTION guestcategorycount_rollup();
+
+-- 기존 누적분 (트리거 생성 전 값)
+INSERT INTO category_interest_daily (category_id, day, delta)
+SELECT category_id, DATE '1970-01-01', SUM(COALESCE(count, 0)) FROM guestcategorycount GROUP BY category_id
+ON CONFLICT (category_id, day) DO NOTHING;
+"""
+
+REVERSE_SQL = """
+DROP TRIGGER IF EXISTS guestcategorycount_rollup_trigger ON guestcategorycount;
+DROP FUNCTION IF EXISTS guestcategorycount_rollup();
+DROP FUNCTION IF EXISTS category_interest_add(INTEGER, INTEGER);
+DROP TABLE IF EXISTS category_interest_daily;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0009_popularity'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.CreateModel(
+                    name='CategoryInterestDaily',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('day', models.DateField()),
+                        ('delta', models.IntegerField(default=0)),
+                        ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='papers.category')),
+                    ],
+                    options={
+                        'db_table': 'category_interest_daily',
+                        'indexes': [models.Index(fields=['day'], name='category_interest_day_idx')],
+                        'unique_together': {('category', 'day')},
+                    },
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# docker/postgres/table_schema.sql 의 RECOMMEND CANDIDATES 섹션과 동일하게 유지할 것
+FORWARD_SQL = """
+CREATE TABLE IF NOT EXISTS recommend_candidate(
+  paper_id INTEGER PRIMARY KEY,
+  category_id INTEGER NOT NULL,
+  rank INTEGER NOT NULL,
+  score DOUBLE PRECISION NOT NULL,
+  UNIQUE(category_id, rank),
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE,
+  FOREIGN KEY (category_id) REFERENCES category(category_id) ON DELETE CASCADE
+);
+"""
+
+REVERSE_SQL = """
+DROP TABLE IF EXISTS recommend_candidate;
+"""
+
+
+def fill_candidates(apps, schema_editor):
+    # 첫 cron(roll) 전에도 추천이 나오도록 한 번 계산
+    from papers.services import recommend
+
+    recommend.refresh_candidates()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0010_category_interest_daily'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.CreateModel(
+                    name='RecommendCandidate',
+                    fields=[
+                        ('paper', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recommend', serialize=False, to='papers.paper')),
+                        ('rank', models.IntegerField()),
+                        ('score', models.FloatField()),
+                        ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='papers.category')),
+                    ],
+                    options={
+                        'db_table': 'recommend_candidate',
+                        'unique_together': {('category', 'rank')},
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(fill_candidates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# docker/postgres/table_schema.sql 의 ALSO SAVED 섹션과 동일하게 유지할 것
+FORWARD_SQL = """
+CREATE TABLE IF NOT EXISTS paper_neighbor(
+  id BIGSERIAL PRIMARY KEY,
+  paper_id INTEGER NOT NULL,
+  rank SMALLINT NOT NULL,
+  neighbor_id INTEGER NOT NULL,
+  score REAL NOT NULL,
+  UNIQUE(paper_id, rank),
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE,
+  FOREIGN KEY (neighbor_id) REFERENCES paper(paper_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS paper_neighbor_dirty(
+  paper_id INTEGER PRIMARY KEY
+);
+
+-- 저장: 그 논문의 저장 수가 바뀜 (같이 저장한 논문들은 refresh 때 공동 저장으로 찾음)
+--   단 이번 저장으로 즐겨찾기가 CF_MAX_GUEST_FAVORITES(500) 를 넘으면 그 guest 는 계산에서 빠짐
+--   → refresh 가 공동 저장으로 찾지 못하므로 그 guest 의 즐겨찾기 전부 표시
+-- 취소: 그 guest 의 나머지 즐겨찾기와의 공동 저장도 줄어듦 → 같이 표시
+CREATE OR REPLACE FUNCTION guestfavorite_mark_neighbors() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    -- 이 행 앞의 즐겨찾기 수 (여러 행 INSERT 에서도 경계를 넘는 행 하나만 해당)
+    IF (SELECT COUNT(*) FROM guestfavorite WHERE guest_id = NEW.guest_id AND favorite_id < NEW.favorite_id) = 500 THEN
+      INSERT INTO paper_neighbor_dirty (paper_id)
+      SELECT paper_id FROM guestfavorite WHERE guest_id = NEW.guest_id
+      ON CONFLICT DO NOTHING;
+    ELSE
+      INSERT INTO paper_neighbor_dirty (paper_id) VALUES (NEW.paper_id) ON CONFLICT DO NOTHING;
+    END IF;
+  ELSE
+    INSERT INTO paper_neighbor_dirty (paper_id)
+    SELECT OLD.paper_id UNION SELECT paper_id FROM guestfavorite WHERE guest_id = OLD.guest_id
+    ON CONFLICT DO NOTHING;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS guestfavorite_mark_neighbors_trigger ON guestfavorite;
+CREATE TRIGGER guestfavorite_mark_neighbors_trigger
+AFTER INSERT OR DELETE ON guestfavorite
+FOR EACH ROW EXECUTE FUNCTION guestfavorite_mark_neighbors();
+"""
+
+REVERSE_SQL = """
+DROP TRIGGER IF EXISTS guestfavorite_mark_neighbors_trigger ON guestfavorite;
+DROP FUNCTION IF EXISTS guestfavorite_mark_neighbors();
+DROP TABLE IF EXISTS paper_neighbor_dirty;
+DROP TABLE IF EXISTS paper_neighbor;
+"""
+
+
+def build_neighbors(apps, schema_editor):
+    # 기존 즐겨찾기로 한 번 전체 계산 (이후는 dirty 논문만)
+    from papers.services import itemcf
+
+    itemcf.rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0011_recommend_candidate'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.CreateModel(
+                    name='PaperNeighbor',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('rank', models.SmallIntegerField()),
+                        ('score', models.FloatField()),
+                        ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='papers.paper')),
+                        ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='papers.paper')),
+                    ],
+                    options={
+                        'db_table': 'paper_neighbor',
+                        'unique_together': {('paper', 'rank')},
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(build_neighbors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# docker/postgres/table_schema.sql 의 paper.influence, CITATION GRAPH 섹션, 정렬 인덱스와 동일하게 유지할 것
+FORWARD_SQL = """
+ALTER TABLE paper ADD COLUMN IF NOT EXISTS influence DOUBLE PRECISION;
+
+CREATE TABLE IF NOT EXISTS paperreference(
+  reference_id BIGSERIAL PRIMARY KEY,
+  paper_id INTEGER NOT NULL,
+  referenced_alex_id TEXT NOT NULL,
+  UNIQUE(paper_id, referenced_alex_id),
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS paper_influence_idx ON paper (influence DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_cat_influence_idx ON paper (category_id, influence DESC NULLS LAST, paper_id DESC);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS paper_cat_influence_idx;
+DROP INDEX IF EXISTS paper_influence_idx;
+DROP TABLE IF EXISTS paperreference;
+ALTER TABLE paper DROP COLUMN IF EXISTS influence;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0012_paper_neighbor'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.AddField(
+                    model_name='paper',
+                    name='influence',
+                    field=models.FloatField(editable=False, null=True),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(models.OrderBy(models.F('influence'), descending=True, nulls_last=True), models.OrderBy(models.F('paper_id'), descending=True), name='paper_influence_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(models.F('category'), models.OrderBy(models.F('influence'), descending=True, nulls_last=True), models.OrderBy(models.F('paper_id'), descending=True), name='paper_cat_influence_idx'),
+                ),
+                migrations.CreateModel(
+                    name='PaperReference',
+                    fields=[
+                        ('reference_id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('referenced_alex_id', models.TextField()),
+                        ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='references', to='papers.paper')),
+                    ],
+                    options={
+                        'db_table': 'paperreference',
+                        'unique_together': {('paper', 'referenced_alex_id')},
+                    },
+                ),
+            ],
+        ),
+    ]
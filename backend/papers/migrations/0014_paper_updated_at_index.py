@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-18
+
+from django.db import migrations, models
+
+
+# docker/postgres/table_schema.sql 의 paper_updated_at_idx 와 동일하게 유지할 것
+FORWARD_SQL = """
+CREATE INDEX IF NOT EXISTS paper_updated_at_idx ON paper (updated_at);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS paper_updated_at_idx;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('papers', '0013_citation_graph'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='paper',
+                    index=models.Index(fields=['updated_at'], name='paper_updated_at_idx'),
+                ),
+            ],
+        ),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models, transaction
+from django.db.models import F, Prefetch, Q
 
 class Category(models.Model):
     category_id = models.BigAutoField(primary_key=True)
@@ -15,6 +18,9 @@ class Institution(models.Model):
     
     class Meta:
         db_table = 'institution'
+        indexes = [
+            models.Index(fields=["country_code"], name="institution_country_idx"),
+        ]
 
 class Author(models.Model):
     author_id = models.BigAutoField(primary_key=True)
@@ -28,6 +34,56 @@ class Author(models.Model):
     
     class Meta:
         db_table = 'author'
+        indexes = [
+            GinIndex(fields=["author_name"], name="author_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
+
+# Paper 정렬 인덱스 키 (pagination.keyset_paginate 의 ORDER BY 와 같아야 함)
+LATEST = F("announcement_date").desc(nulls_last=True)
+CITED = F("citation").desc(nulls_last=True)
+INFLUENCE = F("influence").desc(nulls_last=True)
+PK_DESC = F("paper_id").desc()
+
+# PaperDetailSerializer 의 계산 필드 → 읽어야 하는 컬럼 (with_detail(fields) 용)
+DETAIL_FIELD_LOOKUPS = {
+    "abstract": ("abstract__context",),
+    "category_name": ("category__category_name",),
+    "institution_name": ("institution__institution_name",),
+    "country_code": ("institution__country_code",),
+    "year_citations": (
+        "yearcitation__recent_year1_count", "yearcitation__recent_year2_count", "yearcitation__recent_year3_count",
+    ),
+    "authors": (),  # authorpaper prefetch
+}
+
+class PaperManager(models.Manager):
+    # search_vector 는 검색 조건에만 쓰이므로 기본 SELECT 에서 제외
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
+    # 상세 응답용: 1:1/FK 는 JOIN 한 번, 저자는 authorpaper 순서(ap_id)대로 prefetch 한 번 → 총 2 쿼리
+    #   fields(PaperDetailSerializer 필드 이름)를 주면 필요한 컬럼만 SELECT, 필요한 테이블만 JOIN
+    #   (abstract.context 같은 큰 텍스트는 요청했을 때만)
+    def with_detail(self, fields=None):
+        qs = self.get_queryset()
+        if fields is None:
+            related = ("category", "institution", "abstract", "yearcitation")
+        else:
+            # updated_at: 상세 응답의 ETag / Last-Modified
+            lookups = ["paper_id", "updated_at"]
+            for name in fields:
+                lookups += DETAIL_FIELD_LOOKUPS.get(name, (name,))
+            related = tuple(dict.fromkeys(l.split("__")[0] for l in lookups if "__" in l))
+            qs = qs.only(*lookups, *related)
+        if related:
+            qs = qs.select_related(*related)
+        if fields is None or "authors" in fields:
+            qs = qs.prefetch_related(
+                Prefetch("authorpaper_set", queryset=AuthorPaper.objects.select_related("author").only(
+                    "paper", "author", "author__author_name"
+                ).order_by("ap_id"))
+            )
+        return qs
 
 class Paper(models.Model):
     paper_id = models.BigAutoField(primary_key=True)
@@ -41,9 +97,41 @@ class Paper(models.Model):
     weekly_count = models.IntegerField(default=0)
     submit = models.TextField(null=True)
     alex_paper_id = models.TextField(unique=True, null=True) # chk
+    # title(A) > submit(B) > abstract.context(C) 가중치 tsvector, DB 트리거가 유지 (table_schema.sql 참고)
+    search_vector = SearchVectorField(null=True, editable=False)
+    authors = models.ManyToManyField(Author, through="AuthorPaper", related_name="papers")
+    # 상세 응답(paper + abstract / yearcitation / authorpaper)이 바뀐 시각, ETag / Last-Modified 용
+    # ingest 스크립트가 실제로 값이 바뀐 논문만 now() 로 갱신
+    updated_at = models.DateTimeField(auto_now=True)
+    # 인용 그래프(paperreference) PageRank, 평균 1.0 (services/influence.py), 정렬(order=influence) 전용
+    influence = models.FloatField(null=True, editable=False)
+
+    objects = PaperManager()
     
     class Meta:
         db_table = 'paper'
+        indexes = [
+            # full-text / fuzzy 검색
+            GinIndex(fields=["search_vector"], name="paper_search_vector_idx"),
+            GinIndex(fields=["title"], name="paper_title_trgm_idx", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["submit"], name="paper_submit_trgm_idx", opclasses=["gin_trgm_ops"]),
+            # 정렬 (keyset: 정렬 컬럼 DESC NULLS LAST, paper_id DESC)
+            models.Index(LATEST, PK_DESC, name="paper_announce_idx"),
+            models.Index(CITED, PK_DESC, name="paper_citation_idx"),
+            models.Index(F("weekly_count").desc(), PK_DESC, name="paper_weekly_count_idx"),
+            # category 필터 + 정렬
+            models.Index(F("category"), LATEST, PK_DESC, name="paper_cat_announce_idx"),
+            models.Index(F("category"), CITED, PK_DESC, name="paper_cat_citation_idx"),
+            models.Index(INFLUENCE, PK_DESC, name="paper_influence_idx"),
+            models.Index(F("category"), INFLUENCE, PK_DESC, name="paper_cat_influence_idx"),
+            # open_access=true 필터 + 정렬 (partial)
+            models.Index(LATEST, PK_DESC, name="paper_oa_announce_idx", condition=Q(open_access=True)),
+            models.Index(CITED, PK_DESC, name="paper_oa_citation_idx", condition=Q(open_access=True)),
+            # country 필터 (institution join)
+            models.Index(fields=["institution"], name="paper_institution_idx"),
+            # BM25 / semantic 인덱스 증분 반영 (updated_at >= 마지막 반영 시각)
+            models.Index(fields=["updated_at"], name="paper_updated_at_idx"),
+        ]
 
 class Abstract(models.Model):
     paper = models.OneToOneField(Paper, primary_key=True, on_delete=models.RESTRICT)
@@ -61,6 +149,17 @@ class YearCitation(models.Model):
     class Meta:
         db_table = 'yearcitation'
 
+# 논문 → 그 논문이 인용한 OpenAlex work (api_call.py 가 referenced_works 로 채움)
+#   인용 대상이 DB 에 들어오면 paper.alex_paper_id 로 이어짐 (따로 갱신할 필요 없음)
+class PaperReference(models.Model):
+    reference_id = models.BigAutoField(primary_key=True)
+    paper = models.ForeignKey(Paper, on_delete=models.CASCADE, related_name="references")
+    referenced_alex_id = models.TextField()
+
+    class Meta:
+        db_table = 'paperreference'
+        unique_together = ('paper', 'referenced_alex_id')
+
 class Guest(models.Model):
     guest_id = models.BigAutoField(primary_key=True)
     guestname = models.TextField()
@@ -72,18 +171,206 @@ class Guest(models.Model):
     class Meta:
         db_table = 'guest'
 
+# api_call.py 는 OpenAlex authorships 순서대로 넣으므로 ap_id 순서 = 저자 순서
+class AuthorPaper(models.Model):
+    ap_id = models.AutoField(primary_key=True)
+    paper = models.ForeignKey(Paper, on_delete=models.CASCADE)
+    author = models.ForeignKey(Author, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'authorpaper'
+        unique_together = ('paper', 'author')
+        indexes = [
+            models.Index(fields=["author"], name="authorpaper_author_id_idx"),
+        ]
+
+# --------------------------------------------------------
+# 📌 즐겨찾기 추가 / 삭제 (toggle_favorite, toggle_favorites_bulk)
+#   요청 전체를 SQL 한 문장으로: guestfavorite DELETE / INSERT ... ON CONFLICT DO NOTHING RETURNING
+#   → 실제로 바뀐 행만큼 그 논문 category 의 guestcategorycount 를 ±1 (없으면 생성, 0 밑으로는 안 내려감)
+#   guest 행을 먼저 lock (FOR NO KEY UPDATE) → 같은 guest 의 요청은 차례로 실행
+#     (READ COMMITTED 에서는 먼저 온 요청이 commit 전에 넣은 행이 DELETE 에 안 보여서,
+#      같은 논문을 동시에 두 번 누르면 둘 다 "추가" 쪽으로 가고 한쪽은 아무것도 안 바뀜)
+#   guestcategorycount 변화량은 트리거가 category_interest_daily 로 넘김
+# --------------------------------------------------------
+# op: add / remove / toggle / none(상태만 조회), 결과는 요청 순서대로 (paper_id, 지금 즐겨찾기 여부, 상태)
+#   마지막 EXISTS 는 문장 시작 시점 snapshot (같은 문장의 DELETE / INSERT 는 안 보임) = 요청 전 상태
+APPLY_FAVORITES_SQL = """
+WITH req AS (
+  SELECT * FROM unnest(%(papers)s::int[], %(ops)s::text[]) WITH ORDINALITY AS r(paper_id, op, ord)
+), removed AS (
+  DELETE FROM guestfavorite f USING req r
+  WHERE f.guest_id = %(guest)s AND f.paper_id = r.paper_id AND r.op IN ('remove', 'toggle')
+  RETURNING f.paper_id
+), added AS (
+  INSERT INTO guestfavorite (guest_id, paper_id)
+  SELECT %(guest)s, r.paper_id FROM req r
+  WHERE r.op = 'add' OR (r.op = 'toggle' AND r.paper_id NOT IN (SELECT paper_id FROM removed))
+  ON CONFLICT (guest_id, paper_id) DO NOTHING
+  RETURNING paper_id
+), sums AS (
+  SELECT p.category_id, SUM(c.delta) AS delta
+  FROM (SELECT paper_id, 1 AS delta FROM added UNION ALL SELECT paper_id, -1 FROM removed) c
+  JOIN paper p ON p.paper_id = c.paper_id
+  WHERE p.category_id IS NOT NULL
+  GROUP BY p.category_id
+), updated AS (
+  UPDATE guestcategorycount g SET count = GREATEST(g.count + s.delta, 0)
+  FROM sums s
+  WHERE g.guest_id = %(guest)s AND g.category_id = s.category_id AND s.delta <> 0
+  RETURNING g.category_id
+), inserted AS (
+  INSERT INTO guestcategorycount (guest_id, category_id, count)
+  SELECT %(guest)s, s.category_id, s.delta FROM sums s
+  WHERE s.delta > 0 AND s.category_id NOT IN (SELECT category_id FROM updated)
+  ON CONFLICT (guest_id, category_id) DO UPDATE SET count = guestcategorycount.count + EXCLUDED.count
+)
+SELECT r.paper_id,
+       a.paper_id IS NOT NULL,
+       d.paper_id IS NOT NULL,
+       EXISTS (SELECT 1 FROM guestfavorite f WHERE f.guest_id = %(guest)s AND f.paper_id = r.paper_id)
+FROM req r
+LEFT JOIN added a ON a.paper_id = r.paper_id
+LEFT JOIN removed d ON d.paper_id = r.paper_id
+ORDER BY r.ord
+"""
+
+
+def collapse_favorite_ops(ops):
+    # [(paper_id, op)] → 논문마다 최종 op 하나 (처음 나온 순서)
+    #   add / remove 뒤의 toggle 은 그 값을 뒤집고, toggle 만 있으면 홀수 번일 때만 toggle
+    final = {}
+    for paper_id, op in ops:
+        target, flips = final.get(paper_id, (None, 0))
+        if op == "toggle":
+            final[paper_id] = (target, flips + 1)
+        else:
+            final[paper_id] = (op == "add", 0)
+    collapsed = []
+    for paper_id, (target, flips) in final.items():
+        if target is None:
+            collapsed.append((paper_id, "toggle" if flips % 2 else "none"))
+        else:
+            collapsed.append((paper_id, "add" if target != bool(flips % 2) else "remove"))
+    return collapsed
+
+
+class GuestFavoriteManager(models.Manager):
+    def apply(self, guest_id, ops):
+        # ops: [(paper_id, op)] (같은 논문 여러 번이면 순서대로 적용한 결과)
+        # → [(paper_id, favorite, status)], status: added / removed / unchanged
+        ops = collapse_favorite_ops(ops)
+        if not ops:
+            return []
+        params = {"guest": guest_id, "papers": [pid for pid, _ in ops], "ops": [op for _, op in ops]}
+        with transaction.atomic(), connection.cursor() as cur:
+            # 없는 guest 면 lock 할 행이 없고, 아래 INSERT 가 FK 위반 (IntegrityError)
+            cur.execute("SELECT 1 FROM guest WHERE guest_id = %s FOR NO KEY UPDATE", [guest_id])
+            cur.execute(APPLY_FAVORITES_SQL, params)
+            rows = cur.fetchall()
+        return [
+            (pid, added or (existed and not removed), "added" if added else "removed" if removed else "unchanged")
+            for pid, added, removed, existed in rows
+        ]
+
+
 class GuestFavorite(models.Model):
+    favorite_id = models.BigAutoField(primary_key=True)
     guest = models.ForeignKey(Guest, on_delete=models.CASCADE)
     paper = models.ForeignKey(Paper, on_delete=models.CASCADE)
 
+    objects = GuestFavoriteManager()
+
     class Meta:
         db_table = 'guestfavorite'
         unique_together = ('guest', 'paper')
+        indexes = [
+            models.Index(fields=["guest", "-favorite_id"], name="guestfavorite_guest_idx"),
+        ]
 
+# 즐겨찾기 추가 / 삭제 때 GuestFavoriteManager.apply 가 같은 문장에서 갱신
 class GuestCategoryCount(models.Model):
+    ucc_id = models.AutoField(primary_key=True)
     guest = models.ForeignKey(Guest, on_delete=models.CASCADE)
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     count = models.IntegerField(default=0)
 
     class Meta:
-        db_table = 'guestcategorycount'
\ No newline at end of file
+        db_table = 'guestcategorycount'
+
+# guestcategorycount 변화량의 일별 합 (trending_categories 용)
+#   DB 트리거(table_schema.sql 의 CATEGORY INTEREST ROLLUP)가 guestcategorycount INSERT / UPDATE / DELETE 때 갱신
+#   최근 N일 트렌드 = day 범위 합 (카테고리 수 × N 행), 1970-01-01 행은 rollup 도입 전 누적분
+class CategoryInterestDaily(models.Model):
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    day = models.DateField()
+    delta = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'category_interest_daily'
+        unique_together = ('category', 'day')
+        indexes = [
+            models.Index(fields=["day"], name="category_interest_day_idx"),
+        ]
+
+# ingest(merge_and_insert.py, api_call.py) 때마다 +1 되는 단일 행 (papers/caching.py)
+class DataVersion(models.Model):
+    id = models.SmallIntegerField(primary_key=True, default=1)
+    version = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'data_version'
+
+
+# --------------------------------------------------------
+# 📌 인기도 (services/popularity.py)
+#   paper.weekly_count = 최근 POPULARITY_WINDOW_HOURS 시간 조회수 합
+#   조회수는 시간 단위 bucket 에 쌓고, 창 밖으로 나간 bucket 만큼만 빼서 유지 (전체 행 reset 없음)
+# --------------------------------------------------------
+class PaperViewHourly(models.Model):
+    paper = models.ForeignKey(Paper, on_delete=models.CASCADE)
+    hour = models.DateTimeField()
+    hits = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'paper_view_hourly'
+        unique_together = ('paper', 'hour')
+        indexes = [
+            models.Index(fields=["hour"], name="paper_view_hourly_hour_idx"),
+        ]
+
+
+# weekly_count 상위 POPULAR_TOP_K 편 (rank 1 부터), roll 때마다 다시 계산
+class PopularPaper(models.Model):
+    rank = models.SmallIntegerField(primary_key=True)
+    paper = models.OneToOneField(Paper, on_delete=models.CASCADE, related_name="popular")
+
+    class Meta:
+        db_table = 'popular_paper'
+
+
+# 카테고리별 추천 후보 (점수 상위 RECOMMEND_CANDIDATES 편, rank 1 부터), roll 때마다 다시 계산
+#   점수 계산 / 읽는 쪽은 services/recommend.py
+class RecommendCandidate(models.Model):
+    paper = models.OneToOneField(Paper, primary_key=True, on_delete=models.CASCADE, related_name="recommend")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    rank = models.IntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        db_table = 'recommend_candidate'
+        unique_together = ('category', 'rank')
+
+
+# "같이 저장한 논문": 논문마다 공동 저장 cosine 상위 CF_TOP_K 개 (rank 1 부터)
+#   services/itemcf.py 가 guestfavorite 로 계산, 바뀐 논문(paper_neighbor_dirty)만 다시 계산
+class PaperNeighbor(models.Model):
+    paper = models.ForeignKey(Paper, on_delete=models.CASCADE, related_name="neighbors")
+    rank = models.SmallIntegerField()
+    neighbor = models.ForeignKey(Paper, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+
+    class Meta:
+        db_table = 'paper_neighbor'
+        unique_together = ('paper', 'rank')
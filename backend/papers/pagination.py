@@ -0,0 +1,171 @@
+import base64
+import datetime
+import json
+import math
+
+from django.conf import settings
+from django.db.models import F, Q
+
+DEFAULT_PAGE_SIZE = getattr(settings, "DEFAULT_PAGE_SIZE", 20)
+MAX_PAGE_SIZE = getattr(settings, "MAX_PAGE_SIZE", 100)
+
+# 정렬 옵션 → keyset 정렬 컬럼 (항상 pk DESC 가 tie-breaker)
+ORDER_FIELDS = {
+    "latest": "announcement_date",
+    "cited": "citation",
+    "influence": "influence",
+    "relevance": "rank",
+}
+
+
+class InvalidPage(ValueError):
+    pass
+
+
+# --------------------------------------------------------
+# 📌 cursor 값 검사 (정렬 컬럼 타입으로 변환, 안 맞으면 ValueError / TypeError)
+#   cursor 는 클라이언트가 그대로 돌려보내는 값 → 조작된 값이 .filter() 까지 가면 500
+# --------------------------------------------------------
+def date_value(value):
+    if not isinstance(value, str):
+        raise TypeError
+    return datetime.date.fromisoformat(value)
+
+
+def int_value(value):
+    # bool 은 int 의 subclass 라 따로 거름, INTEGER 컬럼 범위 밖이면 DB 에서 DataError
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError
+    if not -2 ** 31 <= value < 2 ** 31:
+        raise ValueError
+    return value
+
+
+def float_value(value):
+    # json.loads 는 NaN / Infinity 도 받음
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise TypeError
+    return float(value)
+
+
+# 정렬 컬럼 → cursor 값 변환 (NULL 구간 cursor 는 None 그대로)
+CURSOR_VALUE_TYPES = {
+    "announcement_date": date_value,
+    "citation": int_value,
+    "influence": float_value,
+    "rank": float_value,
+}
+
+
+# --------------------------------------------------------
+# 📌 cursor 인코딩 (불투명 문자열)
+# --------------------------------------------------------
+def encode_cursor(tag, value, pk):
+    raw = json.dumps({"o": tag, "v": value, "id": pk}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, tag, value_type=None, nullable=True):
+    # value_type: cursor 값 변환 함수 (CURSOR_VALUE_TYPES), nullable=False 면 None 도 거부
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["o"] != tag:
+            raise InvalidPage("Invalid cursor")
+        value, pk = data["v"], int_value(data["id"])
+        if value is None:
+            if not nullable:
+                raise InvalidPage("Invalid cursor")
+        elif value_type is not None:
+            value = value_type(value)
+        return value, pk
+    except (ValueError, KeyError, TypeError):
+        raise InvalidPage("Invalid cursor")
+
+
+def page_size(request, default=DEFAULT_PAGE_SIZE):
+    try:
+        size = int(request.GET.get("limit", default))
+    except ValueError:
+        raise InvalidPage("Invalid limit")
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+# --------------------------------------------------------
+# 📌 keyset 페이지네이션
+#   (sort_field DESC NULLS LAST, pk DESC) 순서로 cursor 다음 행부터 size 개
+#   OFFSET 없이 인덱스 범위 조건(sort_field <= v)으로 시작 위치를 찾음
+#   columns 를 주면 모델 객체 대신 values_list(*columns) 튜플로 반환 (serializers.RowSerializer 용)
+#   cursor 에 필요한 sort_field / pk 컬럼이 없으면 튜플 끝에 덧붙임
+# --------------------------------------------------------
+def keyset_paginate(request, qs, sort_field=None, tag="pk", default_size=DEFAULT_PAGE_SIZE, columns=None):
+    size = page_size(request, default_size)
+    cursor = request.GET.get("cursor")
+    value, last_pk = (
+        decode_cursor(cursor, tag, CURSOR_VALUE_TYPES.get(sort_field)) if cursor else (None, None)
+    )
+
+    if columns is not None:
+        pk_name = qs.model._meta.pk.name
+        columns = list(columns)
+        for extra in (sort_field, pk_name):
+            if extra and extra not in columns:
+                columns.append(extra)
+        sort_idx = columns.index(sort_field) if sort_field else None
+        pk_idx = columns.index(pk_name)
+
+    def fetch(q):
+        return q if columns is None else q.values_list(*columns)
+
+    def row_key(row):
+        if columns is None:
+            return (getattr(row, sort_field) if sort_field else None), row.pk
+        return (row[sort_idx] if sort_field else None), row[pk_idx]
+
+    if sort_field is None:
+        if last_pk is not None:
+            qs = qs.filter(pk__lt=last_pk)
+        rows = list(fetch(qs.order_by("-pk"))[:size + 1])
+    else:
+        rows = []
+        # 1) sort_field 가 NULL 이 아닌 구간
+        if last_pk is None or value is not None:
+            head = qs.filter(**{f"{sort_field}__isnull": False})
+            if last_pk is not None:
+                head = head.filter(**{f"{sort_field}__lte": value}).filter(
+                    Q(**{f"{sort_field}__lt": value}) | Q(pk__lt=last_pk)
+                )
+                last_pk = None
+            rows = list(fetch(head.order_by(F(sort_field).desc(nulls_last=True), "-pk"))[:size + 1])
+        # 2) NULL 구간 (앞 구간에서 페이지가 안 찼을 때만)
+        if len(rows) <= size:
+            tail = qs.filter(**{f"{sort_field}__isnull": True})
+            if last_pk is not None:
+                tail = tail.filter(pk__lt=last_pk)
+            rows += list(fetch(tail.order_by("-pk"))[:size + 1 - len(rows)])
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(tag, *row_key(rows[-1]))
+    return rows, next_cursor
+
+
+# --------------------------------------------------------
+# 📌 메모리 검색 엔진 결과 페이지네이션 (BM25 등)
+#   search_fn(k, after) → [(pk, score)] (score DESC, pk DESC), after=(pk, score)
+# --------------------------------------------------------
+def ranked_paginate(request, search_fn, tag, default_size=DEFAULT_PAGE_SIZE):
+    size = page_size(request, default_size)
+    cursor = request.GET.get("cursor")
+    after = None
+    if cursor:
+        score, last_pk = decode_cursor(cursor, tag, float_value, nullable=False)
+        after = (last_pk, score)
+
+    hits = search_fn(size + 1, after)
+    next_cursor = None
+    if len(hits) > size:
+        hits = hits[:size]
+        next_cursor = encode_cursor(tag, hits[-1][1], hits[-1][0])
+    return hits, next_cursor
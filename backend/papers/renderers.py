@@ -0,0 +1,46 @@
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson 이 없으면 DRF 기본 JSONRenderer 로 동작
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# msgpack 이 없으면 MessagePack 응답은 제공하지 않음 (Accept: application/msgpack → 406)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    # date/datetime/UUID 는 orjson 이 직접, 나머지(Decimal, QuerySet 등)는 DRF encoder 로
+    _fallback = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=self._fallback, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MessagePackRenderer(BaseRenderer):
+    # Accept: application/msgpack 또는 ?format=msgpack, JSON 으로 못 바꾸는 값은 ORJSONRenderer 와 같이 처리
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    _fallback = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=self._fallback, use_bin_type=True)
+
+
+# 목록 view 에 @renderer_classes(FAST_RENDERERS) 로 지정 (첫 번째가 기본)
+FAST_RENDERERS = [ORJSONRenderer, BrowsableAPIRenderer]
+if msgpack is not None:
+    FAST_RENDERERS.insert(1, MessagePackRenderer)
@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Greatest
+
+# paper.search_vector 를 만드는 text search config 와 같아야 함 (table_schema.sql)
+SEARCH_CONFIG = "english"
+
+# fuzzy 검색 기본 임계값 (pg_trgm.word_similarity_threshold, 0~1)
+FUZZY_THRESHOLD = 0.4
+
+
+# ts_rank / word_similarity 는 real(float4) → float8 로 cast 해서 정렬
+#   (cursor 값은 JSON float(float8) 로 돌아와 비교되므로, float4 그대로면 자기 값과도 같지 않아 페이지가 반복됨)
+
+# --------------------------------------------------------
+# 📌 full-text (tsvector + GIN)
+# --------------------------------------------------------
+def fulltext_search(qs, keyword):
+    # websearch 문법 지원: "exact phrase", -제외어, OR
+    query = SearchQuery(keyword, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        qs.filter(search_vector=query)
+        .annotate(rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
+    )
+
+
+# --------------------------------------------------------
+# 📌 fuzzy (pg_trgm word similarity + GIN)
+# --------------------------------------------------------
+# 각 분기가 gin_trgm_ops 인덱스를 타도록 UNION 으로 나눔 (OR 로 묶으면 seq scan)
+FUZZY_MATCH_SQL = """
+    SELECT paper_id FROM paper WHERE %s <%% title
+    UNION
+    SELECT paper_id FROM paper WHERE %s <%% submit
+    UNION
+    SELECT ap.paper_id
+    FROM author a JOIN authorpaper ap ON ap.author_id = a.author_id
+    WHERE %s <%% a.author_name
+"""
+
+FUZZY_AUTHOR_SIMILARITY_SQL = """
+    SELECT max(word_similarity(%s, a.author_name))
+    FROM authorpaper ap JOIN author a ON a.author_id = ap.author_id
+    WHERE ap.paper_id = paper.paper_id
+"""
+
+
+@contextmanager
+def trigram_threshold(threshold):
+    # <% 연산자(인덱스 조건)는 GUC 값을 임계값으로 사용 → 트랜잭션 안에서만 변경
+    with transaction.atomic():
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(threshold)],
+            )
+        yield
+
+
+def fuzzy_search(qs, keyword):
+    # trigram_threshold() 블록 안에서 평가해야 함
+    return (
+        qs.filter(pk__in=RawSQL(FUZZY_MATCH_SQL, [keyword, keyword, keyword]))
+        .annotate(rank=Cast(Greatest(
+            TrigramWordSimilarity(keyword, "title"),
+            TrigramWordSimilarity(keyword, "submit"),
+            RawSQL(FUZZY_AUTHOR_SIMILARITY_SQL, [keyword], output_field=FloatField()),
+        ), FloatField()))
+    )
+
+
+# --------------------------------------------------------
+# 📌 기존 부분 문자열 검색 (ILIKE '%kw%', 인덱스 미사용)
+# --------------------------------------------------------
+def contains_search(qs, keyword):
+    return qs.filter(
+        Q(title__icontains=keyword) |
+        Q(submit__icontains=keyword)
+    )
@@ -1,3 +1,5 @@
+import operator
+
 from rest_framework import serializers
 from .models import Paper, Category, Institution, Author, Abstract, YearCitation, Guest, GuestFavorite, GuestCategoryCount
 
@@ -12,18 +14,47 @@ class InstitutionSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 class PaperSerializer(serializers.ModelSerializer):
+    # 목록 응답: authors(M2M) 는 행마다 쿼리가 생기므로 상세(PaperDetailSerializer)에서만
+    # updated_at 은 응답 본문 대신 ETag / Last-Modified 헤더로, influence 는 정렬 전용
     class Meta:
         model = Paper
-        fields = "__all__"
+        exclude = ("search_vector", "authors", "updated_at", "influence")
+
+# --------------------------------------------------------
+# 📌 fields= (sparse fieldset) 파싱
+#   "title,citation" → 허용 목록 순서대로 정렬한 tuple, 비어 있으면 None (= 전체)
+#   paper_id 는 카드 식별 / cursor 에 필요하므로 항상 포함
+# --------------------------------------------------------
+def parse_fields(raw, allowed):
+    if not raw:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    requested.add("paper_id")
+    return tuple(name for name in allowed if name in requested)
+
 
+# Paper.objects.with_detail(fields) 로 읽은 객체를 넘겨야 추가 쿼리가 없음
+# fields 를 주면 그 필드만 출력
 class PaperDetailSerializer(serializers.ModelSerializer):
     abstract = serializers.CharField(source='abstract.context', read_only=True)
+    category_name = serializers.CharField(source='category.category_name', read_only=True, allow_null=True)
+    institution_name = serializers.CharField(source='institution.institution_name', read_only=True, allow_null=True)
+    country_code = serializers.CharField(source='institution.country_code', read_only=True, allow_null=True)
     year_citations = serializers.SerializerMethodField()
     authors = serializers.SerializerMethodField()
 
     class Meta:
         model = Paper
-        fields = "__all__"
+        exclude = ("search_vector", "updated_at", "influence")
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def get_year_citations(self, obj):
         try:
@@ -32,11 +63,15 @@ class PaperDetailSerializer(serializers.ModelSerializer):
                 "year2": obj.yearcitation.recent_year2_count,
                 "year3": obj.yearcitation.recent_year3_count,
             }
-        except:
+        except YearCitation.DoesNotExist:
             return None
     
     def get_authors(self, obj):
-        return list(obj.author_set.values("author_id", "author_name"))
+        # prefetch 된 authorpaper_set (ap_id 순) 사용
+        return [
+            {"author_id": ap.author_id, "author_name": ap.author.author_name}
+            for ap in obj.authorpaper_set.all()
+        ]
 
 class GuestFavoriteSerializer(serializers.ModelSerializer):
     paper = PaperSerializer()
@@ -44,3 +79,69 @@ class GuestFavoriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = GuestFavorite
         fields = "__all__"
+
+
+# --------------------------------------------------------
+# 📌 목록 응답 fast path
+#   ModelSerializer 는 행마다 field 객체를 거쳐 dict 를 만듦 → 100행 페이지에서 SQL 보다 느림
+#   RowSerializer 는 ModelSerializer 의 필드 구성을 한 번만 읽어서
+#     - values_list() 로 가져올 컬럼 목록 (columns)
+#     - 튜플 → dict 변환 함수 (itemgetter 로 컬럼을 한 번에 꺼내 dict(zip(keys, ...)))
+#   을 만들어 둠. 출력 key / 순서는 원래 serializer 와 같음
+#   (날짜는 date 객체 그대로 → renderer 가 ISO 문자열로 변환, DRF 와 같은 JSON)
+# --------------------------------------------------------
+#   only(fields) 는 출력 필드 일부만 고른 RowSerializer (→ SELECT 컬럼도 그만큼만)
+class RowSerializer:
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        self.columns = []
+        self.fields = fields or tuple(serializer_class().fields)
+        self.to_dict = self._compile(serializer_class(), "", self.fields)
+        self._subsets = {}
+
+    def only(self, fields):
+        if fields is None:
+            return self
+        if fields not in self._subsets:
+            self._subsets[fields] = RowSerializer(self.serializer_class, fields)
+        return self._subsets[fields]
+
+    def _compile(self, serializer, prefix, fields=None):
+        # parts: (key, 컬럼 번호) 또는 (key, 중첩 serializer 변환 함수)
+        parts = []
+        for name, field in serializer.fields.items():
+            if fields is not None and name not in fields:
+                continue
+            source = prefix + field.source.replace(".", "__")
+            if isinstance(field, serializers.BaseSerializer):
+                parts.append((name, self._compile(field, source + "__")))
+            elif isinstance(field, (serializers.SerializerMethodField, serializers.ManyRelatedField)):
+                raise TypeError(f"{name}: {type(field).__name__} is not supported by RowSerializer")
+            else:
+                # FK(PrimaryKeyRelatedField) 는 values_list 에서 id 로 나옴
+                parts.append((name, len(self.columns)))
+                self.columns.append(source)
+
+        keys = tuple(name for name, _ in parts)
+        if not all(isinstance(get, int) for _, get in parts):
+            getters = [operator.itemgetter(get) if isinstance(get, int) else get for _, get in parts]
+            return lambda r: {key: get(r) for key, get in zip(keys, getters)}
+        indexes = [i for _, i in parts]
+        if indexes == list(range(len(parts))):
+            # 컬럼이 앞에서부터 순서대로 (보통의 경우) → 꺼낼 필요 없이 zip (뒤에 붙은 정렬용 컬럼은 zip 이 버림)
+            return lambda r: dict(zip(keys, r))
+        if len(parts) == 1:
+            i, = indexes
+            return lambda r: {keys[0]: r[i]}
+        getter = operator.itemgetter(*indexes)
+        return lambda r: dict(zip(keys, getter(r)))
+
+    def to_dicts(self, rows):
+        return list(map(self.to_dict, rows))
+
+    def values(self, qs):
+        return qs.values_list(*self.columns)
+
+
+PAPER_ROWS = RowSerializer(PaperSerializer)
+GUEST_FAVORITE_ROWS = RowSerializer(GuestFavoriteSerializer)
@@ -0,0 +1,243 @@
+# papers/services/autocomplete.py
+# 검색창 자동완성: 제목 / 저자 / 카테고리 / 학회(venue) 접두어 검색
+#  - 정규화한 문자열을 정렬된 list 로 들고 bisect 로 접두어 범위 [lo, hi) 를 찾음
+#  - 범위 안에서 weight(citation, weekly_count) 상위 k 개를 NumPy argpartition 으로 선택
+#  - 1~2 글자 접두어는 범위가 커서 상위 k 개를 미리 계산해 둠
+#  - snapshot(data/autocomplete.npz) 으로 worker 시작 시 바로 로드, data version 이 바뀌면 background 재빌드
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.db.models import Sum
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_SNAPSHOT_PATH = getattr(
+    settings, "AUTOCOMPLETE_SNAPSHOT_PATH", os.path.join(settings.BASE_DIR, "data", "autocomplete.npz")
+)
+AUTOCOMPLETE_REFRESH_INTERVAL = getattr(settings, "AUTOCOMPLETE_REFRESH_INTERVAL", 30)
+
+# weight = log1p(citation) + WEEKLY_WEIGHT * log1p(weekly_count)
+WEEKLY_WEIGHT = 2.0
+
+KINDS = ("title", "author", "category", "venue")
+
+SHORT_PREFIX_LEN = 2
+SHORT_TOP_K = 20
+
+SEPARATOR = "\x1f"
+
+AUTHOR_WEIGHT_SQL = """
+SELECT a.author_id, a.author_name, COALESCE(SUM(p.citation), 0), COALESCE(SUM(p.weekly_count), 0)
+FROM author a
+LEFT JOIN authorpaper ap ON ap.author_id = a.author_id
+LEFT JOIN paper p ON p.paper_id = ap.paper_id
+GROUP BY a.author_id, a.author_name
+"""
+
+
+def normalize(text):
+    return " ".join(text.casefold().split()) if text else ""
+
+
+def weight(citation, weekly_count):
+    return math.log1p(max(citation or 0, 0)) + WEEKLY_WEIGHT * math.log1p(max(weekly_count or 0, 0))
+
+
+class Autocomplete:
+    def __init__(self, keys, texts, kinds, refs, weights, version=None):
+        # keys 는 정렬돼 있어야 함 (from_entries / load), texts 는 응답에 보여줄 원문
+        self.keys = keys
+        self.texts = texts
+        self.kinds = kinds
+        self.refs = refs
+        self.weights = weights
+        self.version = version
+        self.short = self._precompute_short()
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def from_entries(cls, entries, version=None):
+        # entries: [(검색 key, text, kind 번호, ref id, weight)]
+        entries = sorted((normalize(e[0]),) + tuple(e[1:]) for e in entries if normalize(e[0]))
+        return cls(
+            [e[0] for e in entries],
+            [e[1] for e in entries],
+            np.array([e[2] for e in entries], dtype=np.uint8),
+            np.array([e[3] for e in entries], dtype=np.int64),
+            np.array([e[4] for e in entries], dtype=np.float32),
+            version,
+        )
+
+    def _range(self, prefix):
+        return bisect_left(self.keys, prefix), bisect_left(self.keys, prefix + "\U0010ffff")
+
+    def _top(self, lo, hi, k, kind=None):
+        idx = np.arange(lo, hi)
+        if kind is not None:
+            idx = idx[self.kinds[lo:hi] == kind]
+        w = self.weights[idx]
+        if len(idx) > k:
+            part = np.argpartition(-w, k - 1)[:k]
+            idx, w = idx[part], w[part]
+        return idx[np.argsort(-w, kind="stable")]
+
+    def _precompute_short(self):
+        short = {}
+        prefixes = sorted({key[:n] for key in self.keys for n in range(1, SHORT_PREFIX_LEN + 1) if len(key) >= n})
+        for prefix in prefixes:
+            short[prefix] = self._top(*self._range(prefix), SHORT_TOP_K * 2)
+        return short
+
+    def suggest(self, prefix, k=10, kind=None):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        # 같은 대상이 여러 key 로 들어가 있을 수 있음 (저자: 전체 이름 + 성) → 여유 있게 뽑아서 중복 제거
+        want = k * 2
+        if kind is None and len(prefix) <= SHORT_PREFIX_LEN and want <= SHORT_TOP_K * 2:
+            candidates = self.short.get(prefix, ())
+        else:
+            candidates = self._top(*self._range(prefix), want, kind)
+
+        results, seen = [], set()
+        for i in candidates:
+            kind_no, ref = int(self.kinds[i]), int(self.refs[i])
+            ident = (kind_no, ref if ref >= 0 else self.keys[i])
+            if ident in seen:
+                continue
+            seen.add(ident)
+            results.append({
+                "text": self.texts[i],
+                "type": KINDS[kind_no],
+                "id": ref if ref >= 0 else None,
+                "score": round(float(self.weights[i]), 4),
+            })
+            if len(results) == k:
+                break
+        return results
+
+    # --------------------------------------------------------
+    # 📌 빌드 / snapshot
+    # --------------------------------------------------------
+    @classmethod
+    def from_db(cls, version=None):
+        from papers.models import Category, Paper
+
+        entries = []
+        rows = Paper.objects.values_list("paper_id", "title", "citation", "weekly_count").iterator(chunk_size=5000)
+        for pid, title, citation, weekly in rows:
+            entries.append((title, title, 0, pid, weight(citation, weekly)))
+
+        with connection.cursor() as cur:
+            cur.execute(AUTHOR_WEIGHT_SQL)
+            for aid, name, citation, weekly in cur.fetchall():
+                w = weight(citation, weekly)
+                entries.append((name, name, 1, aid, w))
+                # 성(마지막 단어)으로도 찾을 수 있게
+                parts = (name or "").split()
+                if len(parts) > 1:
+                    entries.append((" ".join(parts[-1:] + parts[:-1]), name, 1, aid, w))
+
+        categories = Category.objects.annotate(c=Sum("paper__citation"), w=Sum("paper__weekly_count"))
+        for cid, name, citation, weekly in categories.values_list("category_id", "category_name", "c", "w"):
+            entries.append((name, name, 2, cid, weight(citation, weekly)))
+
+        venues = (
+            Paper.objects.exclude(submit__isnull=True).exclude(submit="")
+            .values_list("submit").annotate(c=Sum("citation"), w=Sum("weekly_count"))
+        )
+        for venue, citation, weekly in venues:
+            entries.append((venue, venue, 3, -1, weight(citation, weekly)))
+
+        return cls.from_entries(entries, version)
+
+    def save(self, path=AUTOCOMPLETE_SNAPSHOT_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp,
+            keys=np.frombuffer(SEPARATOR.join(self.keys).encode(), dtype=np.uint8),
+            texts=np.frombuffer(SEPARATOR.join(self.texts).encode(), dtype=np.uint8),
+            kinds=self.kinds, refs=self.refs, weights=self.weights,
+            version=np.int64(-1 if self.version is None else self.version),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=AUTOCOMPLETE_SNAPSHOT_PATH):
+        def strings(arr):
+            raw = arr.tobytes().decode()
+            return raw.split(SEPARATOR) if raw else []
+
+        with np.load(path) as f:
+            version = int(f["version"])
+            return cls(
+                strings(f["keys"]), strings(f["texts"]), f["kinds"], f["refs"], f["weights"],
+                None if version < 0 else version,
+            )
+
+
+# --------------------------------------------------------
+# 📌 worker 전역 인덱스
+#   첫 요청에서 snapshot 로드 (오래된 것이어도 일단 사용, 없으면 DB 에서 빌드)
+#   이후 background thread 가 AUTOCOMPLETE_REFRESH_INTERVAL 마다 data version 을 보고
+#   바뀌었으면 새로 빌드해서 교체 (검색은 교체 전 객체를 그대로 씀 → lock 불필요)
+# --------------------------------------------------------
+_index = None
+_lock = threading.Lock()
+
+
+def _rebuild(version):
+    # 다른 worker 가 같은 version 으로 이미 저장했으면 그 snapshot 사용
+    if os.path.exists(AUTOCOMPLETE_SNAPSHOT_PATH):
+        snapshot = Autocomplete.load()
+        if snapshot.version == version:
+            return snapshot
+    index = Autocomplete.from_db(version)
+    index.save()
+    return index
+
+
+def _refresh_loop():
+    from papers.caching import data_version
+
+    global _index
+    while True:
+        time.sleep(AUTOCOMPLETE_REFRESH_INTERVAL)
+        try:
+            version = data_version()
+            if version != _index.version:
+                _index = _rebuild(version)
+        except Exception:
+            logger.exception("autocomplete refresh failed")
+        finally:
+            connection.close()
+
+
+def get_index():
+    global _index
+    if _index is None:
+        from papers.caching import data_version
+
+        with _lock:
+            if _index is None:
+                if os.path.exists(AUTOCOMPLETE_SNAPSHOT_PATH):
+                    _index = Autocomplete.load()
+                else:
+                    _index = _rebuild(data_version())
+                threading.Thread(target=_refresh_loop, name="autocomplete-refresh", daemon=True).start()
+    return _index
+
+
+def suggest(prefix, k=10, kind=None):
+    return get_index().suggest(prefix, k, kind)
@@ -0,0 +1,265 @@
+# papers/services/bm25.py
+# Postgres text search 없이 Django worker 안에서 도는 BM25 검색 엔진
+#  - posting list: term 마다 array('I') 두 개 (문서 번호, tf) → 검색 시 np.frombuffer 로 복사 없이 NumPy 연산
+#  - 문서 추가는 append 만 (같은 paper_id 가 다시 들어오면 이전 문서는 tombstone 처리)
+import array
+import json
+import logging
+import math
+import os
+import pickle
+import re
+import threading
+import time
+import zlib
+from contextlib import nullcontext
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+from .topk import top_k
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were with we our".split()
+)
+
+# title 은 abstract 보다 중요 → tf 에 가중치
+TITLE_BOOST = 2
+
+BM25_INDEX_PATH = getattr(settings, "BM25_INDEX_PATH", os.path.join(settings.BASE_DIR, "data", "bm25_index.pkl"))
+BM25_REFRESH_INTERVAL = getattr(settings, "BM25_REFRESH_INTERVAL", 30)
+
+# updated_at 은 트랜잭션 시작 시각 (now()) → 마지막 반영 시점보다 조금 앞에서부터 다시 읽음
+#   (다시 읽은 문서는 내용 checksum 이 같으면 건너뜀)
+WATERMARK_SLACK = timedelta(minutes=5)
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def checksum(title, abstract=None):
+    # 색인 내용(title + abstract)이 바뀌었는지 비교용 (updated_at 은 조회수 / 인용 수로도 바뀜)
+    return zlib.crc32(f"{title or ''}\x00{abstract or ''}".encode())
+
+
+class BM25Index:
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab = {}                  # term → term 번호
+        self.post_docs = []              # term 번호 → array('I') 문서 번호
+        self.post_tfs = []               # term 번호 → array('I') tf
+        self.doc_pids = array.array("q")  # 문서 번호 → paper_id
+        self.doc_lens = array.array("I")
+        self.doc_crcs = array.array("I")  # 문서 번호 → title + abstract checksum (내용이 같으면 재색인 안 함)
+        self.live = bytearray()          # 0 이면 tombstone
+        self.pid_to_doc = {}
+        self.total_len = 0
+        # DB 증분 반영 기준: 마지막으로 반영한 data_version 과 그 changed_at
+        #   (이후 updated_at 이 바뀐 논문 = 새 논문 + abstract 가 나중에 들어온 논문 + 수정된 논문)
+        self.version = None
+        self.synced_at = None
+
+    def __len__(self):
+        return len(self.pid_to_doc)
+
+    # --------------------------------------------------------
+    # 📌 색인
+    # --------------------------------------------------------
+    @staticmethod
+    def prepare(title, abstract=None):
+        # 토큰화 (lock 밖에서 해도 됨) → (term 별 tf, checksum)
+        tfs = {}
+        for token in tokenize(title):
+            tfs[token] = tfs.get(token, 0) + TITLE_BOOST
+        for token in tokenize(abstract):
+            tfs[token] = tfs.get(token, 0) + 1
+        return tfs, checksum(title, abstract)
+
+    def add(self, paper_id, title, abstract=None):
+        return self.insert(paper_id, *self.prepare(title, abstract))
+
+    def insert(self, paper_id, tfs, crc):
+        # 내용이 그대로면 False (updated_at 만 바뀐 경우: 조회수, 인용 수 등)
+        old = self.pid_to_doc.get(paper_id)
+        if old is not None:
+            if self.doc_crcs[old] == crc:
+                return False
+            self.live[old] = 0
+            self.total_len -= self.doc_lens[old]
+
+        doc = len(self.doc_pids)
+        for token, tf in tfs.items():
+            tid = self.vocab.get(token)
+            if tid is None:
+                tid = self.vocab[token] = len(self.post_docs)
+                self.post_docs.append(array.array("I"))
+                self.post_tfs.append(array.array("I"))
+            self.post_docs[tid].append(doc)
+            self.post_tfs[tid].append(tf)
+
+        length = sum(tfs.values())
+        self.doc_pids.append(paper_id)
+        self.doc_lens.append(length)
+        self.doc_crcs.append(crc)
+        self.live.append(1)
+        self.pid_to_doc[paper_id] = doc
+        self.total_len += length
+        return True
+
+    # --------------------------------------------------------
+    # 📌 검색: term-at-a-time 누적 후 상위 k 개
+    #   결과는 [(paper_id, score)], after=(paper_id, score) 이면 그 다음 순위부터 (cursor 페이지네이션)
+    # --------------------------------------------------------
+    def search(self, query, k=10, after=None):
+        n_live = len(self.pid_to_doc)
+        if not n_live:
+            return []
+
+        n_docs = len(self.doc_pids)
+        avgdl = self.total_len / n_live
+        doc_lens = np.frombuffer(self.doc_lens, dtype=np.uint32)
+        scores = np.zeros(n_docs, dtype=np.float32)
+
+        for token in set(tokenize(query)):
+            tid = self.vocab.get(token)
+            if tid is None:
+                continue
+            docs = np.frombuffer(self.post_docs[tid], dtype=np.uint32)
+            tfs = np.frombuffer(self.post_tfs[tid], dtype=np.uint32).astype(np.float32)
+            df = len(docs)
+            idf = math.log(1 + (n_live - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * doc_lens[docs] / avgdl)
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+        scores *= np.frombuffer(self.live, dtype=np.uint8)
+        candidates = np.flatnonzero(scores)
+        pids = np.frombuffer(self.doc_pids, dtype=np.int64)[candidates]
+        cand_scores = scores[candidates]
+
+        return top_k(pids, cand_scores, k, after)
+
+    # --------------------------------------------------------
+    # 📌 빌드 / 증분 반영
+    # --------------------------------------------------------
+    def add_from_db(self, version=None, changed_at=None, chunk_size=2000, lock=None):
+        # synced_at 이후 updated_at 이 바뀐 논문을 (처음이면 전체를) 색인 → 새로 색인한 문서 수
+        #   version / changed_at: 읽기 시작 전의 data_version (다 반영하면 다음 기준이 됨)
+        #   lock: DB 읽기 / 토큰화는 lock 밖, 인덱스 변경만 chunk 단위로 lock 안에서 (그 사이 검색 가능)
+        #   updated_at 인덱스(paper_updated_at_idx) 로 바뀐 논문만 읽음, data_version 이 바뀐 경우에만 호출
+        from papers.models import Paper
+
+        lock = lock or nullcontext()
+        qs = Paper.objects.order_by("paper_id")
+        if self.synced_at is not None:
+            qs = qs.filter(updated_at__gte=self.synced_at - WATERMARK_SLACK)
+        rows = qs.values_list("paper_id", "title", "abstract__context").iterator(chunk_size=chunk_size)
+
+        added = 0
+        batch = []
+        for paper_id, title, abstract in rows:
+            batch.append((paper_id, *self.prepare(title, abstract)))
+            if len(batch) == chunk_size:
+                with lock:
+                    added += sum(self.insert(*doc) for doc in batch)
+                batch = []
+        with lock:
+            added += sum(self.insert(*doc) for doc in batch)
+            self.version, self.synced_at = version, changed_at
+        return added
+
+    def add_from_json(self, data_dir):
+        # data/paper.json (export_to_json.py 결과) 는 paper_id 가 없으므로 alex_paper_id 로 매핑
+        from papers.models import Paper
+
+        with open(os.path.join(data_dir, "paper.json"), encoding="utf-8") as f:
+            items = json.load(f)
+        pid_map = dict(Paper.objects.values_list("alex_paper_id", "paper_id"))
+        added = 0
+        for p in items:
+            paper_id = pid_map.get(p.get("alex_paper_id"))
+            if paper_id is not None:
+                self.add(paper_id, p.get("title"), p.get("abstract"))
+                added += 1
+        return added
+
+    def save(self, path=BM25_INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=BM25_INDEX_PATH):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+# --------------------------------------------------------
+# 📌 worker 전역 인덱스
+#   첫 요청에서 snapshot 을 로드하고 background thread 시작 (요청 thread 는 DB 를 읽지 않음)
+#   thread 는 BM25_REFRESH_INTERVAL 마다 data_version 확인 → 바뀌었으면 updated_at 기준으로 바뀐 논문만 재색인
+#   snapshot 이 없으면 thread 가 DB 전체를 색인하고, 끝날 때까지 검색은 IndexNotReady (503)
+#   snapshot 은 worker 가 쓰지 않음 (build_bm25_index.py --update 로 갱신)
+#   검색 중 NumPy 가 posting array 버퍼를 잡고 있으면 append 가 불가 → 검색/추가 모두 _lock 안에서
+# --------------------------------------------------------
+class IndexNotReady(Exception):
+    pass
+
+
+_index = None      # 검색에 쓰는 인덱스 (snapshot 이 없으면 첫 색인이 끝난 뒤에 설정)
+_refresher = None
+_lock = threading.Lock()
+
+
+def _refresh_loop(index):
+    global _index
+    while True:
+        try:
+            refresh(index, lock=_lock)
+            _index = index
+        except Exception:
+            logger.exception("bm25 refresh failed")
+        finally:
+            connection.close()
+        time.sleep(BM25_REFRESH_INTERVAL)
+
+
+def get_index():
+    global _index, _refresher
+    if _refresher is None:
+        with _lock:
+            if _refresher is None:
+                if os.path.exists(BM25_INDEX_PATH):
+                    index = _index = BM25Index.load(BM25_INDEX_PATH)
+                else:
+                    index = BM25Index()
+                _refresher = threading.Thread(target=_refresh_loop, args=(index,), name="bm25-refresh", daemon=True)
+                _refresher.start()
+    if _index is None:
+        raise IndexNotReady("BM25 index is being built (run build_bm25_index.py to start from a snapshot)")
+    return _index
+
+
+def refresh(index, lock=None):
+    from papers.caching import data_changed_at, data_version
+
+    version, changed_at = data_version(), data_changed_at()
+    if version == index.version:
+        return 0
+    return index.add_from_db(version, changed_at, lock=lock)
+
+
+def search(query, k=10, after=None):
+    index = get_index()
+    with _lock:
+        return index.search(query, k, after)
@@ -0,0 +1,362 @@
+# papers/services/coauthor.py
+# 공동 저자 그래프 (authors/<id>/collaborators/, authors/<id>/network/)
+#  - authorpaper 로 만든 author × author 인접 행렬, 간선 가중치 = 같이 쓴 논문 수
+#  - worker 메모리에 CSR 배열로: authors(행 번호 → author_id), indptr, indices(행 번호), weights, ranks
+#    행 안 indices 는 오름차순 (두 저자 사이 간선은 이진 탐색), ranks 는 (weight DESC, author_id DESC) 순서
+#    → 공동 저자 목록은 행 앞부분만 읽고, 2-hop 은 1 hop 저자들의 상위 COAUTHOR_FANOUT 명만 합침
+#  - 저자가 COAUTHOR_MAX_AUTHORS 명보다 많은 논문은 뺌 (대형 공동연구는 저자 수² 간선, 신호도 약함)
+#  - 증분 갱신: ap_id > last_ap_id 인 authorpaper 행(insert_author_paper / insert_authorpaper)이 붙은 논문만
+#    다시 읽어서 (지금 저자 쌍) - (이전 저자 쌍) 을 더함, 바뀐 저자의 행만 다시 정렬하고 나머지 행은 그대로 복사
+#    새 저자는 끝에 행 추가 (기존 행 번호 유지), authorpaper 행 수가 안 맞으면 (삭제 등) 전체 재빌드
+#  - snapshot(data/coauthor.npz) 으로 worker 시작 시 바로 로드, data version 이 바뀌면 background 증분 갱신
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+COAUTHOR_SNAPSHOT_PATH = getattr(
+    settings, "COAUTHOR_SNAPSHOT_PATH", os.path.join(settings.BASE_DIR, "data", "coauthor.npz")
+)
+COAUTHOR_REFRESH_INTERVAL = getattr(settings, "COAUTHOR_REFRESH_INTERVAL", 30)
+COAUTHOR_MAX_AUTHORS = getattr(settings, "COAUTHOR_MAX_AUTHORS", 100)
+COAUTHOR_CHUNK_ROWS = getattr(settings, "COAUTHOR_CHUNK_ROWS", 200000)
+# 2-hop 후보: 1 hop 저자마다 같이 쓴 논문 수 상위 이만큼 (공동 저자가 수만 명인 저자도 몇 ms)
+COAUTHOR_FANOUT = getattr(settings, "COAUTHOR_FANOUT", 200)
+
+STATS_SQL = "SELECT COUNT(*), COALESCE(MAX(ap_id), 0) FROM authorpaper"
+
+# 새 행이 붙은 논문의 저자 전부 (이전부터 있던 행은 ap_id <= last_ap_id)
+CHANGED_SQL = """
+SELECT paper_id, author_id, ap_id FROM authorpaper
+WHERE paper_id IN (SELECT paper_id FROM authorpaper WHERE ap_id > %s AND ap_id <= %s)
+"""
+
+
+def _stream(sql, params, n_columns, chunk_rows=COAUTHOR_CHUNK_ROWS):
+    # SELECT 결과 → 열마다 int64 배열 (server-side cursor 로 chunk 씩)
+    columns = [[] for _ in range(n_columns)]
+    with transaction.atomic():
+        cur = connection.chunked_cursor()
+        try:
+            cur.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                for i, values in enumerate(zip(*rows)):
+                    columns[i].append(np.asarray(values, dtype=np.int64))
+        finally:
+            cur.close()
+    return [np.concatenate(parts) if parts else np.empty(0, np.int64) for parts in columns]
+
+
+def pair_counts(paper_ids, rows, n, max_authors=COAUTHOR_MAX_AUTHORS):
+    # (paper_id, 저자 행 번호) → 저자 쌍마다 같이 쓴 논문 수 (n × n CSR, 대각선 제외, 행 안 열 오름차순)
+    _, p_idx, p_count = np.unique(paper_ids, return_inverse=True, return_counts=True)
+    keep = p_count[p_idx] <= max_authors
+    X = sparse.csr_matrix(
+        (np.ones(int(keep.sum()), dtype=np.int32), (p_idx[keep], rows[keep])),
+        shape=(len(p_count), n),
+    )
+    C = (X.T @ X).tocsr()
+    C.setdiag(0)
+    C.eliminate_zeros()
+    C.sort_indices()
+    return C
+
+
+def rank_rows(authors, indptr, indices, weights, chunk=COAUTHOR_CHUNK_ROWS * 10):
+    # 행마다 (weight DESC, author_id DESC) 순위 → 행 안 위치
+    #   정렬은 행 묶음마다 int64 key 하나로 (np.lexsort 보다 몇 배 빠르고, 메모리는 묶음 크기만큼)
+    n = len(authors)
+    id_rank = np.empty(n, dtype=np.int64)
+    id_rank[np.argsort(authors)] = np.arange(n)
+    wmax = int(weights.max(initial=0)) + 1
+    ranks = np.empty(len(indices), dtype=np.int32)
+    start = 0
+    while start < n:
+        end = max(start + 1, int(np.searchsorted(indptr, indptr[start] + chunk, side="right")) - 1)
+        end = min(end, n)
+        lo, hi = indptr[start], indptr[end]
+        row = np.repeat(np.arange(end - start, dtype=np.int64), np.diff(indptr[start:end + 1]))
+        w = weights[lo:hi].astype(np.int64)
+        if (end - start) * wmax * n < 2 ** 63:
+            by_rank = np.argsort((row * wmax + (wmax - 1 - w)) * n + (n - 1 - id_rank[indices[lo:hi]]))
+        else:
+            by_rank = np.lexsort((-id_rank[indices[lo:hi]], -w, row))
+        # row 가 첫 번째 정렬 key 라 순위 p 번째 위치도 같은 행 → 행 시작을 빼면 행 안 위치
+        ranks[lo:hi] = by_rank - (indptr[start:end][row] - lo)
+        start = end
+    return ranks
+
+
+class CoauthorGraph:
+    def __init__(self, authors, indptr, indices, weights, ranks, last_ap_id=0, rows=0):
+        self.authors = authors        # int64, 전체 빌드는 정렬, 증분으로 들어온 저자는 끝에
+        self.indptr = indptr          # int64, len(authors) + 1
+        self.indices = indices        # int32, 이웃 행 번호 (행 안에서 오름차순 → 간선 찾기는 이진 탐색)
+        self.weights = weights        # int32, 같이 쓴 논문 수
+        self.ranks = ranks            # int32, 행 안 순위 → 행 안 위치 ((weight DESC, author_id DESC) 순서)
+        self.last_ap_id = last_ap_id  # 반영한 authorpaper 최대 ap_id
+        self.rows = rows              # 반영한 authorpaper 행 수
+        self._order = np.argsort(authors, kind="stable")
+        self._sorted = authors[self._order]
+
+    def __len__(self):
+        return len(self.authors)
+
+    @property
+    def edges(self):
+        return len(self.indices) // 2
+
+    @classmethod
+    def from_csr(cls, authors, C, **kwargs):
+        indptr = C.indptr.astype(np.int64)
+        indices, weights = C.indices.astype(np.int32), C.data.astype(np.int32)
+        return cls(authors, indptr, indices, weights, rank_rows(authors, indptr, indices, weights), **kwargs)
+
+    def to_coo(self):
+        row = np.repeat(np.arange(len(self.authors)), np.diff(self.indptr))
+        return row, self.indices.astype(np.int64), self.weights
+
+    def _row(self, author_id):
+        i = int(np.searchsorted(self._sorted, author_id))
+        if i == len(self._sorted) or self._sorted[i] != author_id:
+            return None
+        return int(self._order[i])
+
+    def _ranked(self, r, k=None):
+        # r 행의 이웃 위치 (같이 쓴 논문 수 순), k 개까지
+        lo, hi = self.indptr[r], self.indptr[r + 1]
+        return lo + self.ranks[lo:hi if k is None else min(lo + k, hi)]
+
+    def _edge(self, r, cols):
+        # r 행과 cols(오름차순 행 번호) 사이 간선 → (있는 cols, 가중치)
+        lo, hi = self.indptr[r], self.indptr[r + 1]
+        pos = lo + np.searchsorted(self.indices[lo:hi], cols)
+        found = pos < hi
+        found[found] = self.indices[pos[found]] == cols[found]
+        return cols[found], self.weights[pos[found]]
+
+    # --------------------------------------------------------
+    # 📌 조회
+    # --------------------------------------------------------
+    def collaborators(self, author_id, k=20, after=None):
+        # [(author_id, 같이 쓴 논문 수)] (weight DESC, author_id DESC), after=(author_id, weight)
+        r = self._row(author_id)
+        if r is None:
+            return []
+        pos = self._ranked(r, None if after is not None else k)
+        ids, w = self.authors[self.indices[pos]], self.weights[pos]
+        if after is not None:
+            last_id, last_w = after
+            start = np.flatnonzero((w < last_w) | ((w == last_w) & (ids < last_id)))
+            ids, w = ids[start], w[start]
+        return [(int(a), int(c)) for a, c in zip(ids[:k], w[:k])]
+
+    def ego_network(self, author_id, hops=1, k=20, fanout=COAUTHOR_FANOUT):
+        # → (nodes: [(author_id, hop, score)], edges: [(a, b, weight)] a < b)
+        #   1 hop: 같이 쓴 논문 수 상위 k 명
+        #   2 hop: 그 k 명의 공동 저자 상위 fanout 명 중 (ego, 1 hop 제외) 1 hop 과 같이 쓴 논문 수 합 상위 k 명
+        #   edges 는 고른 저자들 사이의 간선 전부
+        ego = self._row(author_id)
+        if ego is None:
+            return [(int(author_id), 0, 0)], []
+
+        pos = self._ranked(ego, k)
+        hop1 = self.indices[pos]
+        nodes = [(ego, 0, 0)] + [(int(r), 1, int(w)) for r, w in zip(hop1, self.weights[pos])]
+
+        if hops >= 2 and len(hop1):
+            # 1 hop 저자마다 가장 많이 같이 쓴 COAUTHOR_FANOUT 명만 후보로 (다작 저자도 후보 수가 고정)
+            pos = np.concatenate([self._ranked(r, fanout) for r in hop1])
+            cand, inverse = np.unique(self.indices[pos], return_inverse=True)
+            score = np.bincount(inverse, weights=self.weights[pos]).astype(np.int64)
+            keep = ~np.isin(cand, np.append(hop1, ego))
+            cand, score = cand[keep], score[keep]
+            top = np.lexsort((-self.authors[cand], -score))[:k]
+            nodes += [(int(cand[i]), 2, int(score[i])) for i in top]
+
+        members = np.array(sorted(r for r, _, _ in nodes), dtype=np.int64)
+        edges = []
+        for i, r in enumerate(members):
+            a = int(self.authors[r])
+            edges += [(a, int(self.authors[b]), int(w)) for b, w in zip(*self._edge(r, members[i + 1:]))]
+
+        return [(int(self.authors[r]), hop, score) for r, hop, score in nodes], edges
+
+    # --------------------------------------------------------
+    # 📌 빌드 / 증분 갱신 / snapshot
+    # --------------------------------------------------------
+    @classmethod
+    def from_pairs(cls, paper_ids, author_ids, **kwargs):
+        authors = np.unique(author_ids)
+        C = pair_counts(paper_ids, np.searchsorted(authors, author_ids), len(authors))
+        return cls.from_csr(authors, C, **kwargs)
+
+    @classmethod
+    def from_db(cls):
+        with connection.cursor() as cur:
+            cur.execute(STATS_SQL)
+            count, last_ap_id = cur.fetchone()
+        paper_ids, author_ids = _stream(
+            "SELECT paper_id, author_id FROM authorpaper WHERE ap_id <= %s", [last_ap_id], 2
+        )
+        return cls.from_pairs(paper_ids, author_ids, last_ap_id=last_ap_id, rows=len(paper_ids))
+
+    def apply(self, paper_ids, author_ids, ap_ids, last_ap_id):
+        # 바뀐 논문의 (paper_id, author_id, ap_id) 전부 → 새 graph (self 는 그대로, 읽는 쪽은 lock 불필요)
+        n_old = len(self.authors)
+        authors = np.concatenate([self.authors, np.setdiff1d(author_ids, self.authors)])
+        n = len(authors)
+        order = np.argsort(authors, kind="stable")
+        rows = order[np.searchsorted(authors[order], author_ids)]
+        before = ap_ids <= self.last_ap_id
+
+        # 지금 저자 쌍 - 이전 저자 쌍 (저자 수가 상한을 넘나든 논문도 여기서 맞춰짐)
+        new = pair_counts(paper_ids, rows, n)
+        old = pair_counts(paper_ids[before], rows[before], n)
+        touched = np.flatnonzero(np.diff(new.indptr) + np.diff(old.indptr))
+
+        # 바뀐 행: 기존 간선 + 변화량 → 0 이 된 간선은 삭제
+        lens = np.diff(self.indptr)
+        t_old = touched[touched < n_old]
+        t_len = lens[t_old]
+        idx = np.repeat(self.indptr[t_old] - np.cumsum(np.r_[0, t_len[:-1]]), t_len) + np.arange(t_len.sum())
+        current = sparse.csr_matrix(
+            (self.weights[idx], (np.repeat(t_old, t_len), self.indices[idx])), shape=(n, n), dtype=np.int32
+        )
+        D = current + new - old
+        D.eliminate_zeros()
+        D.sort_indices()
+        part = CoauthorGraph.from_csr(authors, D)
+
+        # 나머지 행은 그대로, 바뀐 행 자리에 새 행을 끼워 넣음
+        new_lens = np.zeros(n, dtype=np.int64)
+        new_lens[:n_old] = lens
+        new_lens[touched] = np.diff(part.indptr)[touched]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(new_lens, out=indptr[1:])
+
+        # 행 안 위치 기준이라 ranks 도 행 단위로 그대로 옮김
+        arrays = ("indices", "weights", "ranks")
+        pieces, prev = {name: [] for name in arrays}, 0
+        for r in touched.tolist() + [n]:
+            if r > prev and prev < n_old:
+                lo, hi = self.indptr[prev], self.indptr[min(r, n_old)]
+                for name in arrays:
+                    pieces[name].append(getattr(self, name)[lo:hi])
+            if r < n:
+                lo, hi = part.indptr[r], part.indptr[r + 1]
+                for name in arrays:
+                    pieces[name].append(getattr(part, name)[lo:hi])
+            prev = r + 1
+
+        return CoauthorGraph(
+            authors, indptr, *(np.concatenate(pieces[name]).astype(np.int32) for name in arrays),
+            last_ap_id=last_ap_id, rows=self.rows + int((~before).sum()),
+        )
+
+    def updated(self):
+        # authorpaper 에 새 행이 있으면 반영한 새 graph, 없으면 self
+        with connection.cursor() as cur:
+            cur.execute(STATS_SQL)
+            count, last_ap_id = cur.fetchone()
+        if last_ap_id == self.last_ap_id and count == self.rows:
+            return self
+        if last_ap_id < self.last_ap_id or count < self.rows:
+            return CoauthorGraph.from_db()
+
+        paper_ids, author_ids, ap_ids = _stream(CHANGED_SQL, [self.last_ap_id, last_ap_id], 3)
+        # 읽는 사이에 들어온 행 (ap_id > last_ap_id) 은 다음 갱신에서
+        keep = ap_ids <= last_ap_id
+        graph = self.apply(paper_ids[keep], author_ids[keep], ap_ids[keep], last_ap_id)
+        if graph.rows != count:
+            # 지운 행이 있거나, 더 작은 ap_id 가 늦게 commit 됨 → 증분으로는 못 맞춤
+            return CoauthorGraph.from_db()
+        return graph
+
+    def save(self, path=COAUTHOR_SNAPSHOT_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp, authors=self.authors, indptr=self.indptr, indices=self.indices, weights=self.weights,
+            ranks=self.ranks, last_ap_id=np.int64(self.last_ap_id), rows=np.int64(self.rows),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=COAUTHOR_SNAPSHOT_PATH):
+        with np.load(path) as f:
+            return cls(
+                f["authors"], f["indptr"], f["indices"], f["weights"], f["ranks"],
+                last_ap_id=int(f["last_ap_id"]), rows=int(f["rows"]),
+            )
+
+
+# --------------------------------------------------------
+# 📌 worker 전역 graph
+#   첫 요청에서 snapshot 로드 후 바로 증분 갱신 (없으면 DB 에서 빌드)
+#   이후 background thread 가 COAUTHOR_REFRESH_INTERVAL 마다 data version 을 보고
+#   바뀌었으면 새 authorpaper 행만 반영해서 교체 (조회는 교체 전 객체를 그대로 씀 → lock 불필요)
+# --------------------------------------------------------
+_graph = None
+_version = None
+_lock = threading.Lock()
+
+
+def _catch_up(graph):
+    new = graph.updated()
+    if new is not graph:
+        new.save()
+    return new
+
+
+def _refresh_loop():
+    from papers.caching import data_version
+
+    global _graph, _version
+    while True:
+        time.sleep(COAUTHOR_REFRESH_INTERVAL)
+        try:
+            version = data_version()
+            if version != _version:
+                _graph = _catch_up(_graph)
+                _version = version
+        except Exception:
+            logger.exception("coauthor refresh failed")
+        finally:
+            connection.close()
+
+
+def get_graph():
+    global _graph, _version
+    if _graph is None:
+        from papers.caching import data_version
+
+        with _lock:
+            if _graph is None:
+                _version = data_version()
+                if os.path.exists(COAUTHOR_SNAPSHOT_PATH):
+                    graph = _catch_up(CoauthorGraph.load())
+                else:
+                    graph = CoauthorGraph.from_db()
+                    graph.save()
+                _graph = graph
+                threading.Thread(target=_refresh_loop, name="coauthor-refresh", daemon=True).start()
+    return _graph
+
+
+def collaborators(author_id, k=20, after=None):
+    return get_graph().collaborators(author_id, k, after)
+
+
+def ego_network(author_id, hops=1, k=20):
+    return get_graph().ego_network(author_id, hops, k)
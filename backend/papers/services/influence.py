@@ -0,0 +1,130 @@
+# papers/services/influence.py
+# 인용 그래프 PageRank → paper.influence (search / advanced-search 의 order=influence)
+#  - 간선: paperreference (인용한 논문 → 인용된 논문), 인용 대상이 DB 에 있는 것만 (paper.alex_paper_id join)
+#  - DB 결과는 server-side cursor 로 INFLUENCE_CHUNK_ROWS 행씩 읽어 int32 배열로 (Python tuple 을 쌓지 않음)
+#    → 메모리: float32 CSR 한 벌 (간선당 약 8 bytes, 만드는 동안 잠깐 2 배) + 논문 수 크기 벡터 몇 개
+#  - power iteration: x ← d·M x + (d·(인용 없는 논문의 x 합) + 1 - d) / N,  M[j, i] = 1 / i 의 인용 수
+#    이전 influence 를 시작값으로 씀 (warm start) → 간선이 조금 늘었을 때는 몇 번 만에 수렴
+#  - 결과는 N × PageRank (평균 1.0), 값이 바뀐 논문만 INFLUENCE_WRITE_CHUNK 개씩 UPDATE
+#  - cron 이 매일 POST /api/influence/refresh/ 호출
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from scipy import sparse
+
+INFLUENCE_DAMPING = getattr(settings, "INFLUENCE_DAMPING", 0.85)
+INFLUENCE_TOL = getattr(settings, "INFLUENCE_TOL", 1e-6)
+INFLUENCE_MAX_ITER = getattr(settings, "INFLUENCE_MAX_ITER", 100)
+INFLUENCE_CHUNK_ROWS = getattr(settings, "INFLUENCE_CHUNK_ROWS", 200000)
+INFLUENCE_WRITE_CHUNK = getattr(settings, "INFLUENCE_WRITE_CHUNK", 50000)
+# 이 상대 오차 안의 변화는 다시 쓰지 않음 (매일 실행마다 전체 UPDATE 하지 않도록)
+INFLUENCE_RTOL = getattr(settings, "INFLUENCE_RTOL", 1e-4)
+
+PAPERS_SQL = "SELECT paper_id, influence FROM paper ORDER BY paper_id"
+
+EDGES_SQL = """
+SELECT r.paper_id, p.paper_id
+FROM paperreference r
+JOIN paper p ON p.alex_paper_id = r.referenced_alex_id
+WHERE p.paper_id <> r.paper_id
+"""
+
+UPDATE_SQL = """
+UPDATE paper AS p SET influence = v.influence
+FROM unnest(%s::int[], %s::float8[]) AS v(paper_id, influence)
+WHERE p.paper_id = v.paper_id
+"""
+
+
+def _stream(sql, dtypes, chunk_rows=INFLUENCE_CHUNK_ROWS):
+    # SELECT 결과 열마다 NumPy 배열 (NULL → nan, float 열만)
+    columns = [[] for _ in dtypes]
+    with transaction.atomic():
+        cur = connection.chunked_cursor()
+        try:
+            cur.execute(sql)
+            while True:
+                rows = cur.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                for i, (values, dtype) in enumerate(zip(zip(*rows), dtypes)):
+                    if np.issubdtype(dtype, np.floating):
+                        values = [np.nan if v is None else v for v in values]
+                    columns[i].append(np.asarray(values, dtype=dtype))
+        finally:
+            cur.close()
+    return [np.concatenate(parts) if parts else np.empty(0, dtype) for parts, dtype in zip(columns, dtypes)]
+
+
+def transition_matrix(n, src, dst):
+    # src(인용한 쪽) → dst(인용된 쪽) 간선 → (M, dangling)
+    #   M[dst, src] = 1 / out_degree(src), dangling: 인용이 없는(또는 DB 안에 대상이 없는) 논문
+    out_degree = np.bincount(src, minlength=n).astype(np.float32)
+    M = sparse.csr_matrix((1 / out_degree[src], (dst, src)), shape=(n, n), dtype=np.float32)
+    return M, out_degree == 0
+
+
+def pagerank(M, dangling, x0=None, damping=INFLUENCE_DAMPING, tol=INFLUENCE_TOL, max_iter=INFLUENCE_MAX_ITER):
+    # → (x: 합 1, 반복 횟수, 마지막 L1 변화량)
+    n = M.shape[0]
+    if n == 0:
+        return np.empty(0), 0, 0.0
+    x = np.full(n, 1 / n) if x0 is None else np.asarray(x0, dtype=np.float64)
+    x = x / x.sum()
+    delta = 0.0
+    for iteration in range(1, max_iter + 1):
+        y = damping * (M @ x)
+        y += (damping * x[dangling].sum() + 1 - damping) / n
+        delta = float(np.abs(y - x).sum())
+        x = y
+        if delta < tol:
+            break
+    return x, iteration, delta
+
+
+def warm_start(previous):
+    # 이전 influence (평균 1.0 scale, 새 논문은 nan) → 시작 벡터, 없으면 None (균등)
+    known = ~np.isnan(previous)
+    if not known.any():
+        return None
+    x0 = np.where(known, previous, 1.0)
+    return np.maximum(x0, 1e-12)
+
+
+def write(paper_ids, influence, previous, chunk=INFLUENCE_WRITE_CHUNK):
+    # 바뀐 값만 UPDATE, 반환: 갱신한 논문 수
+    changed = np.flatnonzero(~np.isclose(influence, previous, rtol=INFLUENCE_RTOL, atol=0))
+    for start in range(0, len(changed), chunk):
+        part = changed[start:start + chunk]
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute(UPDATE_SQL, [paper_ids[part].tolist(), influence[part].tolist()])
+    return len(changed)
+
+
+def run(warm=True):
+    from papers.caching import bump_data_version
+
+    paper_ids, previous = _stream(PAPERS_SQL, (np.int64, np.float64))
+    src_ids, dst_ids = _stream(EDGES_SQL, (np.int64, np.int64))
+
+    # paper_id → 행 번호 (읽는 사이에 들어온 논문의 간선은 다음 실행에서)
+    n = len(paper_ids)
+    src = np.searchsorted(paper_ids, src_ids)
+    dst = np.searchsorted(paper_ids, dst_ids)
+    known = (src < n) & (dst < n)
+    known[known] = (paper_ids[src[known]] == src_ids[known]) & (paper_ids[dst[known]] == dst_ids[known])
+    src, dst = src[known].astype(np.int32), dst[known].astype(np.int32)
+    del src_ids, dst_ids
+
+    M, dangling = transition_matrix(n, src, dst)
+    del src, dst
+    x, iterations, delta = pagerank(M, dangling, warm_start(previous) if warm else None)
+
+    influence = x * n
+    updated = write(paper_ids, influence, previous)
+    if updated:
+        # order=influence 목록 캐시 무효화
+        bump_data_version()
+    return {
+        "papers": n, "edges": int(M.nnz), "iterations": iterations, "delta": delta, "updated": updated,
+    }
@@ -0,0 +1,172 @@
+# papers/services/itemcf.py
+# "이 논문을 저장한 사람들이 같이 저장한 논문" (item-item collaborative filtering)
+#  - guestfavorite 를 guest × paper 0/1 희소 행렬 X 로 읽고 C = Xᵀ X (공동 저장 수)
+#    → cosine = C[i, j] / sqrt(저장 수_i × 저장 수_j), 논문마다 상위 CF_TOP_K 개를 paper_neighbor 에 기록
+#  - guestfavorite INSERT / DELETE 트리거가 바뀐 논문을 paper_neighbor_dirty 에 남김 (table_schema.sql)
+#    refresh() 는 dirty 논문과 그 논문을 같이 저장한 논문들의 행만 다시 계산, 처음이거나 너무 많으면 전체
+#  - cron 이 popularity roll 과 같이 호출 (POST /api/popular/roll/)
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from scipy import sparse
+
+CF_TOP_K = getattr(settings, "CF_TOP_K", 20)
+# 공동 저장이 이보다 적은 쌍은 버림 (1 이면 한 명만 같이 저장해도 이웃)
+CF_MIN_COMMON = getattr(settings, "CF_MIN_COMMON", 1)
+# 즐겨찾기가 이보다 많은 guest 는 계산에서 뺌 (공동 저장 쌍이 저장 수² 로 늘어나고, 신호도 약함)
+#   guestfavorite 트리거에도 같은 값(500)이 있음 → 바꾸면 table_schema.sql 도 같이
+CF_MAX_GUEST_FAVORITES = getattr(settings, "CF_MAX_GUEST_FAVORITES", 500)
+# 다시 계산할 행이 이보다 많으면 전체 재계산
+CF_INCREMENTAL_MAX = getattr(settings, "CF_INCREMENTAL_MAX", 50000)
+# 전체 계산 때 한 번에 곱하는 행 수 (C 를 한꺼번에 만들지 않도록)
+CF_CHUNK_ROWS = getattr(settings, "CF_CHUNK_ROWS", 20000)
+
+INSERT_SQL = """
+INSERT INTO paper_neighbor (paper_id, rank, neighbor_id, score)
+SELECT * FROM unnest(%s::int[], %s::smallint[], %s::int[], %s::real[])
+"""
+
+# 주어진 논문을 저장한 guest 중 즐겨찾기가 CF_MAX_GUEST_FAVORITES 이하인 guest
+LIGHT_SAVERS_CTE = """
+WITH savers AS (
+  SELECT DISTINCT guest_id FROM guestfavorite WHERE paper_id = ANY(%(papers)s)
+), light AS (
+  SELECT f.guest_id FROM guestfavorite f JOIN savers s ON s.guest_id = f.guest_id
+  GROUP BY f.guest_id HAVING COUNT(*) <= %(cap)s
+)
+"""
+
+# 다시 계산할 행: dirty 논문 + 그 논문을 저장한 guest 들이 저장한 논문
+AFFECTED_SQL = LIGHT_SAVERS_CTE + """
+SELECT DISTINCT f.paper_id FROM guestfavorite f JOIN light l ON l.guest_id = f.guest_id
+"""
+
+# 그 행들의 공동 저장 수를 구하려면: 그 논문들을 저장한 guest 의 즐겨찾기 전부
+PAIRS_SQL = LIGHT_SAVERS_CTE + """
+SELECT f.guest_id, f.paper_id FROM guestfavorite f JOIN light l ON l.guest_id = f.guest_id
+"""
+
+# cosine 분모 (전체 계산의 X 열 합과 같은 기준)
+DEGREE_SQL = LIGHT_SAVERS_CTE + """
+SELECT f.paper_id, COUNT(*) FROM guestfavorite f JOIN light l ON l.guest_id = f.guest_id
+WHERE f.paper_id = ANY(%(papers)s)
+GROUP BY f.paper_id
+"""
+
+# after=(paper_id, score) 이면 그 다음 순위부터
+ALSO_SAVED_SQL = """
+SELECT neighbor_id, score FROM paper_neighbor
+WHERE paper_id = %s {after}
+ORDER BY rank
+LIMIT %s
+"""
+
+
+def favorites_matrix(pairs, max_per_guest=CF_MAX_GUEST_FAVORITES):
+    # [(guest_id, paper_id)] → (X: guest × paper CSR, items: 열 번호 → paper_id)
+    #   pairs 에는 guest 의 즐겨찾기가 전부 있어야 함 (max_per_guest 초과 guest 를 여기서 뺌)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    _, g_idx, g_count = np.unique(pairs[:, 0], return_inverse=True, return_counts=True)
+    pairs = pairs[g_count[g_idx] <= max_per_guest]
+    _, g_idx = np.unique(pairs[:, 0], return_inverse=True)
+    items, i_idx = np.unique(pairs[:, 1], return_inverse=True)
+    X = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (g_idx, i_idx)),
+        shape=(int(g_idx.max(initial=-1)) + 1, len(items)),
+    )
+    return X, items
+
+
+def top_neighbours(X, items, rows, degree, k=CF_TOP_K, min_common=CF_MIN_COMMON):
+    # rows(X 의 열 번호) 마다 cosine 상위 k 개 → (paper_id, rank, neighbor_id, score) 배열
+    #   degree: 열 번호 → 전체 저장 수 (X 가 일부 guest 만 담고 있어도 cosine 분모는 전체 기준)
+    #   정렬: paper_id, score DESC, neighbor_id DESC
+    rows = np.asarray(rows, dtype=np.int64)
+    common = (X[:, rows].T @ X).tocoo()
+    r, c, n = common.row, common.col, common.data
+    keep = (c != rows[r]) & (n >= min_common)
+    r, c, n = r[keep], c[keep], n[keep]
+
+    score = (n / np.sqrt(degree[rows[r]] * degree[c])).astype(np.float32)
+    src, dst = items[rows[r]], items[c]
+    order = np.lexsort((-dst, -score, src))
+    src, dst, score = src[order], dst[order], score[order]
+
+    # 각 paper 안에서의 순위 (0 부터)
+    starts = np.flatnonzero(np.r_[True, src[1:] != src[:-1]])
+    rank = np.arange(len(src)) - np.repeat(starts, np.diff(np.r_[starts, len(src)]))
+    keep = rank < k
+    return src[keep], rank[keep] + 1, dst[keep], score[keep]
+
+
+def _write(cur, src, rank, dst, score):
+    if len(src):
+        cur.execute(INSERT_SQL, [src.tolist(), rank.tolist(), dst.tolist(), score.tolist()])
+    return len(src)
+
+
+def rebuild(k=CF_TOP_K):
+    # 전체 재계산, 반환: 기록한 이웃 수
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute("LOCK TABLE paper_neighbor IN EXCLUSIVE MODE")
+        cur.execute("DELETE FROM paper_neighbor_dirty")
+        cur.execute("DELETE FROM paper_neighbor")
+        cur.execute("SELECT guest_id, paper_id FROM guestfavorite")
+        X, items = favorites_matrix(cur.fetchall())
+        degree = np.asarray(X.sum(axis=0)).ravel()
+        X = X.tocsc()
+        written = 0
+        for start in range(0, len(items), CF_CHUNK_ROWS):
+            rows = np.arange(start, min(start + CF_CHUNK_ROWS, len(items)))
+            written += _write(cur, *top_neighbours(X, items, rows, degree, k))
+        return written
+
+
+def refresh(k=CF_TOP_K):
+    # dirty 논문 기준 증분 갱신, 반환: 다시 계산한 논문 수
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute("LOCK TABLE paper_neighbor IN EXCLUSIVE MODE")
+        cur.execute("SELECT EXISTS (SELECT 1 FROM paper_neighbor)")
+        if not cur.fetchone()[0]:
+            cur.execute("SELECT EXISTS (SELECT 1 FROM paper_neighbor_dirty)")
+            if not cur.fetchone()[0]:
+                return 0
+            rebuild(k)
+            cur.execute("SELECT COUNT(DISTINCT paper_id) FROM paper_neighbor")
+            return cur.fetchone()[0]
+
+        cur.execute("DELETE FROM paper_neighbor_dirty RETURNING paper_id")
+        dirty = [pid for pid, in cur.fetchall()]
+        if not dirty:
+            return 0
+        cur.execute(AFFECTED_SQL, {"papers": dirty, "cap": CF_MAX_GUEST_FAVORITES})
+        # 즐겨찾기가 모두 취소된 논문은 행만 지움
+        affected = sorted(set(dirty) | {pid for pid, in cur.fetchall()})
+        if len(affected) > CF_INCREMENTAL_MAX:
+            rebuild(k)
+            return len(affected)
+
+        cur.execute("DELETE FROM paper_neighbor WHERE paper_id = ANY(%s)", [affected])
+        cur.execute(PAIRS_SQL, {"papers": affected, "cap": CF_MAX_GUEST_FAVORITES})
+        X, items = favorites_matrix(cur.fetchall())
+        if not len(items):
+            return len(affected)
+        cur.execute(DEGREE_SQL, {"papers": items.tolist(), "cap": CF_MAX_GUEST_FAVORITES})
+        counts = dict(cur.fetchall())
+        degree = np.array([counts.get(pid, 0) for pid in items.tolist()], dtype=np.float32)
+        rows = np.flatnonzero(np.isin(items, affected))
+        _write(cur, *top_neighbours(X.tocsc(), items, rows, degree, k))
+        return len(affected)
+
+
+def also_saved(paper_id, k=10, after=None):
+    # [(paper_id, score)] (score DESC, paper_id DESC)
+    params = [paper_id]
+    after_sql = ""
+    if after is not None:
+        after_sql = "AND (score, neighbor_id) < (%s::real, %s)"
+        params += [float(after[1]), after[0]]
+    params.append(k)
+    with connection.cursor() as cur:
+        cur.execute(ALSO_SAVED_SQL.format(after=after_sql), params)
+        return [(pid, float(score)) for pid, score in cur.fetchall()]
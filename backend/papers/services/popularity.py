@@ -0,0 +1,54 @@
+# papers/services/popularity.py
+# 최근 7일(시간 단위 창) 인기도
+#  - 조회수: services/viewcounter.py 가 flush 때 현재 시각 bucket(paper_view_hourly) + paper.weekly_count 에 더함
+#  - roll(): 창 밖으로 나간 bucket 만 weekly_count 에서 빼고 삭제 → 그 논문들만 UPDATE (전체 행 reset 없음)
+#            이어서 weekly_count 상위 POPULAR_TOP_K 편을 popular_paper 에 다시 기록 (인덱스 앞부분만 읽음)
+#  - cron 이 매시간 POST /api/popular/roll/ 호출
+from django.conf import settings
+from django.db import connection, transaction
+
+POPULARITY_WINDOW_HOURS = getattr(settings, "POPULARITY_WINDOW_HOURS", 7 * 24)
+POPULAR_TOP_K = getattr(settings, "POPULAR_TOP_K", 200)
+
+# 현재 시각 bucket 포함 POPULARITY_WINDOW_HOURS 개를 남김
+EXPIRE_SQL = """
+WITH expired AS (
+  DELETE FROM paper_view_hourly
+  WHERE hour <= date_trunc('hour', now()) - make_interval(hours => %s)
+  RETURNING paper_id, hits
+), totals AS (
+  SELECT paper_id, SUM(hits) AS hits FROM expired GROUP BY paper_id
+)
+UPDATE paper AS p
+SET weekly_count = GREATEST(p.weekly_count - t.hits, 0), updated_at = now()
+FROM totals t
+WHERE p.paper_id = t.paper_id
+"""
+
+# 동시에 두 번 돌아도 rank 가 겹치지 않게 표 lock 후 교체
+REFRESH_TOP_K_SQL = """
+LOCK TABLE popular_paper IN EXCLUSIVE MODE;
+DELETE FROM popular_paper;
+INSERT INTO popular_paper (rank, paper_id)
+SELECT row_number() OVER (ORDER BY weekly_count DESC, paper_id DESC), paper_id
+FROM (SELECT paper_id, weekly_count FROM paper ORDER BY weekly_count DESC, paper_id DESC LIMIT %s) top;
+"""
+
+
+def expire(window_hours=POPULARITY_WINDOW_HOURS):
+    with connection.cursor() as cur:
+        cur.execute(EXPIRE_SQL, [window_hours])
+        return cur.rowcount
+
+
+def refresh_top_k(k=POPULAR_TOP_K):
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(REFRESH_TOP_K_SQL, [k])
+
+
+def roll():
+    # 반환: weekly_count 가 줄어든 논문 수
+    with transaction.atomic():
+        changed = expire()
+        refresh_top_k()
+    return changed
@@ -0,0 +1,154 @@
+# papers/services/recommend.py
+# Guest 추천 (recommend_by_guest)
+#  - refresh_candidates(): 카테고리마다 점수 상위 RECOMMEND_CANDIDATES 편을 recommend_candidate 에 미리 기록
+#      점수 = 최신성(announcement_date 반감기) + 인용수 + 최근 인용 속도(yearcitation) + weekly_count 의 가중합
+#      (각 항목은 log 스케일 후 전체 최댓값으로 0~1 정규화), cron 이 매시간 popularity roll 과 같이 호출
+#  - recommend(): guest 의 카테고리 가중치(interest_1..3 + guestcategorycount) 상위 몇 개 카테고리의
+#      후보 목록만 읽어서 (가중치 × 점수) 순 상위 k 편, 이미 즐겨찾기한 논문은 제외
+#      최근 즐겨찾기 RECOMMEND_CF_SEEDS 편의 "같이 저장한 논문"(services/itemcf.py) 은
+#      평균 cosine × RECOMMEND_CF_WEIGHT 를 더 받음 (카테고리 밖 논문도 이걸로 들어올 수 있음)
+from heapq import nsmallest
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+RECOMMEND_CANDIDATES = getattr(settings, "RECOMMEND_CANDIDATES", 500)
+RECOMMEND_MAX_CATEGORIES = getattr(settings, "RECOMMEND_MAX_CATEGORIES", 10)
+# interest_1..3 로 고른 카테고리는 즐겨찾기 count 에 이만큼 더해서 시작
+RECOMMEND_INTEREST_WEIGHT = getattr(settings, "RECOMMEND_INTEREST_WEIGHT", 3)
+RECOMMEND_CF_SEEDS = getattr(settings, "RECOMMEND_CF_SEEDS", 20)
+RECOMMEND_CF_WEIGHT = getattr(settings, "RECOMMEND_CF_WEIGHT", 0.5)
+RECOMMEND_HALF_LIFE_DAYS = getattr(settings, "RECOMMEND_HALF_LIFE_DAYS", 365)
+RECOMMEND_WEIGHTS = getattr(settings, "RECOMMEND_WEIGHTS", {
+    "recency": 0.3,
+    "citation": 0.25,
+    "velocity": 0.25,
+    "popularity": 0.2,
+})
+
+# 동시에 두 번 돌아도 rank 가 겹치지 않게 표 lock 후 교체 (popularity.REFRESH_TOP_K_SQL 과 같은 방식)
+REFRESH_CANDIDATES_SQL = """
+LOCK TABLE recommend_candidate IN EXCLUSIVE MODE;
+DELETE FROM recommend_candidate;
+WITH signals AS (
+  SELECT p.paper_id, p.category_id,
+         COALESCE(power(0.5::float8, GREATEST(current_date - p.announcement_date, 0) / %(half_life)s::float8), 0)
+           AS recency,
+         ln(1 + GREATEST(COALESCE(p.citation, 0), 0)) AS citation,
+         ln(1 + GREATEST(COALESCE(y.recent_year1_count, 0) + 0.5 * COALESCE(y.recent_year2_count, 0), 0))
+           AS velocity,
+         ln(1 + GREATEST(p.weekly_count, 0)) AS popularity
+  FROM paper p
+  LEFT JOIN yearcitation y ON y.paper_id = p.paper_id
+  WHERE p.category_id IS NOT NULL
+), scored AS (
+  SELECT paper_id, category_id,
+         %(recency)s * recency
+         + %(citation)s * COALESCE(citation / NULLIF(MAX(citation) OVER (), 0), 0)
+         + %(velocity)s * COALESCE(velocity / NULLIF(MAX(velocity) OVER (), 0), 0)
+         + %(popularity)s * COALESCE(popularity / NULLIF(MAX(popularity) OVER (), 0), 0) AS score
+  FROM signals
+), ranked AS (
+  SELECT paper_id, category_id, score,
+         row_number() OVER (PARTITION BY category_id ORDER BY score DESC, paper_id DESC) AS rank
+  FROM scored
+)
+INSERT INTO recommend_candidate (paper_id, category_id, rank, score)
+SELECT paper_id, category_id, rank, score FROM ranked WHERE rank <= %(k)s;
+"""
+
+# 카테고리마다 (category_id, rank) 인덱스 앞부분만 k 행씩 → 많아야 RECOMMEND_MAX_CATEGORIES × k 행
+#   after=(paper_id, score) 이면 (가중치 × 점수, paper_id) 가 그보다 작은 것만 (cursor 페이지네이션)
+#   (CF 점수는 더하기만 하므로 이 조건으로 빠지는 논문은 최종 점수로도 after 앞에 있음)
+CANDIDATES_SQL = """
+SELECT c.category_id, r.paper_id, r.score
+FROM (VALUES {values}) AS c(category_id, weight)
+CROSS JOIN LATERAL (
+  SELECT rc.paper_id, rc.score
+  FROM recommend_candidate rc
+  WHERE rc.category_id = c.category_id
+    AND NOT EXISTS (SELECT 1 FROM guestfavorite f WHERE f.guest_id = %s AND f.paper_id = rc.paper_id)
+    {after}
+  ORDER BY rc.rank
+  LIMIT %s
+) r
+"""
+
+# 최근 즐겨찾기(seed) 의 이웃 → 이웃마다 평균 cosine, 후보 표에 있으면 그 카테고리 / 점수도 같이
+CF_SQL = """
+WITH seeds AS (
+  SELECT paper_id FROM guestfavorite WHERE guest_id = %s ORDER BY favorite_id DESC LIMIT %s
+)
+SELECT n.neighbor_id, SUM(n.score) / (SELECT COUNT(*) FROM seeds), rc.category_id, rc.score
+FROM seeds s
+JOIN paper_neighbor n ON n.paper_id = s.paper_id
+LEFT JOIN recommend_candidate rc ON rc.paper_id = n.neighbor_id
+WHERE NOT EXISTS (SELECT 1 FROM guestfavorite f WHERE f.guest_id = %s AND f.paper_id = n.neighbor_id)
+GROUP BY n.neighbor_id, rc.category_id, rc.score
+"""
+
+
+def refresh_candidates(k=RECOMMEND_CANDIDATES, weights=None):
+    # 반환: 기록한 후보 수
+    params = {**RECOMMEND_WEIGHTS, **(weights or {}), "half_life": RECOMMEND_HALF_LIFE_DAYS, "k": k}
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(REFRESH_CANDIDATES_SQL, params)
+        return cur.rowcount
+
+
+def guest_weights(guest):
+    # {category_id: 0~1 가중치}, 가중치 큰 RECOMMEND_MAX_CATEGORIES 개만
+    from papers.models import Category, GuestCategoryCount
+
+    weights = dict(
+        GuestCategoryCount.objects.filter(guest_id=guest.pk, count__gt=0).values_list("category_id", "count")
+    )
+
+    # interest_1..3: category_id 문자열 또는 category 이름 / OpenAlex id
+    interests = [v.strip() for v in (guest.interest_1, guest.interest_2, guest.interest_3) if v and v.strip()]
+    ids = {int(v) for v in interests if v.isdigit()}
+    names = [v for v in interests if not v.isdigit()]
+    if names:
+        ids.update(Category.objects.filter(
+            Q(alex_category_id__in=names) | Q(category_name__in=names)
+        ).values_list("category_id", flat=True))
+    for cid in ids:
+        weights[cid] = weights.get(cid, 0) + RECOMMEND_INTEREST_WEIGHT
+
+    top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:RECOMMEND_MAX_CATEGORIES]
+    if not top:
+        return {}
+    best = top[0][1]
+    return {cid: w / best for cid, w in top}
+
+
+def recommend(guest_id, weights, k=20, after=None):
+    # [(paper_id, score)] (score DESC, paper_id DESC)
+    scores = {}
+    with connection.cursor() as cur:
+        if weights:
+            params = []
+            for cid, w in weights.items():
+                params += [cid, float(w)]
+            params.append(guest_id)
+            after_sql = ""
+            if after is not None:
+                after_sql = "AND (c.weight * rc.score, rc.paper_id) < (%s, %s)"
+                params += [float(after[1]), after[0]]
+            params.append(k)
+            values = ", ".join(["(%s::int, %s::float8)"] * len(weights))
+            cur.execute(CANDIDATES_SQL.format(values=values, after=after_sql), params)
+            for cid, pid, score in cur.fetchall():
+                scores[pid] = weights[cid] * score
+
+        cur.execute(CF_SQL, [guest_id, RECOMMEND_CF_SEEDS, guest_id])
+        for pid, cf, cid, score in cur.fetchall():
+            base = weights.get(cid, 0) * score if cid is not None else 0
+            scores[pid] = base + RECOMMEND_CF_WEIGHT * float(cf)
+
+    hits = scores.items()
+    if after is not None:
+        last_pid, last_score = after[0], float(after[1])
+        hits = [(pid, s) for pid, s in hits if s < last_score or (s == last_score and pid < last_pid)]
+    return nsmallest(k, hits, key=lambda hit: (-hit[1], -hit[0]))
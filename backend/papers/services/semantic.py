@@ -0,0 +1,406 @@
+# papers/services/semantic.py
+# 외부 서비스 없이 CPU 만으로 도는 의미 기반("비슷한 논문") 검색
+#  - 임베딩: title + abstract TF-IDF → truncated SVD (randomized, NumPy) → L2 정규화 float32
+#  - 저장: data/semantic/ 아래 raw 파일 (vectors.f32 는 np.memmap 으로 열어 필요한 행만 페이지 로드)
+#  - 검색: IVF (spherical k-means centroid) → nprobe 개 cluster 의 벡터만 내적
+#  - 새 논문 / 바뀐 논문: 학습된 vocab/idf/SVD 로 fold-in 후 파일 끝에 append (전체 재학습 없음)
+import copy
+import fcntl
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+
+from .bm25 import TITLE_BOOST, WATERMARK_SLACK, checksum, tokenize
+from .topk import top_k
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_INDEX_DIR = getattr(settings, "SEMANTIC_INDEX_DIR", os.path.join(settings.BASE_DIR, "data", "semantic"))
+SEMANTIC_REFRESH_INTERVAL = getattr(settings, "SEMANTIC_REFRESH_INTERVAL", 60)
+SEMANTIC_NPROBE = getattr(settings, "SEMANTIC_NPROBE", 8)
+
+MODEL_FILE = "model.npz"
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.i64"
+LISTS_FILE = "lists.i32"
+CRCS_FILE = "crcs.u32"
+STATE_FILE = "state.json"
+LOCK_FILE = ".lock"
+
+
+class IndexNotBuilt(Exception):
+    pass
+
+
+class NotIndexed(LookupError):
+    pass
+
+
+def paper_tokens(title, abstract):
+    return tokenize(title) * TITLE_BOOST + tokenize(abstract)
+
+
+def normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (vectors / norms).astype(np.float32)
+
+
+# --------------------------------------------------------
+# 📌 임베딩 모델 (vocab / idf / SVD 성분 / IVF centroid)
+# --------------------------------------------------------
+class SemanticModel:
+    def __init__(self, terms, idf, components, centroids):
+        self.terms = list(terms)
+        self.vocab = {t: i for i, t in enumerate(self.terms)}
+        self.idf = idf.astype(np.float32)
+        self.components = components.astype(np.float32)  # (vocab, dim)
+        self.centroids = centroids.astype(np.float32)    # (nlist, dim)
+
+    @property
+    def dim(self):
+        return self.components.shape[1]
+
+    def tfidf(self, docs):
+        # docs: 토큰 리스트들 → scipy CSR (sublinear tf * idf, 행 L2 정규화)
+        from scipy import sparse
+
+        indptr, indices, data = [0], [], []
+        for tokens in docs:
+            counts = Counter(self.vocab[t] for t in tokens if t in self.vocab)
+            indices.extend(counts)
+            data.extend(1 + math.log(c) for c in counts.values())
+            indptr.append(len(indices))
+        x = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(docs), len(self.terms)),
+        )
+        x = x.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(x).astype(np.float32)
+
+    def embed(self, docs):
+        if not docs:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return normalize(self.tfidf(docs) @ self.components)
+
+    def assign(self, vectors, chunk_size=50000):
+        # 코사인 유사도 최대 centroid (벡터/centroid 모두 정규화돼 있음)
+        out = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            out[start:start + chunk_size] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return out
+
+    # --------------------------------------------------------
+    # 학습: vocab → TF-IDF → randomized SVD → k-means
+    # --------------------------------------------------------
+    @classmethod
+    def fit(cls, docs, dim=128, max_vocab=50000, min_df=2, n_iter=4, seed=0):
+        rng = np.random.default_rng(seed)
+
+        df = Counter()
+        for tokens in docs:
+            df.update(set(tokens))
+        terms = [t for t, n in df.most_common(max_vocab) if n >= min_df]
+        idf = np.array([math.log((1 + len(docs)) / (1 + df[t])) + 1 for t in terms], dtype=np.float32)
+
+        model = cls(terms, idf, np.zeros((len(terms), dim)), np.zeros((1, dim)))
+        x = model.tfidf(docs)
+        dim = max(1, min(dim, min(x.shape) - 1))
+
+        # randomized range finder (Halko et al.) + power iteration
+        q = rng.standard_normal((x.shape[1], dim + 10), dtype=np.float32)
+        q, _ = np.linalg.qr(x @ q)
+        for _ in range(n_iter):
+            q, _ = np.linalg.qr(x.T @ q)
+            q, _ = np.linalg.qr(x @ q)
+        b = (x.T @ q).T                          # (dim + 10, vocab)
+        _, _, vt = np.linalg.svd(b, full_matrices=False)
+        model.components = vt[:dim].T.astype(np.float32)
+
+        vectors = model.embed(docs)
+        model.centroids = kmeans(vectors, nlist=max(1, int(math.sqrt(len(vectors)))), rng=rng)
+        return model, vectors
+
+    def save(self, path):
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp, terms=np.array(self.terms, dtype=str), idf=self.idf,
+            components=self.components, centroids=self.centroids,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            return cls(f["terms"], f["idf"], f["components"], f["centroids"])
+
+
+def kmeans(vectors, nlist, n_iter=10, sample_size=100000, rng=None):
+    # spherical k-means (centroid 도 정규화) → 내적 = 코사인 유사도
+    rng = rng or np.random.default_rng(0)
+    if len(vectors) > sample_size:
+        vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        sums[empty] = centroids[empty]
+        centroids = normalize(sums)
+    return centroids
+
+
+# --------------------------------------------------------
+# 📌 벡터 저장소 + IVF 검색
+#   vectors.f32 / lists.i32 / crcs.u32 / ids.i64 는 같은 행 순서로 append 만 함
+#   (같은 paper_id 가 다시 들어오면 뒤쪽 행이 우선, 앞쪽 행은 tombstone → 검색에서 제외)
+#   state.json: 마지막으로 반영한 data_version 과 그 changed_at (증분 반영 기준, worker 끼리 공유)
+#   reload 한 뒤에는 바꾸지 않음 → 갱신은 새 객체를 만들어 교체 (검색 중인 thread 는 lock 불필요)
+# --------------------------------------------------------
+class SemanticIndex:
+    def __init__(self, path=SEMANTIC_INDEX_DIR):
+        self.path = path
+        self.model = SemanticModel.load(os.path.join(path, MODEL_FILE))
+        with locked(path):
+            self.reload()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def reload(self):
+        self.version, self.synced_at = read_state(self.path)
+        self.ids = np.fromfile(self._file(IDS_FILE), dtype=np.int64)
+        lists = np.fromfile(self._file(LISTS_FILE), dtype=np.int32)[:len(self.ids)]
+        self.ids = self.ids[:len(lists)]
+        n = len(self.ids)
+        self.crcs = np.fromfile(self._file(CRCS_FILE), dtype=np.uint32)[:n]
+        self.vectors = (
+            np.memmap(self._file(VECTORS_FILE), dtype=np.float32, mode="r", shape=(n, self.model.dim))
+            if n else np.zeros((0, self.model.dim), dtype=np.float32)
+        )
+
+        # paper_id → 최신 행 (np.unique 는 첫 등장 위치를 주므로 뒤집어서)
+        rev = self.ids[::-1]
+        self.sorted_pids, first = np.unique(rev, return_index=True)
+        self.sorted_rows = n - 1 - first
+        live = np.zeros(n, dtype=bool)
+        live[self.sorted_rows] = True
+
+        # cluster 별 행 번호 (CSR)
+        rows = np.flatnonzero(live)
+        order = np.argsort(lists[rows], kind="stable")
+        self.list_rows = rows[order]
+        counts = np.bincount(lists[rows], minlength=len(self.model.centroids))
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.n_rows = n
+
+    def __len__(self):
+        return len(self.sorted_pids)
+
+    def _row(self, paper_id):
+        i = np.searchsorted(self.sorted_pids, paper_id)
+        if i == len(self.sorted_pids) or self.sorted_pids[i] != paper_id:
+            return None
+        return self.sorted_rows[i]
+
+    def vector(self, paper_id):
+        row = self._row(paper_id)
+        return None if row is None else np.asarray(self.vectors[row])
+
+    def crc(self, paper_id):
+        row = self._row(paper_id)
+        return None if row is None else int(self.crcs[row])
+
+    def search(self, vector, k=10, after=None, exclude=None, nprobe=SEMANTIC_NPROBE):
+        if not len(self) or not vector.any():
+            return []
+        probes = np.argsort(-(self.model.centroids @ vector))[:nprobe]
+        rows = np.concatenate([
+            self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probes
+        ])
+        rows.sort()  # memmap 을 파일 순서대로 읽도록
+        pids = self.ids[rows]
+        scores = self.vectors[rows] @ vector
+        if exclude is not None:
+            keep = pids != exclude
+            pids, scores = pids[keep], scores[keep]
+        return top_k(pids, scores, k, after)
+
+    # --------------------------------------------------------
+    # 📌 증분 반영: synced_at 이후 updated_at 이 바뀐 논문을 fold-in 해서 파일 끝에 append
+    #   새 논문 + abstract 가 나중에 들어온 논문 + 제목/abstract 가 수정된 논문
+    #   (title + abstract checksum 이 최신 행과 같으면 건너뜀: 조회수 / 인용 수만 바뀐 경우)
+    #   여러 worker/스크립트가 동시에 쓰지 않도록 파일 lock, self 는 그대로 두고 반영된 새 객체를 반환
+    # --------------------------------------------------------
+    def updated(self, version, changed_at, chunk_size=2000):
+        from papers.models import Paper
+
+        index = copy.copy(self)
+        with locked(self.path):
+            index.reload()  # 다른 프로세스가 먼저 반영했을 수 있음
+            if index.version == version:
+                return index
+            qs = Paper.objects.order_by("paper_id")
+            if index.synced_at is not None:
+                qs = qs.filter(updated_at__gte=index.synced_at - WATERMARK_SLACK)
+            rows = qs.values_list("paper_id", "title", "abstract__context").iterator(chunk_size=chunk_size)
+
+            batch = []
+            for paper_id, title, abstract in rows:
+                if index.crc(paper_id) == checksum(title, abstract):
+                    continue
+                batch.append((paper_id, title, abstract))
+                if len(batch) == chunk_size:
+                    append_rows(self.path, self.model, batch)
+                    batch = []
+            if batch:
+                append_rows(self.path, self.model, batch)
+            write_state(self.path, version, changed_at)
+            index.reload()
+        return index
+
+
+@contextmanager
+def locked(path):
+    with open(os.path.join(path, LOCK_FILE), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def read_state(path):
+    try:
+        with open(os.path.join(path, STATE_FILE)) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None, None
+    return state["version"], state["synced_at"] and parse_datetime(state["synced_at"])
+
+
+def write_state(path, version, changed_at):
+    tmp = os.path.join(path, f"{STATE_FILE}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"version": version, "synced_at": changed_at and changed_at.isoformat()}, f)
+    os.replace(tmp, os.path.join(path, STATE_FILE))
+
+
+def append_rows(path, model, batch):
+    # batch: [(paper_id, title, abstract)] → 임베딩 후 네 파일 끝에 기록 (locked() 안에서 호출)
+    #   행 수가 어긋나지 않도록 ids 를 마지막에 (reload 는 ids 길이 기준)
+    pids = np.array([pid for pid, _, _ in batch], dtype=np.int64)
+    crcs = np.array([checksum(title, abstract) for _, title, abstract in batch], dtype=np.uint32)
+    vectors = model.embed([paper_tokens(title, abstract) for _, title, abstract in batch])
+    for name, arr in (
+        (VECTORS_FILE, vectors), (LISTS_FILE, model.assign(vectors)), (CRCS_FILE, crcs), (IDS_FILE, pids),
+    ):
+        with open(os.path.join(path, name), "ab") as f:
+            arr.tofile(f)
+    return len(batch)
+
+
+# --------------------------------------------------------
+# 📌 전체 빌드 (build_semantic_index.py)
+# --------------------------------------------------------
+def build_from_db(path=SEMANTIC_INDEX_DIR, dim=128, fit_sample=200000, chunk_size=2000):
+    from papers.caching import data_changed_at, data_version
+    from papers.models import Paper
+
+    os.makedirs(path, exist_ok=True)
+    version, changed_at = data_version(), data_changed_at()
+    qs = Paper.objects.order_by("paper_id").values_list("paper_id", "title", "abstract__context")
+
+    # 학습은 step 간격 표본으로 (메모리 상한), 전체는 두 번째 pass 에서 fold-in
+    step = max(1, math.ceil(qs.count() / fit_sample))
+    sample = [
+        paper_tokens(title, abstract)
+        for i, (_, title, abstract) in enumerate(qs.iterator(chunk_size=chunk_size)) if i % step == 0
+    ]
+    model, _ = SemanticModel.fit(sample, dim=dim)
+    del sample
+
+    with locked(path):
+        for name in (VECTORS_FILE, LISTS_FILE, CRCS_FILE, IDS_FILE):
+            open(os.path.join(path, name), "wb").close()
+        model.save(os.path.join(path, MODEL_FILE))
+
+        batch = []
+        for row in qs.iterator(chunk_size=chunk_size):
+            batch.append(row)
+            if len(batch) == chunk_size:
+                append_rows(path, model, batch)
+                batch = []
+        if batch:
+            append_rows(path, model, batch)
+        write_state(path, version, changed_at)
+    return SemanticIndex(path)
+
+
+def refresh(index):
+    # data_version 이 바뀌었으면 바뀐 논문을 반영한 새 인덱스 (그대로면 index, DB 를 읽지 않음)
+    from papers.caching import data_changed_at, data_version
+
+    version, changed_at = data_version(), data_changed_at()
+    if version == index.version:
+        return index
+    return index.updated(version, changed_at)
+
+
+# --------------------------------------------------------
+# 📌 worker 전역 인덱스 (필요할 때만 로드)
+#   첫 요청에서 로드 후 background thread 가 SEMANTIC_REFRESH_INTERVAL 마다 refresh → 새 객체로 교체
+#   (요청 thread 는 DB 를 읽거나 임베딩하지 않음, 조회는 교체 전 객체를 그대로 씀 → lock 불필요)
+# --------------------------------------------------------
+_index = None
+_lock = threading.Lock()
+
+
+def _refresh_loop():
+    global _index
+    while True:
+        time.sleep(SEMANTIC_REFRESH_INTERVAL)
+        try:
+            _index = refresh(_index)
+        except Exception:
+            logger.exception("semantic refresh failed")
+        finally:
+            connection.close()
+
+
+def get_index():
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                if not os.path.exists(os.path.join(SEMANTIC_INDEX_DIR, MODEL_FILE)):
+                    raise IndexNotBuilt("Semantic index is not built (run build_semantic_index.py)")
+                _index = SemanticIndex(SEMANTIC_INDEX_DIR)
+                threading.Thread(target=_refresh_loop, name="semantic-refresh", daemon=True).start()
+    return _index
+
+
+def search(query, k=10, after=None):
+    index = get_index()
+    vector = index.model.embed([tokenize(query)])[0]
+    return index.search(vector, k, after)
+
+
+def similar(paper_id, k=10, after=None):
+    index = get_index()
+    vector = index.vector(paper_id)
+    if vector is None:
+        raise NotIndexed(f"Paper {paper_id} is not embedded")
+    return index.search(vector, k, after, exclude=paper_id)
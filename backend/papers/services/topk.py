@@ -0,0 +1,22 @@
+# papers/services/topk.py
+# 메모리 검색 엔진(BM25, semantic) 공용 상위 k 선택
+import numpy as np
+
+
+def top_k(pids, scores, k, after=None):
+    # (score DESC, paper_id DESC) 순 상위 k 개 → [(paper_id, score)]
+    # after=(paper_id, score) 이면 그 다음 순위부터 (cursor 페이지네이션)
+    if after is not None:
+        last_pid, last_score = after[0], np.float32(after[1])
+        keep = (scores < last_score) | ((scores == last_score) & (pids < last_pid))
+        pids, scores = pids[keep], scores[keep]
+
+    # 후보 전체 정렬 대신 상위 k 개만 부분 선택 후 정렬
+    if len(pids) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+        # 경계 점수와 같은 동점자는 모두 포함해야 paper_id 순서가 안정적
+        boundary = scores[top].min()
+        top = np.flatnonzero(scores >= boundary)
+        pids, scores = pids[top], scores[top]
+    order = np.lexsort((-pids, -scores))[:k]
+    return [(int(pids[i]), float(scores[i])) for i in order]
@@ -0,0 +1,102 @@
+# papers/services/viewcounter.py
+# 논문 상세 조회수 → paper.weekly_count
+#  - 요청마다 UPDATE 하면 인기 논문 한 행에 row lock 이 몰림 → worker 메모리 dict 에 모았다가
+#  - VIEW_COUNTER_FLUSH_INTERVAL 마다 UPDATE ... FROM (VALUES ...) 한 번으로 반영 (paper_id 순 → worker 간 deadlock 없음)
+#  - 정상 종료(gunicorn graceful shutdown 등) 때 atexit 으로 남은 값 flush
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNTER_FLUSH_INTERVAL = getattr(settings, "VIEW_COUNTER_FLUSH_INTERVAL", 10)
+FLUSH_BATCH = 1000
+
+# 현재 시각 bucket(paper_view_hourly) 에 누적 + weekly_count 에 더함 (services/popularity.py 가 창 밖 bucket 을 뺌)
+# weekly_count 는 상세 응답에도 있으므로 updated_at(ETag) 도 같이 갱신
+FLUSH_SQL = """
+WITH v(paper_id, hits) AS (VALUES {values}),
+updated AS (
+  UPDATE paper AS p
+  SET weekly_count = p.weekly_count + v.hits, updated_at = now()
+  FROM v
+  WHERE p.paper_id = v.paper_id
+  RETURNING p.paper_id, v.hits
+)
+INSERT INTO paper_view_hourly (paper_id, hour, hits)
+SELECT paper_id, date_trunc('hour', now()), hits FROM updated
+ON CONFLICT (paper_id, hour) DO UPDATE SET hits = paper_view_hourly.hits + EXCLUDED.hits
+"""
+
+
+class ViewCounter:
+    def __init__(self, interval=VIEW_COUNTER_FLUSH_INTERVAL):
+        # interval 이 0 이면 background flush 없음 (flush() 를 직접 호출)
+        self.interval = interval
+        self.pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def record(self, paper_id):
+        with self._lock:
+            self.pending[paper_id] = self.pending.get(paper_id, 0) + 1
+        if self._thread is None and self.interval:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._flush_loop, name="view-counter-flush", daemon=True)
+            self._thread.start()
+        atexit.register(self._flush_at_exit)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("view counter flush failed")
+            finally:
+                connection.close()
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("view counter flush at exit failed, %d papers not updated", len(self.pending))
+
+    def flush(self):
+        with self._lock:
+            counts, self.pending = self.pending, {}
+        if not counts:
+            return 0
+
+        items = sorted(counts.items())
+        try:
+            with transaction.atomic(), connection.cursor() as cur:
+                for start in range(0, len(items), FLUSH_BATCH):
+                    batch = items[start:start + FLUSH_BATCH]
+                    cur.execute(
+                        FLUSH_SQL.format(values=", ".join(["(%s, %s)"] * len(batch))),
+                        [value for item in batch for value in item],
+                    )
+        except Exception:
+            # 반영 못 한 조회수는 buffer 로 되돌려서 다음 주기에 다시
+            with self._lock:
+                for paper_id, hits in counts.items():
+                    self.pending[paper_id] = self.pending.get(paper_id, 0) + hits
+            raise
+        return len(items)
+
+
+counter = ViewCounter()
+
+
+def record(paper_id):
+    counter.record(paper_id)
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import pre_migrate
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+def load_schema_sql(sender, using, **kwargs):
+    if sender.name != "papers":
+        return
+    with open(settings.SCHEMA_SQL_PATH, encoding="utf-8") as f:
+        sql = f.read()
+    with connections[using].cursor() as cur:
+        cur.execute(sql)
+
+
+# --------------------------------------------------------
+# 📌 테스트 DB 스키마
+#   운영 DB 는 docker/postgres/table_schema.sql 로 만들어지므로 테스트 DB 도 같은 SQL 로 생성
+#   (papers migration state 는 실제 테이블과 맞지 않음)
+#   syncdb 는 이미 있는 테이블을 건너뛰므로 papers 모델 테이블은 SQL 것이 그대로 쓰임
+# --------------------------------------------------------
+class SchemaSQLTestRunner(DiscoverRunner):
+    def setup_databases(self, **kwargs):
+        pre_migrate.connect(load_schema_sql, dispatch_uid="papers_schema_sql")
+        try:
+            with override_settings(MIGRATION_MODULES={"papers": None}):
+                return super().setup_databases(**kwargs)
+        finally:
+            pre_migrate.disconnect(dispatch_uid="papers_schema_sql")
+
+    def teardown_databases(self, old_config, **kwargs):
+        # 테스트 중 쌓인 조회수(services/viewcounter.py)는 버림 → 종료 시 없어진 test DB 로 flush 하지 않게
+        from papers.services import viewcounter
+
+        viewcounter.counter.pending.clear()
+        super().teardown_databases(old_config, **kwargs)
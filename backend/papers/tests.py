@@ -1,3 +1,1443 @@
+import datetime
+import gzip
+import json
+import os
+import re
+import shutil
+import tempfile
+from unittest import mock
+
+import numpy as np
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from . import caching
+from .caching import bump_data_version
+from .middleware import brotli
+from .pagination import encode_cursor
+from .renderers import msgpack
+from .serializers import GuestFavoriteSerializer, PaperSerializer
+from .services import autocomplete, bm25, coauthor, influence, itemcf, recommend, semantic, viewcounter
+from .models import (
+    Abstract, Author, AuthorPaper, Category, CategoryInterestDaily, Guest, GuestCategoryCount, GuestFavorite,
+    Institution, Paper, PaperNeighbor, PaperReference, PaperViewHourly, PopularPaper, RecommendCandidate,
+    YearCitation,
+)
+
+WORDS = ["graph", "neural", "transformer", "protein", "quantum", "climate", "causal", "vision"]
+
+
+def seed_papers(n_papers=300):
+    categories = Category.objects.bulk_create([
+        Category(category_name=f"Category {i}", alex_category_id=f"C{i}") for i in range(5)
+    ])
+    institutions = Institution.objects.bulk_create([
+        Institution(institution_name=f"Institution {i}", country_code=code)
+        for i, code in enumerate(["KR", "US", "DE", "JP"])
+    ])
+    papers = Paper.objects.bulk_create([
+        Paper(
+            title=f"{WORDS[i % len(WORDS)]} {WORDS[(i * 3) % len(WORDS)]} study {i}",
+            category=categories[i % len(categories)],
+            institution=institutions[i % len(institutions)],
+            citation=None if i % 17 == 0 else (i * 7) % 500,
+            open_access=i % 3 == 0,
+            announcement_date=None if i % 23 == 0 else datetime.date(2020, 1, 1) + datetime.timedelta(days=i * 5),
+            weekly_count=(i * 11) % 97,
+            submit=["NeurIPS", "ICML", "Nature", None][i % 4],
+            alex_paper_id=f"W{i}",
+        )
+        for i in range(n_papers)
+    ])
+    Abstract.objects.bulk_create([
+        Abstract(paper=p, context=f"We study {p.title} with a new method.") for p in papers
+    ])
+    authors = Author.objects.bulk_create([
+        Author(author_name=f"Author {WORDS[i % len(WORDS)].title()} {i}", alex_author_id=f"A{i}")
+        for i in range(40)
+    ])
+    AuthorPaper.objects.bulk_create([
+        AuthorPaper(paper=p, author=authors[(j + k) % len(authors)]) for j, p in enumerate(papers) for k in range(2)
+    ])
+    YearCitation.objects.bulk_create([
+        YearCitation(paper=p, recent_year1_count=j, recent_year2_count=j // 2, recent_year3_count=0)
+        for j, p in enumerate(papers) if j % 2
+    ])
+    return categories, papers
+
+
+def walk_pages(client, path, params, max_pages=200):
+    # cursor 를 따라 끝까지 → 나온 paper_id 순서대로 (cursor 가 끝나지 않으면 AssertionError)
+    seen, params = [], dict(params)
+    for _ in range(max_pages):
+        data = client.get(path, params).json()
+        seen += [r["paper_id"] for r in data["results"]]
+        if not data["next"]:
+            return seen
+        params["cursor"] = data["next"]
+    raise AssertionError(f"{path} {params}: cursor did not end after {max_pages} pages")
+
+
+# --------------------------------------------------------
+# 📌 쿼리 플랜 회귀 테스트
+#   각 view 가 실행한 SELECT 를 EXPLAIN 해서 Seq Scan 이 나오면 실패
+#   (enable_seqscan=off: 작은 테스트 데이터에서도 쓸 수 있는 인덱스가 있으면 인덱스 경로를 고름)
+#   fuzzy 경로까지 보려면 pg_trgm 이 있는 서버 + UTF8 test DB 에서 table_schema.sql 그대로 (SCHEMA_SQL_PATH)
+# --------------------------------------------------------
+def seq_scans(plan):
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found += seq_scans(child)
+    return found
+
+
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers()
+        cls.guest = Guest.objects.create(
+            guestname="planner", pwd="x",
+            interest_1=str(cls.categories[0].pk), interest_2=str(cls.categories[1].pk),
+        )
+        GuestFavorite.objects.bulk_create([
+            GuestFavorite(guest=cls.guest, paper=p) for p in cls.papers[:30]
+        ])
+        recommend.refresh_candidates()
+        itemcf.rebuild()
+        # 앞쪽 논문만 인용됨 → influence 가 NULL 인 논문 없이, 값이 몰린 분포
+        PaperReference.objects.bulk_create([
+            PaperReference(paper=p, referenced_alex_id=f"W{(i * 7) % 50}") for i, p in enumerate(cls.papers)
+        ])
+        influence.run()
+        with connection.cursor() as cur:
+            cur.execute("ANALYZE")
+
+    def setUp(self):
+        with connection.cursor() as cur:
+            cur.execute("SET LOCAL enable_seqscan = off")
+
+    def explain(self, sql):
+        # server-side cursor(iterator) 는 DECLARE ... FOR SELECT 로 기록됨
+        match = re.match(r"^DECLARE .*? FOR (SELECT .*)$", sql, re.S)
+        if match:
+            sql = match.group(1)
+        with connection.cursor() as cur:
+            cur.execute("EXPLAIN (FORMAT JSON) " + sql)
+            return cur.fetchone()[0][0]["Plan"]
+
+    def assertIndexedQueries(self, path, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path, params or {})
+            body = b"".join(response.streaming_content) if response.streaming else response.content
+        self.assertEqual(response.status_code, 200, body)
+
+        selects = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].lstrip().upper().startswith(("SELECT", "DECLARE"))
+        ]
+        self.assertTrue(selects, f"{path} {params}: no queries captured")
+        for sql in selects:
+            self.assertEqual(seq_scans(self.explain(sql)), [], f"{path} {params}: seq scan in\n{sql}")
+        return response
+
+    def test_search_papers(self):
+        for params in [
+            {},
+            {"q": "graph"},
+            {"q": "graph", "order": "relevance"},
+            {"q": "graph neural", "order": "cited"},
+            {"q": "graph", "order": "influence"},
+            {"q": "grpah", "mode": "fuzzy"},
+            {"q": "Autor Quantm", "mode": "fuzzy", "threshold": "0.3"},
+        ]:
+            with self.subTest(params=params):
+                self.assertIndexedQueries("/api/search/", params)
+
+    def test_advanced_search(self):
+        category_id = self.categories[2].pk
+        for params in [
+            {},
+            {"order": "cited"},
+            {"category_id": category_id},
+            {"category_id": category_id, "order": "cited"},
+            {"order": "influence"},
+            {"category_id": category_id, "order": "influence"},
+            {"open_access": "true"},
+            {"open_access": "true", "order": "cited"},
+            {"country": "KR"},
+            {"start": "2021-01-01", "end": "2022-12-31"},
+            {"category_id": category_id, "start": "2021-01-01", "open_access": "true"},
+        ]:
+            with self.subTest(params=params):
+                response = self.assertIndexedQueries("/api/advanced-search/", {**params, "limit": 5})
+                # 다음 페이지 (keyset 조건)
+                next_cursor = response.json()["next"]
+                if next_cursor:
+                    self.assertIndexedQueries(
+                        "/api/advanced-search/", {**params, "limit": 5, "cursor": next_cursor}
+                    )
+
+    def test_advanced_search_null_tail(self):
+        # 정렬 컬럼이 NULL 인 구간까지 넘어가는 페이지
+        response = self.assertIndexedQueries("/api/advanced-search/", {"limit": 100})
+        while response.json()["next"]:
+            response = self.assertIndexedQueries(
+                "/api/advanced-search/", {"limit": 100, "cursor": response.json()["next"]}
+            )
+
+    def test_advanced_search_export(self):
+        self.assertIndexedQueries(
+            "/api/advanced-search/export/",
+            {"category_id": self.categories[1].pk, "start": "2021-01-01", "fmt": "csv"},
+        )
+
+    def test_paper_detail(self):
+        self.assertIndexedQueries(f"/api/detail/{self.papers[5].pk}/")
+
+    def test_weekly_popular_papers(self):
+        self.assertIndexedQueries("/api/popular-weekly/")
+
+    def test_also_saved_papers(self):
+        self.assertIndexedQueries(f"/api/also-saved/{self.papers[0].pk}/")
+
+    def test_trending_categories(self):
+        self.assertIndexedQueries("/api/trending-category/", {"days": 7})
+
+    def test_recommend_by_guest(self):
+        self.assertIndexedQueries(f"/api/recommend/{self.guest.pk}/")
+
+    def test_author_collaborators(self):
+        author_id = AuthorPaper.objects.filter(paper=self.papers[0]).values_list("author_id", flat=True)[0]
+        with mock.patch.object(coauthor, "_graph", coauthor.CoauthorGraph.from_db()):
+            self.assertIndexedQueries(f"/api/authors/{author_id}/collaborators/")
+            self.assertIndexedQueries(f"/api/authors/{author_id}/network/", {"hops": 2})
+
+    def test_guest_favorites(self):
+        response = self.assertIndexedQueries(f"/api/favorites/{self.guest.pk}/", {"limit": 10})
+        self.assertIndexedQueries(
+            f"/api/favorites/{self.guest.pk}/", {"limit": 10, "cursor": response.json()["next"]}
+        )
+        self.assertIndexedQueries(f"/api/favorites/{self.guest.pk}/", {"mode": "ids"})
+        self.assertIndexedQueries(
+            f"/api/favorites/{self.guest.pk}/", {"mode": "ids", "paper_ids": f"{self.papers[3].pk},{self.papers[40].pk}"}
+        )
+
+
+class SearchPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # 제목이 같은 단어 조합이라 ts_rank 가 같은 논문이 여럿 (float4 값)
+        cls.categories, cls.papers = seed_papers(80)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_relevance_pages_cover_each_row_once(self):
+        expected = set(Paper.objects.filter(title__icontains="graph").values_list("paper_id", flat=True))
+        for limit in (1, 3, 7):
+            with self.subTest(limit=limit):
+                seen = walk_pages(self.client, "/api/search/", {"q": "graph", "order": "relevance", "limit": limit})
+                self.assertEqual(len(seen), len(set(seen)))
+                self.assertEqual(set(seen), expected)
+
+    def test_tampered_cursor_is_400(self):
+        # 정렬 컬럼 타입과 맞지 않는 cursor 값 → 400 (filter 까지 가면 500)
+        cases = [
+            ("/api/search/", {"order": "latest"}, "latest", "not-a-date"),
+            ("/api/search/", {"order": "latest"}, "latest", 20200101),
+            ("/api/search/", {"order": "cited"}, "cited", "12"),
+            ("/api/search/", {"order": "cited"}, "cited", 1.5),
+            ("/api/search/", {"order": "influence"}, "influence", "high"),
+            ("/api/search/", {"q": "graph", "order": "relevance"}, "relevance", [1]),
+            ("/api/advanced-search/", {"order": "cited"}, "cited", True),
+            ("/api/search/", {"mode": "bm25", "q": "graph"}, "bm25", None),
+        ]
+        for path, params, tag, value in cases:
+            with self.subTest(path=path, tag=tag, value=value):
+                response = self.client.get(path, {**params, "cursor": encode_cursor(tag, value, 5)})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get("/api/search/", {
+            "order": "cited", "cursor": encode_cursor("cited", 10, "5"),
+        }).status_code, 400)
+        self.assertEqual(self.client.get("/api/search/", {
+            "order": "influence", "cursor": encode_cursor("influence", float("nan"), 5),
+        }).status_code, 400)
+        # INTEGER 범위 밖 (DB 의 DataError 대신)
+        for value, pk in ((2 ** 40, 5), (10, -2 ** 40)):
+            with self.subTest(value=value, pk=pk):
+                response = self.client.get("/api/search/", {"order": "cited", "cursor": encode_cursor("cited", value, pk)})
+                self.assertEqual(response.status_code, 400)
+
+        # NULL 구간 cursor 와 정상 값은 그대로
+        for tag, value in (("latest", None), ("latest", "2020-03-01"), ("cited", 10), ("cited", None)):
+            with self.subTest(tag=tag, value=value):
+                response = self.client.get("/api/search/", {"order": tag, "cursor": encode_cursor(tag, value, 50)})
+                self.assertEqual(response.status_code, 200)
+
+
+class PaperDetailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(10)
+
+    def test_detail_in_two_queries(self):
+        paper = self.papers[3]
+        with self.assertNumQueries(2):
+            data = self.client.get(f"/api/detail/{paper.pk}/").json()
+
+        self.assertEqual(data["abstract"], paper.abstract.context)
+        self.assertEqual(data["category_name"], paper.category.category_name)
+        self.assertEqual(data["country_code"], paper.institution.country_code)
+        self.assertEqual(data["year_citations"], {"year1": 3, "year2": 1, "year3": 0})
+        # authorpaper 삽입 순서 = 저자 순서
+        expected = list(
+            AuthorPaper.objects.filter(paper=paper).order_by("ap_id").values_list("author_id", flat=True)
+        )
+        self.assertEqual([a["author_id"] for a in data["authors"]], expected)
+
+    def test_detail_without_optional_rows(self):
+        paper = Paper.objects.create(title="orphan")
+        with self.assertNumQueries(2):
+            data = self.client.get(f"/api/detail/{paper.pk}/").json()
+        self.assertIsNone(data["abstract"])
+        self.assertIsNone(data["category_name"])
+        self.assertIsNone(data["year_citations"])
+        self.assertEqual(data["authors"], [])
+
+
+class PaperDetailBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(80)
+
+    def test_fixed_query_count_and_order(self):
+        for n in (3, 80):
+            ids = [p.pk for p in self.papers[:n]][::-1]
+            with self.subTest(n=n), self.assertNumQueries(2):
+                data = self.client.get("/api/detail/", {"ids": ",".join(map(str, ids))}).json()
+            self.assertEqual([r["paper_id"] for r in data["results"]], ids)
+
+    def test_post_body_and_missing_ids(self):
+        first, second = self.papers[7].pk, self.papers[2].pk
+        response = self.client.post(
+            "/api/detail/", {"ids": [first, 10 ** 9, second, first]}, content_type="application/json"
+        )
+        data = response.json()
+        self.assertEqual([r["paper_id"] for r in data["results"]], [first, second])
+        self.assertEqual(data["missing"], [10 ** 9])
+        self.assertEqual(data["results"][0], self.client.get(f"/api/detail/{first}/").json())
+
+    def test_invalid_ids(self):
+        for params in [{}, {"ids": "1,x"}, {"ids": ",".join(str(i) for i in range(1, 1000))}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get("/api/detail/", params).status_code, 400)
+
+
+class FastSerializerTests(TestCase):
+    # values_list + RowSerializer 경로가 기존 ModelSerializer 와 같은 JSON 을 내는지
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(40)
+        cls.guest = Guest.objects.create(guestname="fast", pwd="x")
+        GuestFavorite.objects.bulk_create([GuestFavorite(guest=cls.guest, paper=p) for p in cls.papers[:15]])
+
+    def drf_json(self, data):
+        return json.loads(JSONRenderer().render(data))
+
+    def test_paper_rows(self):
+        results = self.client.get("/api/advanced-search/", {"limit": 40}).json()["results"]
+        found = Paper.objects.in_bulk([r["paper_id"] for r in results])
+        expected = PaperSerializer([found[r["paper_id"]] for r in results], many=True).data
+        self.assertEqual(results, self.drf_json(expected))
+
+    def test_guest_favorite_rows(self):
+        results = self.client.get(f"/api/favorites/{self.guest.pk}/", {"limit": 15}).json()["results"]
+        expected = GuestFavoriteSerializer(
+            GuestFavorite.objects.filter(guest=self.guest).order_by("-pk"), many=True
+        ).data
+        self.assertEqual(results, self.drf_json(expected))
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(20)
+
+    def test_list_fields_limit_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/advanced-search/", {"fields": "title,citation", "order": "cited"})
+        for row in response.json()["results"]:
+            self.assertEqual(set(row), {"paper_id", "title", "citation"})
+        sql = ctx.captured_queries[-1]["sql"]
+        self.assertNotIn('"paper"."submit"', sql)
+        self.assertNotIn('"paper"."locations"', sql)
+
+    def test_detail_fetches_abstract_only_when_asked(self):
+        pid = self.papers[4].pk
+        with CaptureQueriesContext(connection) as ctx, self.assertNumQueries(1):
+            data = self.client.get(f"/api/detail/{pid}/", {"fields": "title,category_name"}).json()
+        self.assertEqual(set(data), {"paper_id", "title", "category_name"})
+        self.assertNotIn("abstract", ctx.captured_queries[0]["sql"])
+        self.assertNotIn("institution", ctx.captured_queries[0]["sql"])
+
+        with self.assertNumQueries(2):
+            data = self.client.get(f"/api/detail/{pid}/", {"fields": "abstract,authors"}).json()
+        self.assertEqual(data["abstract"], self.papers[4].abstract.context)
+        self.assertEqual(len(data["authors"]), 2)
+
+    def test_unknown_field(self):
+        self.assertEqual(self.client.get("/api/popular-weekly/", {"fields": "title,secret"}).status_code, 400)
+        self.assertEqual(self.client.get(f"/api/detail/{self.papers[0].pk}/", {"fields": "x"}).status_code, 400)
+
+
+class GuestFavoriteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(40)
+        cls.guest = Guest.objects.create(guestname="fan", pwd="x")
+        cls.favorites = GuestFavorite.objects.bulk_create([
+            GuestFavorite(guest=cls.guest, paper=p) for p in cls.papers[5:30]
+        ])
+
+    def test_pages_newest_first(self):
+        url = f"/api/favorites/{self.guest.pk}/"
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+            with self.assertNumQueries(1):
+                data = self.client.get(url, params).json()
+            seen += [row["favorite_id"] for row in data["results"]]
+            cursor = data["next"]
+            if not cursor:
+                break
+        self.assertEqual(seen, sorted((f.pk for f in self.favorites), reverse=True))
+
+    def test_ids_mode(self):
+        url = f"/api/favorites/{self.guest.pk}/"
+        with self.assertNumQueries(1):
+            data = self.client.get(url, {"mode": "ids"}).json()
+        self.assertEqual(data["paper_ids"], sorted(p.pk for p in self.papers[5:30]))
+
+        cards = [self.papers[0].pk, self.papers[6].pk, self.papers[29].pk, self.papers[35].pk]
+        data = self.client.get(url, {"mode": "ids", "paper_ids": ",".join(map(str, cards))}).json()
+        self.assertEqual(data["paper_ids"], [self.papers[6].pk, self.papers[29].pk])
+
+        self.assertEqual(self.client.get(url, {"mode": "ids", "paper_ids": "1,x"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"mode": "all"}).status_code, 400)
+
+
+class FacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(60)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_facets_match_grouped_counts(self):
+        params = {"start": "2020-03-01", "open_access": "true"}
+        facets = self.client.get("/api/advanced-search/facets/", params).json()
+
+        qs = Paper.objects.filter(announcement_date__gte="2020-03-01", open_access=True)
+        self.assertEqual(facets["total"], qs.count())
+        self.assertEqual(
+            {f["category_id"]: f["count"] for f in facets["category"]},
+            dict(qs.values_list("category_id").annotate(n=Count("pk"))),
+        )
+        self.assertEqual(
+            {f["country_code"]: f["count"] for f in facets["country"]},
+            dict(qs.values_list("institution__country_code").annotate(n=Count("pk"))),
+        )
+        self.assertEqual(sum(f["count"] for f in facets["year"]), qs.count())
+        self.assertEqual(facets["open_access"], [{"open_access": True, "count": qs.count()}])
+
+    def test_facets_are_cached_per_filter_set(self):
+        self.client.get("/api/advanced-search/facets/", {"country": "KR"})
+        with self.assertNumQueries(0):
+            # 파라미터 순서/표기가 달라도 같은 필터면 같은 캐시
+            self.client.get("/api/advanced-search/facets/", {"open_access": "0", "country": "KR"})
+
+
+class ResultCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(30)
+
+    def setUp(self):
+        cache.clear()
+        # 이전 테스트에서 rollback 된 version 이 memo 에 남아 있을 수 있음
+        caching._version = None
+
+    def test_same_params_hit_cache(self):
+        first = self.client.get("/api/advanced-search/", {"order": "cited", "limit": 5})
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            # 파라미터 순서 / 빈 값이 달라도 같은 키
+            second = self.client.get("/api/advanced-search/", {"cursor": "", "limit": "5", "order": "cited"})
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.json(), second.json())
+
+    def test_version_bump_invalidates(self):
+        self.client.get("/api/advanced-search/", {"order": "cited", "limit": 5})
+        target = self.papers[1]
+        Paper.objects.filter(pk=target.pk).update(citation=10 ** 6)
+        bump_data_version()
+
+        response = self.client.get("/api/advanced-search/", {"order": "cited", "limit": 5})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["results"][0]["paper_id"], target.pk)
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            response = self.client.get("/api/search/", {"mode": "nope"})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_stats(self):
+        for _ in range(3):
+            self.client.get("/api/popular-weekly/")
+        stats = self.client.get("/api/cache-stats/").json()["endpoints"]["popular_weekly"]
+        self.assertEqual(stats, {"hit": 2, "miss": 1, "hit_ratio": round(2 / 3, 4)})
+
+
+class ConditionalRequestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(10)
+
+    def setUp(self):
+        cache.clear()
+        # 이전 테스트에서 rollback 된 version 이 memo 에 남아 있을 수 있음
+        caching._version = None
+
+    def test_detail_not_modified(self):
+        url = f"/api/detail/{self.papers[0].pk}/"
+        first = self.client.get(url)
+        self.assertIn("max-age", first["Cache-Control"])
+        self.assertIn("Last-Modified", first)
+
+        # updated_at 조회 1번, 상세 쿼리 / serializer 없음
+        with self.assertNumQueries(1):
+            second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code, 304)
+
+        # 다른 표현(fields) 이면 다른 ETag
+        sparse = self.client.get(url, {"fields": "title"})
+        self.assertNotEqual(sparse["ETag"], first["ETag"])
+
+        Paper.objects.filter(pk=self.papers[0].pk).update(
+            title="changed", updated_at=self.papers[0].updated_at + datetime.timedelta(seconds=5)
+        )
+        third = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(third.json()["title"], "changed")
+
+    def test_detail_missing_is_not_public(self):
+        response = self.client.get("/api/detail/999999/")
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Cache-Control"))
+
+    def test_list_etag_follows_data_version(self):
+        # popular-weekly 의 ETag 는 POPULAR_CACHE_TIMEOUT 주기로도 바뀜 → 시각 고정
+        with mock.patch("papers.caching.time.time", return_value=1_000_000.0):
+            first = self.client.get("/api/popular-weekly/", {"limit": 3})
+            self.assertEqual(
+                self.client.get("/api/popular-weekly/", {"limit": 3}, HTTP_IF_NONE_MATCH=first["ETag"]).status_code,
+                304,
+            )
+            self.assertNotEqual(self.client.get("/api/popular-weekly/", {"limit": 4})["ETag"], first["ETag"])
+
+            bump_data_version()
+            response = self.client.get("/api/popular-weekly/", {"limit": 3}, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(response.status_code, 200)
+
+
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(5)
+
+    def setUp(self):
+        # background flush 없는 counter 로 교체 (flush 는 직접)
+        patcher = mock.patch.object(viewcounter, "counter", viewcounter.ViewCounter(interval=0))
+        self.counter = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_detail_views_are_buffered_then_flushed(self):
+        paper, other = self.papers[1], self.papers[2]
+        for target in (paper, paper, paper, other):
+            self.client.get(f"/api/detail/{target.pk}/")
+        # 요청 중에는 UPDATE 없음
+        self.assertEqual(Paper.objects.get(pk=paper.pk).weekly_count, paper.weekly_count)
+        self.assertEqual(self.counter.pending, {paper.pk: 3, other.pk: 1})
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.counter.flush(), 2)
+        self.assertEqual(sum("paper_view_hourly" in q["sql"] for q in ctx.captured_queries), 1)
+        self.assertEqual(PaperViewHourly.objects.get(paper=paper).hits, 3)
+        self.assertEqual(self.counter.pending, {})
+        updated = Paper.objects.get(pk=paper.pk)
+        self.assertEqual(updated.weekly_count, paper.weekly_count + 3)
+        self.assertNotEqual(updated.updated_at, paper.updated_at)
+        self.assertEqual(Paper.objects.get(pk=other.pk).weekly_count, other.weekly_count + 1)
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_revalidation_counts_as_view(self):
+        url = f"/api/detail/{self.papers[3].pk}/"
+        first = self.client.get(url)
+        # 공유 캐시(CDN)가 응답하면 조회수가 빠지므로 브라우저 캐시만
+        self.assertIn("private", first["Cache-Control"])
+        self.assertNotIn("public", first["Cache-Control"])
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code, 304)
+        self.assertEqual(self.counter.pending, {self.papers[3].pk: 3})
+
+        self.client.get("/api/detail/999999/")
+        self.assertEqual(self.counter.pending, {self.papers[3].pk: 3})
+
+    def test_failed_flush_keeps_hits(self):
+        self.counter.record(self.papers[0].pk)
+        self.counter.record(self.papers[0].pk)
+        with mock.patch.object(viewcounter, "FLUSH_SQL", "UPDATE no_such_table SET x = 1 WHERE {values}"):
+            with self.assertRaises(Exception):
+                self.counter.flush()
+        self.assertEqual(self.counter.pending, {self.papers[0].pk: 2})
+
+
+class PopularityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(10)
+        Paper.objects.update(weekly_count=0)
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        # papers[0]: 8일 전 5 + 1시간 전 2 / papers[1]: 3일 전 4
+        buckets = [
+            (cls.papers[0], now - datetime.timedelta(days=8), 5),
+            (cls.papers[0], now - datetime.timedelta(hours=1), 2),
+            (cls.papers[1], now - datetime.timedelta(days=3), 4),
+        ]
+        PaperViewHourly.objects.bulk_create([PaperViewHourly(paper=p, hour=h, hits=n) for p, h, n in buckets])
+        for paper, _, hits in buckets:
+            Paper.objects.filter(pk=paper.pk).update(weekly_count=F("weekly_count") + hits)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_roll_expires_only_old_buckets(self):
+        untouched = Paper.objects.get(pk=self.papers[5].pk).updated_at
+        response = self.client.post("/api/popular/roll/")
+        self.assertEqual(response.json()["expired_papers"], 1)
+
+        self.assertEqual(Paper.objects.get(pk=self.papers[0].pk).weekly_count, 2)
+        self.assertEqual(Paper.objects.get(pk=self.papers[1].pk).weekly_count, 4)
+        self.assertEqual(PaperViewHourly.objects.count(), 2)
+        self.assertEqual(Paper.objects.get(pk=self.papers[5].pk).updated_at, untouched)
+
+        # popular_paper: weekly_count DESC, paper_id DESC
+        ranked = list(PopularPaper.objects.order_by("rank").values_list("paper_id", flat=True)[:2])
+        self.assertEqual(ranked, [self.papers[1].pk, self.papers[0].pk])
+
+    def test_popular_weekly_reads_precomputed_ranks(self):
+        self.client.post("/api/popular/roll/")
+        # 순위는 roll 시점 기준 (그 뒤 조회수는 다음 roll 에서)
+        Paper.objects.filter(pk=self.papers[7].pk).update(weekly_count=100)
+        with self.assertNumQueries(1):
+            results = self.client.get("/api/popular-weekly/", {"limit": 2}).json()
+        self.assertEqual([r["paper_id"] for r in results], [self.papers[1].pk, self.papers[0].pk])
+
+    def test_popular_weekly_before_first_roll(self):
+        results = self.client.get("/api/popular-weekly/", {"limit": 2}).json()
+        self.assertEqual([r["paper_id"] for r in results], [self.papers[0].pk, self.papers[1].pk])
+        self.assertEqual(self.client.get("/api/popular-weekly/", {"limit": "x"}).status_code, 400)
+
+
+class RecommendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(60)
+        recommend.refresh_candidates(k=8)
+        # interest: category 0 (id), category 2 (이름) / 즐겨찾기: category 1 논문 하나
+        cls.guest = Guest.objects.create(
+            guestname="reco", pwd="x", interest_1=str(cls.categories[0].pk), interest_2="Category 2",
+        )
+        cls.favorite = RecommendCandidate.objects.filter(category=cls.categories[1], rank=1).get().paper_id
+        GuestFavorite.objects.apply(cls.guest.pk, [(cls.favorite, "add")])
+
+    def expected(self):
+        # interest 3 + count 0 / count 1 → 최댓값으로 나눈 가중치 × 후보 점수
+        weights = {self.categories[0].pk: 1.0, self.categories[2].pk: 1.0, self.categories[1].pk: 1 / 3}
+        hits = [
+            (pid, weights[cid] * score)
+            for pid, cid, score in RecommendCandidate.objects.values_list("paper_id", "category_id", "score")
+            if cid in weights and pid != self.favorite
+        ]
+        return [pid for pid, _ in sorted(hits, key=lambda h: (-h[1], -h[0]))]
+
+    def test_candidates_ranked_per_category(self):
+        for category in self.categories:
+            rows = list(RecommendCandidate.objects.filter(category=category).order_by("rank").values_list(
+                "rank", "score"
+            ))
+            self.assertEqual([rank for rank, _ in rows], list(range(1, 9)))
+            self.assertEqual([score for _, score in rows], sorted((score for _, score in rows), reverse=True))
+
+    def test_ranked_top_n(self):
+        with self.assertNumQueries(6):
+            data = self.client.get(f"/api/recommend/{self.guest.pk}/", {"limit": 10}).json()
+        self.assertEqual([r["paper_id"] for r in data["results"]], self.expected()[:10])
+        self.assertIsNotNone(data["next"])
+
+    def test_cursor_pages_end_within_candidates(self):
+        seen, params = [], {"limit": 7}
+        while True:
+            data = self.client.get(f"/api/recommend/{self.guest.pk}/", params).json()
+            seen += [r["paper_id"] for r in data["results"]]
+            if not data["next"]:
+                break
+            params["cursor"] = data["next"]
+        # 3 카테고리 × 8 후보 - 즐겨찾기 1
+        self.assertEqual(seen, self.expected())
+        self.assertEqual(len(seen), 23)
+
+    def test_guest_without_interests(self):
+        guest = Guest.objects.create(guestname="new", pwd="x")
+        data = self.client.get(f"/api/recommend/{guest.pk}/").json()
+        self.assertEqual(data, {"results": [], "next": None})
+        self.assertEqual(self.client.get("/api/recommend/999999/").status_code, 404)
+
+
+class ItemCFTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(20)
+        p = cls.papers
+        cls.guests = Guest.objects.bulk_create([Guest(guestname=f"cf{i}", pwd="x") for i in range(3)])
+        # p0: p1 과 2명, p2 와 1명이 같이 저장
+        saved = {0: [p[0], p[1], p[2]], 1: [p[0], p[1]], 2: [p[1], p[3]]}
+        GuestFavorite.objects.bulk_create([
+            GuestFavorite(guest=cls.guests[g], paper=paper) for g, papers in saved.items() for paper in papers
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def neighbors(self):
+        return list(PaperNeighbor.objects.order_by("paper_id", "rank").values_list(
+            "paper_id", "rank", "neighbor_id", "score"
+        ))
+
+    def toggle(self, guest, paper):
+        self.client.post(
+            "/api/toggle-favorite/", {"guest_id": guest.pk, "paper_id": paper.pk}, content_type="application/json"
+        )
+
+    def test_rebuild_cosine_top_k(self):
+        itemcf.rebuild()
+        p = self.papers
+        rows = PaperNeighbor.objects.filter(paper=p[0]).order_by("rank").values_list("neighbor_id", "score")
+        # cosine = 공동 저장 / sqrt(저장 수 × 저장 수): p1 = 2 / sqrt(2 × 3), p2 = 1 / sqrt(2 × 1)
+        self.assertEqual([pid for pid, _ in rows], [p[1].pk, p[2].pk])
+        self.assertAlmostEqual(rows[0][1], 2 / 6 ** 0.5, places=5)
+        self.assertAlmostEqual(rows[1][1], 1 / 2 ** 0.5, places=5)
+
+        self.assertEqual(itemcf.rebuild(k=1), 4)
+        self.assertEqual(PaperNeighbor.objects.filter(paper=p[0]).count(), 1)
+
+    def test_incremental_refresh_matches_rebuild(self):
+        itemcf.rebuild()
+        g, p = self.guests, self.papers
+        self.toggle(g[2], p[2])   # 추가
+        self.toggle(g[0], p[0])   # 취소
+        self.toggle(g[1], p[4])   # 추가
+
+        self.assertGreater(itemcf.refresh(), 0)
+        self.assertEqual(itemcf.refresh(), 0)
+        incremental = self.neighbors()
+        itemcf.rebuild()
+        self.assertEqual(incremental, self.neighbors())
+
+    def test_guest_over_cap_marks_all_favorites(self):
+        # guest 가 CF_MAX_GUEST_FAVORITES 를 넘는 순간 계산에서 빠짐 → 그 guest 의 기존 공동 저장도 다시 계산
+        cap = itemcf.CF_MAX_GUEST_FAVORITES
+        fillers = Paper.objects.bulk_create([Paper(title=f"filler {i}") for i in range(cap)])
+        heavy = Guest.objects.create(guestname="cf-heavy", pwd="x")
+        GuestFavorite.objects.bulk_create(
+            [GuestFavorite(guest=heavy, paper=paper) for paper in [self.papers[0], self.papers[2]] + fillers[:cap - 2]]
+        )
+        itemcf.rebuild()
+        self.assertTrue(PaperNeighbor.objects.filter(paper=self.papers[0], neighbor__in=fillers).exists())
+
+        self.toggle(heavy, fillers[-1])
+        with connection.cursor() as cur:
+            cur.execute("SELECT paper_id FROM paper_neighbor_dirty")
+            self.assertIn(self.papers[0].pk, {pid for pid, in cur.fetchall()})
+        itemcf.refresh()
+        incremental = self.neighbors()
+        self.assertFalse(PaperNeighbor.objects.filter(paper=self.papers[0], neighbor__in=fillers).exists())
+        itemcf.rebuild()
+        self.assertEqual(incremental, self.neighbors())
+
+    def test_also_saved_pages(self):
+        itemcf.rebuild()
+        p = self.papers
+        with self.assertNumQueries(2):
+            first = self.client.get(f"/api/also-saved/{p[0].pk}/", {"limit": 1}).json()
+        self.assertEqual([r["paper_id"] for r in first["results"]], [p[1].pk])
+        second = self.client.get(f"/api/also-saved/{p[0].pk}/", {"limit": 1, "cursor": first["next"]}).json()
+        self.assertEqual([r["paper_id"] for r in second["results"]], [p[2].pk])
+        self.assertIsNone(second["next"])
+
+    def test_recommend_uses_neighbors(self):
+        itemcf.rebuild()
+        guest = Guest.objects.create(guestname="cf-reco", pwd="x")
+        GuestFavorite.objects.create(guest=guest, paper=self.papers[0])
+        data = self.client.get(f"/api/recommend/{guest.pk}/").json()
+        self.assertEqual([r["paper_id"] for r in data["results"]], [self.papers[1].pk, self.papers[2].pk])
+
+
+class InfluenceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(20)
+        p = cls.papers
+        # p0 ← p1..p9, p1 ← p2..p4, p10 은 DB 에 없는 논문만 인용, 나머지는 인용 없음
+        refs = [(p[i], "W0") for i in range(1, 10)] + [(p[i], "W1") for i in range(2, 5)]
+        refs += [(p[10], "W999999")]
+        PaperReference.objects.bulk_create([PaperReference(paper=src, referenced_alex_id=dst) for src, dst in refs])
+
+    def setUp(self):
+        cache.clear()
+
+    def influences(self):
+        return dict(Paper.objects.values_list("paper_id", "influence"))
+
+    def test_run_ranks_most_cited_first(self):
+        stats = influence.run()
+        self.assertEqual((stats["papers"], stats["edges"]), (20, 12))
+        self.assertLess(stats["delta"], influence.INFLUENCE_TOL)
+
+        values = self.influences()
+        p = self.papers
+        self.assertEqual(max(values, key=values.get), p[0].pk)
+        self.assertGreater(values[p[1].pk], values[p[2].pk])
+        self.assertAlmostEqual(sum(values.values()) / len(values), 1.0, places=4)
+
+        # 값이 그대로면 다시 쓰지 않음
+        self.assertEqual(influence.run()["updated"], 0)
+
+    def test_warm_start_converges_faster(self):
+        cold = influence.run(warm=False)
+        self.assertLessEqual(influence.run()["iterations"], 2)
+
+        # 간선이 조금 바뀐 큰 그래프: 이전 결과에서 시작하면 더 빨리 수렴
+        rng = np.random.default_rng(0)
+        n = 2000
+        src, dst = rng.integers(0, n, 10000), (n * rng.random(10000) ** 3).astype(np.int64)
+        x, before, _ = influence.pagerank(*influence.transition_matrix(n, src, dst))
+        src, dst = np.r_[src, rng.integers(0, n, 20)], np.r_[dst, rng.integers(0, n, 20)]
+        M, dangling = influence.transition_matrix(n, src, dst)
+        _, cold_iterations, _ = influence.pagerank(M, dangling)
+        _, warm_iterations, _ = influence.pagerank(M, dangling, influence.warm_start((x * n).astype(np.float32)))
+        self.assertLess(warm_iterations, cold_iterations)
+        self.assertGreater(cold["iterations"], 2)
+
+    def test_order_by_influence(self):
+        influence.run()
+        p = self.papers
+        for path in ("/api/search/", "/api/advanced-search/"):
+            with self.subTest(path=path):
+                data = self.client.get(path, {"order": "influence", "limit": 2}).json()
+                self.assertEqual([r["paper_id"] for r in data["results"]], [p[0].pk, p[1].pk])
+                self.assertNotIn("influence", data["results"][0])
+                data = self.client.get(path, {"order": "influence", "limit": 2, "cursor": data["next"]}).json()
+                self.assertNotIn(p[0].pk, [r["paper_id"] for r in data["results"]])
+
+        response = self.client.get("/api/advanced-search/export/", {"order": "influence", "fmt": "csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/api/advanced-search/", {"order": "pagerank"}).status_code, 400)
+
+    def test_order_by_influence_pages_cover_each_row_once(self):
+        # 인용받지 않은 논문들은 influence 가 모두 같음 → 같은 값이 여러 페이지에 걸침
+        influence.run()
+        values = list(Paper.objects.values_list("influence", flat=True))
+        self.assertLess(len(set(values)), len(values))
+        for path in ("/api/search/", "/api/advanced-search/"):
+            for limit in (1, 2, 3):
+                with self.subTest(path=path, limit=limit):
+                    seen = walk_pages(self.client, path, {"order": "influence", "limit": limit})
+                    self.assertEqual(len(seen), len(set(seen)))
+                    self.assertEqual(set(seen), {p.pk for p in self.papers})
+
+    def test_refresh_endpoint(self):
+        data = self.client.post("/api/influence/refresh/?cold=1").json()
+        self.assertEqual(data["status"], "ok")
+        self.assertEqual(data["updated"], 20)
+        self.assertIsNotNone(Paper.objects.get(pk=self.papers[0].pk).influence)
+
+
+class CoauthorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # seed: 논문 j 의 저자 = a[j], a[j + 1] → a0 - a1 - ... - a8 사슬
+        cls.categories, cls.papers = seed_papers(8)
+        cls.authors = list(Author.objects.order_by("author_id")[:10])
+        a, p = cls.authors, cls.papers
+        # a1 은 a2 와 2 편 더 (p0, p5), a3 와 1 편 더 (p0)
+        AuthorPaper.objects.bulk_create([
+            AuthorPaper(paper=p[0], author=a[2]), AuthorPaper(paper=p[0], author=a[3]),
+            AuthorPaper(paper=p[5], author=a[1]), AuthorPaper(paper=p[5], author=a[2]),
+        ])
+
+    def expected(self):
+        # self-join 으로 센 공동 저자 쌍 → 같이 쓴 논문 수
+        with connection.cursor() as cur:
+            cur.execute("""
+                SELECT x.author_id, y.author_id, COUNT(*) FROM authorpaper x
+                JOIN authorpaper y ON y.paper_id = x.paper_id AND y.author_id <> x.author_id
+                GROUP BY 1, 2
+            """)
+            return {(x, y): n for x, y, n in cur.fetchall()}
+
+    def edges(self, graph):
+        return {
+            (int(graph.authors[r]), int(graph.authors[c])): int(w) for r, c, w in zip(*graph.to_coo())
+        }
+
+    def assertSameGraph(self, graph, other):
+        for name in ("authors", "indptr", "indices", "weights"):
+            np.testing.assert_array_equal(getattr(graph, name), getattr(other, name), err_msg=name)
+        self.assertEqual((graph.last_ap_id, graph.rows), (other.last_ap_id, other.rows))
+
+    def get(self, path, params=None, graph=None):
+        with mock.patch.object(coauthor, "_graph", graph or coauthor.CoauthorGraph.from_db()):
+            return self.client.get(path, params or {})
+
+    def test_build_matches_self_join(self):
+        graph = coauthor.CoauthorGraph.from_db()
+        self.assertEqual(self.edges(graph), self.expected())
+        self.assertEqual(graph.rows, AuthorPaper.objects.count())
+
+    def ranked(self, author_id):
+        # self-join 기준 공동 저자 [(author_id, 같이 쓴 논문 수)] (많이 쓴 순, 같으면 author_id DESC)
+        pairs = [(y, n) for (x, y), n in self.expected().items() if x == author_id]
+        return sorted(pairs, key=lambda pair: (-pair[1], -pair[0]))
+
+    def test_collaborators_pages(self):
+        a = self.authors
+        expected = self.ranked(a[1].pk)
+        self.assertEqual(expected[0], (a[2].pk, 3))
+
+        first = self.get(f"/api/authors/{a[1].pk}/collaborators/", {"limit": 2}).json()
+        self.assertEqual(first["author_name"], a[1].author_name)
+        self.assertEqual([(r["author_id"], r["shared_papers"]) for r in first["results"]], expected[:2])
+        self.assertEqual(first["results"][0]["author_name"], a[2].author_name)
+
+        second = self.get(f"/api/authors/{a[1].pk}/collaborators/", {"limit": 10, "cursor": first["next"]}).json()
+        self.assertEqual([(r["author_id"], r["shared_papers"]) for r in second["results"]], expected[2:])
+        self.assertIsNone(second["next"])
+
+        self.assertEqual(self.get("/api/authors/999999/collaborators/").status_code, 404)
+
+    def test_network_hops(self):
+        a = self.authors
+        expected = self.expected()
+        one = self.get(f"/api/authors/{a[7].pk}/network/").json()
+        self.assertEqual(
+            [(n["author_id"], n["hop"], n["score"]) for n in one["nodes"]],
+            [(a[7].pk, 0, 0)] + [(aid, 1, n) for aid, n in self.ranked(a[7].pk)],
+        )
+
+        two = self.get(f"/api/authors/{a[1].pk}/network/", {"hops": 2, "limit": 2}).json()
+        hop1 = [n["author_id"] for n in two["nodes"] if n["hop"] == 1]
+        self.assertEqual(hop1, [aid for aid, _ in self.ranked(a[1].pk)[:2]])
+        # 2 hop 점수: 1 hop 저자들과 같이 쓴 논문 수 합
+        scores = {}
+        for h in hop1:
+            for aid, n in self.ranked(h):
+                if aid != a[1].pk and aid not in hop1:
+                    scores[aid] = scores.get(aid, 0) + n
+        best = sorted(scores.items(), key=lambda pair: (-pair[1], -pair[0]))[:2]
+        self.assertEqual([(n["author_id"], n["score"]) for n in two["nodes"] if n["hop"] == 2], best)
+
+        # 고른 저자들 사이의 간선 전부
+        members = {n["author_id"] for n in two["nodes"]}
+        self.assertEqual(
+            {(e["source"], e["target"], e["weight"]) for e in two["edges"]},
+            {(x, y, n) for (x, y), n in expected.items() if x < y and x in members and y in members},
+        )
+
+        # fanout: 1 hop 저자마다 가장 많이 같이 쓴 저자만 후보
+        nodes, _ = coauthor.CoauthorGraph.from_db().ego_network(a[1].pk, hops=2, k=2, fanout=1)
+        tops = {self.ranked(h)[0][0] for h in hop1}
+        self.assertTrue({aid for aid, hop, _ in nodes if hop == 2} <= tops - set(hop1) - {a[1].pk})
+
+        self.assertEqual(self.get(f"/api/authors/{a[7].pk}/network/", {"hops": 3}).status_code, 400)
+        self.assertEqual(self.get("/api/authors/999999/network/").status_code, 404)
+
+    def test_incremental_update_matches_rebuild(self):
+        graph = coauthor.CoauthorGraph.from_db()
+        self.assertIs(graph.updated(), graph)
+
+        a, p = self.authors, self.papers
+        newcomer = Author.objects.create(author_name="Newcomer", alex_author_id="A-new")
+        AuthorPaper.objects.bulk_create([
+            AuthorPaper(paper=p[7], author=newcomer), AuthorPaper(paper=p[7], author=a[1]),
+            AuthorPaper(paper=p[2], author=a[8]),
+        ])
+        updated = graph.updated()
+        self.assertIsNot(updated, graph)
+        self.assertSameGraph(updated, coauthor.CoauthorGraph.from_db())
+        self.assertEqual(self.edges(updated), self.expected())
+
+        # 삭제는 증분으로 못 맞춤 → 전체 재빌드
+        AuthorPaper.objects.filter(paper=p[0], author=a[3]).delete()
+        self.assertSameGraph(updated.updated(), coauthor.CoauthorGraph.from_db())
+
+    def test_large_papers_skipped(self):
+        graph = coauthor.CoauthorGraph.from_db()
+        rows = np.searchsorted(graph.authors, [a.pk for a in self.authors[:3]])
+        self.assertEqual(coauthor.pair_counts(np.zeros(3, np.int64), rows, len(graph), max_authors=2).nnz, 0)
+        self.assertEqual(coauthor.pair_counts(np.zeros(3, np.int64), rows, len(graph), max_authors=3).nnz, 6)
+
+    def test_snapshot_roundtrip(self):
+        graph = coauthor.CoauthorGraph.from_db()
+        path = os.path.join(tempfile.mkdtemp(), "coauthor.npz")
+        graph.save(path)
+        self.assertSameGraph(coauthor.CoauthorGraph.load(path), graph)
+
+
+class FavoriteToggleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(10)
+        cls.guest = Guest.objects.create(guestname="sync", pwd="x")
+        # papers[i] → category i % 5, 처음엔 papers[2], [3] 저장
+        GuestFavorite.objects.apply(cls.guest.pk, [(cls.papers[2].pk, "add"), (cls.papers[3].pk, "add")])
+
+    def counts(self):
+        return dict(GuestCategoryCount.objects.filter(guest=self.guest).values_list("category_id", "count"))
+
+    def bulk(self, toggles, guest_id=None):
+        return self.client.post("/api/toggle-favorite/bulk/", {
+            "guest_id": guest_id or self.guest.pk, "toggles": toggles,
+        }, content_type="application/json")
+
+    def test_toggle_is_one_statement(self):
+        p = self.papers[0]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                "/api/toggle-favorite/", {"guest_id": self.guest.pk, "paper_id": p.pk}, content_type="application/json"
+            )
+        self.assertEqual(response.json(), {"status": "added"})
+        self.assertEqual(len([q for q in ctx.captured_queries if "guestfavorite" in q["sql"]]), 1)
+        self.assertEqual(self.counts()[self.categories[0].pk], 1)
+
+        self.client.post(
+            "/api/toggle-favorite/", {"guest_id": self.guest.pk, "paper_id": p.pk}, content_type="application/json"
+        )
+        self.assertFalse(GuestFavorite.objects.filter(guest=self.guest, paper=p).exists())
+        self.assertEqual(self.counts()[self.categories[0].pk], 0)
+
+    def test_bulk_applies_in_order(self):
+        p = self.papers
+        toggles = [
+            {"paper_id": p[0].pk}, {"paper_id": p[1].pk, "favorite": True}, {"paper_id": p[2].pk, "favorite": False},
+            {"paper_id": p[3].pk}, {"paper_id": p[3].pk},
+            {"paper_id": p[4].pk}, {"paper_id": p[4].pk}, {"paper_id": p[4].pk},
+        ]
+        results = self.bulk(toggles).json()["results"]
+        self.assertEqual(results, [
+            {"paper_id": p[0].pk, "favorite": True, "status": "added"},
+            {"paper_id": p[1].pk, "favorite": True, "status": "added"},
+            {"paper_id": p[2].pk, "favorite": False, "status": "removed"},
+            {"paper_id": p[3].pk, "favorite": True, "status": "unchanged"},
+            {"paper_id": p[4].pk, "favorite": True, "status": "added"},
+        ])
+        self.assertEqual(self.counts(), {
+            self.categories[0].pk: 1, self.categories[1].pk: 1, self.categories[2].pk: 0,
+            self.categories[3].pk: 1, self.categories[4].pk: 1,
+        })
+
+        # 상태 지정(favorite) 만 있는 요청은 다시 보내도 그대로
+        replay = self.bulk(toggles[1:3]).json()["results"]
+        self.assertEqual([r["status"] for r in replay], ["unchanged", "unchanged"])
+        self.assertEqual(self.counts()[self.categories[1].pk], 1)
+
+    def test_bulk_validation(self):
+        self.assertEqual(self.bulk({"paper_id": 1}).status_code, 400)
+        self.assertEqual(self.bulk([{"paper_id": 2 ** 31}]).status_code, 400)
+        self.assertEqual(self.bulk([{"paper_id": 1}], guest_id=-2 ** 31 - 1).status_code, 400)
+        self.assertEqual(self.client.post(
+            "/api/toggle-favorite/", {"guest_id": self.guest.pk, "paper_id": 2 ** 40}, content_type="application/json"
+        ).status_code, 400)
+        self.assertEqual(self.bulk([{"paper_id": "x"}]).status_code, 400)
+        self.assertEqual(self.bulk([{"paper_id": 1, "favorite": "yes"}]).status_code, 400)
+        self.assertEqual(self.bulk([{"paper_id": 1}] * 501).status_code, 400)
+        self.assertEqual(self.client.post(
+            "/api/toggle-favorite/", {"guest_id": "x", "paper_id": 1}, content_type="application/json"
+        ).status_code, 400)
+
+        # 없는 논문이 섞이면 전체 rollback
+        response = self.bulk([{"paper_id": self.papers[0].pk}, {"paper_id": 999999}])
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(GuestFavorite.objects.filter(guest=self.guest, paper=self.papers[0]).exists())
+        self.assertEqual(self.bulk([{"paper_id": self.papers[0].pk}], guest_id=999999).status_code, 404)
+
+
+class TrendingCategoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(10)
+        cls.guest = Guest.objects.create(guestname="trend", pwd="x")
+        # 30일 전에 많이 늘었던 category 4
+        CategoryInterestDaily.objects.create(
+            category=cls.categories[4], day=timezone.now().date() - datetime.timedelta(days=30), delta=50
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def toggle(self, paper):
+        return self.client.post(
+            "/api/toggle-favorite/", {"guest_id": self.guest.pk, "paper_id": paper.pk}, content_type="application/json"
+        ).json()["status"]
+
+    def test_favorites_feed_daily_rollup(self):
+        # papers[0], [5] → category 0, papers[1] → category 1
+        for paper in (self.papers[0], self.papers[5], self.papers[1]):
+            self.assertEqual(self.toggle(paper), "added")
+        self.assertEqual(self.toggle(self.papers[1]), "removed")
+
+        counts = dict(GuestCategoryCount.objects.filter(guest=self.guest).values_list("category_id", "count"))
+        self.assertEqual(counts, {self.categories[0].pk: 2, self.categories[1].pk: 0})
+        today = dict(
+            CategoryInterestDaily.objects.filter(day=timezone.now().date()).values_list("category_id", "delta")
+        )
+        self.assertEqual(today, {self.categories[0].pk: 2, self.categories[1].pk: 0})
+
+    def test_window_and_names(self):
+        self.toggle(self.papers[0])
+        self.toggle(self.papers[2])
+        self.toggle(self.papers[7])
+
+        with self.assertNumQueries(1):
+            week = self.client.get("/api/trending-category/", {"days": 7}).json()
+        self.assertEqual(week["days"], 7)
+        self.assertEqual(week["results"][0], {
+            "category_id": self.categories[2].pk, "category_name": "Category 2", "total": 2,
+        })
+        self.assertNotIn(self.categories[4].pk, [r["category_id"] for r in week["results"]])
+
+        month = self.client.get("/api/trending-category/", {"days": 60}).json()
+        self.assertEqual(month["results"][0]["category_id"], self.categories[4].pk)
+        self.assertEqual(self.client.get("/api/trending-category/", {"days": "all"}).json()["results"], month["results"])
+
+        for days in ("0", "x", "10000"):
+            self.assertEqual(self.client.get("/api/trending-category/", {"days": days}).status_code, 400)
+
+
+class ResponseFormatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(40)
+
+    def setUp(self):
+        cache.clear()
+
+    def page(self, **headers):
+        return self.client.get("/api/advanced-search/", {"order": "cited", "limit": 40}, **headers)
+
+    def test_gzip(self):
+        plain = self.page()
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        response = self.page(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(json.loads(gzip.decompress(response.content)), plain.json())
+
+    def test_brotli_preferred(self):
+        if brotli is None:
+            self.skipTest("brotli not installed")
+        plain = self.page()
+        response = self.page(HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(json.loads(brotli.decompress(response.content)), plain.json())
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get("/api/advanced-search/", {"order": "nope"}, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_msgpack(self):
+        if msgpack is None:
+            self.skipTest("msgpack not installed")
+        plain = self.page()
+        response = self.page(HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), plain.json())
+        self.assertLess(len(response.content), len(plain.content))
+
+
+class AutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(60)
+
+    def suggest(self, **params):
+        index = autocomplete.Autocomplete.from_db()
+        with mock.patch.object(autocomplete, "_index", index):
+            response = self.client.get("/api/autocomplete/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_prefix_weighted_by_popularity(self):
+        results = self.suggest(q="Graph", type="title", limit=5)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r["text"].lower().startswith("graph") for r in results))
+        scores = [r["score"] for r in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+        best = max(
+            (p for p in self.papers if p.title.startswith("graph")),
+            key=lambda p: autocomplete.weight(p.citation, p.weekly_count),
+        )
+        self.assertEqual(results[0]["id"], best.pk)
+
+    def test_sources(self):
+        self.assertEqual({r["type"] for r in self.suggest(q="cat")}, {"category"})
+        self.assertEqual([r["text"] for r in self.suggest(q="neurips")], ["NeurIPS"])
+        # 저자는 성(마지막 단어)으로도 검색
+        authors = self.suggest(q="3 author", type="author")
+        self.assertEqual([r["text"] for r in authors], ["Author Protein 3"])
+
+    def test_snapshot_roundtrip(self):
+        index = autocomplete.Autocomplete.from_db(version=7)
+        path = os.path.join(tempfile.mkdtemp(), "autocomplete.npz")
+        index.save(path)
+        loaded = autocomplete.Autocomplete.load(path)
+        self.assertEqual(loaded.version, 7)
+        self.assertEqual(loaded.suggest("gr", 10), index.suggest("gr", 10))
+
+
+class BM25Tests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories, cls.papers = seed_papers(40)
+
+    def setUp(self):
+        cache.clear()
+        # 이전 테스트에서 rollback 된 version 이 memo 에 남아 있을 수 있음
+        caching._version = None
+        self.index = bm25.BM25Index()
+        bm25.refresh(self.index)
+        # worker 의 background refresh thread 대신 테스트에서 bm25.refresh 를 직접 호출
+        patches = [
+            mock.patch.object(bm25, "_index", self.index),
+            mock.patch.object(bm25, "_refresher", mock.Mock()),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def search(self, q, **params):
+        response = self.client.get("/api/search/", {"mode": "bm25", "q": q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [r["paper_id"] for r in response.json()["results"]]
+
+    def test_ranking_and_pages(self):
+        expected = {p.pk for p in self.papers if "graph" in p.title}
+        # title 에 두 번 나오는 논문이 먼저
+        first = self.search("graph", limit=3)
+        self.assertTrue(all(p.title.startswith("graph graph") for p in Paper.objects.filter(pk__in=first)))
+        self.assertEqual(first, [pid for pid, _ in self.index.search("graph", 3)])
+
+        for limit in (1, 3, 7):
+            with self.subTest(limit=limit):
+                seen = walk_pages(self.client, "/api/search/", {"mode": "bm25", "q": "graph", "limit": limit})
+                self.assertEqual(len(seen), len(set(seen)))
+                self.assertEqual(set(seen), expected)
+
+        self.assertEqual(self.client.get("/api/search/", {"mode": "bm25"}).status_code, 400)
+
+    def test_incremental_refresh(self):
+        # 새 논문 (abstract 없이) → 다음 refresh 에서 title 로 검색됨
+        paper = Paper.objects.create(title="Zebrafish fin regeneration", alex_paper_id="W-new")
+        bump_data_version()
+        self.assertEqual(self.search("zebrafish"), [])  # 요청 thread 는 DB 를 읽지 않음
+        self.assertEqual(bm25.refresh(self.index), 1)
+        cache.clear()
+        self.assertEqual(self.search("zebrafish"), [paper.pk])
+        self.assertEqual(self.search("caudal"), [])
+
+        # abstract 가 나중에 들어옴 (ingest 는 abstract 가 바뀐 논문의 updated_at 도 갱신)
+        Abstract.objects.create(paper=paper, context="Caudal fin blastema in adult zebrafish.")
+        Paper.objects.filter(pk=paper.pk).update(updated_at=timezone.now())
+        bump_data_version()
+        self.assertEqual(bm25.refresh(self.index), 1)
+        self.assertEqual(self.search("caudal"), [paper.pk])
+
+        # 제목 수정 → 이전 term 으로는 안 나옴, 바뀐 문서만 재색인 (나머지는 checksum 이 같아 건너뜀)
+        paper.title = "Axolotl limb regeneration"
+        paper.save()
+        self.papers[0].save()
+        bump_data_version()
+        self.assertEqual(bm25.refresh(self.index), 1)
+        self.assertEqual(self.search("axolotl"), [paper.pk])
+        self.assertEqual(self.search("fin"), [paper.pk])
+        self.assertEqual(self.search("zebrafish"), [paper.pk])  # abstract 에 남아 있음
+        self.assertEqual(len(self.index), len(self.papers) + 1)
+
+        # data_version 이 그대로면 DB 를 읽지 않음
+        with self.assertNumQueries(0):
+            self.assertEqual(bm25.refresh(self.index), 0)
+
+    def test_not_ready_without_snapshot(self):
+        # snapshot 이 없으면 첫 색인은 background thread 에서, 그동안 503
+        missing = os.path.join(tempfile.mkdtemp(), "bm25_index.pkl")
+        with mock.patch.object(bm25, "_index", None), mock.patch.object(bm25, "_refresher", None), \
+                mock.patch.object(bm25, "BM25_INDEX_PATH", missing), mock.patch.object(bm25.threading, "Thread") as thread:
+            response = self.client.get("/api/search/", {"mode": "bm25", "q": "graph"})
+            self.assertEqual(response.status_code, 503)
+            self.assertIn("error", response.json())
+            self.assertEqual(thread.call_args.kwargs["name"], "bm25-refresh")
+            thread.return_value.start.assert_called_once()
+
+            self.client.get("/api/search/", {"mode": "bm25", "q": "graph"})
+            thread.assert_called_once()
+
+    def test_snapshot_roundtrip(self):
+        path = os.path.join(tempfile.mkdtemp(), "bm25_index.pkl")
+        self.index.save(path)
+        loaded = bm25.BM25Index.load(path)
+        self.assertEqual((loaded.version, loaded.synced_at), (self.index.version, self.index.synced_at))
+        self.assertEqual(loaded.search("neural", 10), self.index.search("neural", 10))
+
+
+class SemanticTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # seed 제목 "{w1} {w2} study {i}": 번호는 한 논문에만 나와 vocab 에서 빠짐 → 단어 쌍이 같으면 같은 벡터
+        cls.categories, cls.papers = seed_papers(60)
+
+    def setUp(self):
+        cache.clear()
+        # 이전 테스트에서 rollback 된 version 이 memo 에 남아 있을 수 있음
+        caching._version = None
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.index = semantic.build_from_db(self.path, dim=8)
+        # worker 의 background refresh thread 대신 테스트에서 semantic.refresh 로 교체
+        patcher = mock.patch.object(semantic, "_index", self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use(self, index):
+        semantic._index = index
+        cache.clear()
+
+    def words(self, row):
+        return set(row["title"].split()[:2])
+
+    def test_similar_pages(self):
+        paper = self.papers[1]
+        first = self.client.get(f"/api/similar/{paper.pk}/", {"limit": 3}).json()
+        self.assertEqual(self.words(first["results"][0]), {"neural", "protein"})
+        hits = semantic.similar(paper.pk, 3)
+        self.assertEqual([r["paper_id"] for r in first["results"]], [pid for pid, _ in hits])
+        self.assertAlmostEqual(hits[0][1], 1, places=5)
+
+        for limit in (1, 7):
+            with self.subTest(limit=limit):
+                seen = walk_pages(self.client, f"/api/similar/{paper.pk}/", {"limit": limit})
+                self.assertEqual(len(seen), len(set(seen)))
+                self.assertNotIn(paper.pk, seen)
+                self.assertEqual(len(seen), len(self.papers) - 1)
+
+        self.assertEqual(self.client.get("/api/similar/999999/").status_code, 404)
+
+    def test_search_mode(self):
+        response = self.client.get("/api/search/", {"mode": "semantic", "q": "neural protein", "limit": 5})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(self.words(r) == {"neural", "protein"} for r in results))
+        self.assertEqual(self.client.get("/api/search/", {"mode": "semantic"}).status_code, 400)
+
+    def test_fold_in_new_paper(self):
+        self.assertEqual(self.client.get("/api/similar/999999/").status_code, 404)
+        paper = Paper.objects.create(title="protein neural study", alex_paper_id="W-new")
+        Abstract.objects.create(paper=paper, context="We study protein neural study with a new method.")
+        bump_data_version()
+
+        # 요청 thread 는 DB 를 읽지 않음 → refresh 가 학습된 모델로 임베딩해 파일 끝에 추가 (재학습 없음)
+        self.assertEqual(self.client.get(f"/api/similar/{paper.pk}/").status_code, 404)
+        index = semantic.refresh(self.index)
+        self.use(index)
+        response = self.client.get(f"/api/similar/{paper.pk}/", {"limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.words(response.json()["results"][0]), {"neural", "protein"})
+        self.assertEqual(len(index), len(self.papers) + 1)
+        self.assertEqual(len(self.index), len(self.papers))  # 이전 객체는 그대로 (교체 방식)
+        self.assertEqual(len(semantic.SemanticIndex(self.path)), len(self.papers) + 1)
+
+        # data_version 이 그대로면 DB 를 읽지 않음
+        with self.assertNumQueries(0):
+            self.assertIs(semantic.refresh(index), index)
+
+    def test_reembed_changed_paper(self):
+        # abstract 없이 들어온 논문 → title 만으로 임베딩
+        paper = Paper.objects.create(title="causal transformer study", alex_paper_id="W-new")
+        bump_data_version()
+        index = semantic.refresh(self.index)
+        before = index.vector(paper.pk)
+        self.assertEqual(index.n_rows, len(self.papers) + 1)
+
+        # abstract 가 나중에 들어옴 (ingest 는 abstract 가 바뀐 논문의 updated_at 도 갱신) → 새 행, 이전 행은 tombstone
+        Abstract.objects.create(paper=paper, context="We study causal transformer study with a new method.")
+        Paper.objects.filter(pk=paper.pk).update(updated_at=timezone.now())
+        bump_data_version()
+        index = semantic.refresh(index)
+        self.assertEqual(index.n_rows, len(self.papers) + 2)
+        self.assertEqual(len(index), len(self.papers) + 1)
+        self.assertFalse(np.allclose(index.vector(paper.pk), before))
+
+        # 제목 수정 → 바뀐 논문만 재임베딩 (updated_at 만 바뀐 논문은 checksum 이 같아 건너뜀)
+        paper.title = "protein neural study"
+        paper.save()
+        self.papers[0].save()
+        bump_data_version()
+        index = semantic.refresh(index)
+        self.assertEqual(index.n_rows, len(self.papers) + 3)
+        self.use(index)
+        response = self.client.get(f"/api/similar/{paper.pk}/", {"limit": 1})
+        self.assertEqual(self.words(response.json()["results"][0]), {"neural", "protein"})
+        hits = walk_pages(self.client, f"/api/similar/{self.papers[1].pk}/", {"limit": 7})
+        self.assertEqual(len(hits), len(set(hits)))
+        self.assertEqual(len(hits), len(self.papers))
+
+        # 다른 worker 는 state.json 의 version 을 보고 다시 반영하지 않음
+        other = semantic.SemanticIndex(self.path)
+        self.assertEqual(other.version, index.version)
+        with self.assertNumQueries(0):
+            self.assertEqual(semantic.refresh(other).n_rows, index.n_rows)
 
-# Create your tests here.
+    def test_not_built(self):
+        empty = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, empty)
+        with mock.patch.object(semantic, "_index", None), mock.patch.object(semantic, "SEMANTIC_INDEX_DIR", empty):
+            response = self.client.get(f"/api/similar/{self.papers[0].pk}/")
+            self.assertEqual(response.status_code, 503)
+            self.assertIn("error", response.json())
+            response = self.client.get("/api/search/", {"mode": "semantic", "q": "graph"})
+            self.assertEqual(response.status_code, 503)
@@ -1,14 +1,26 @@
 from django.urls import path
 from .views import (
-    search_papers, advanced_search, paper_detail,
+    search_papers, autocomplete_suggest, advanced_search, advanced_search_export, advanced_search_facets,
+    paper_detail, paper_detail_batch, similar_papers, also_saved_papers, author_collaborators, author_network,
     weekly_popular_papers, trending_categories,
-    recommend_by_guest, guest_favorites, toggle_favorite, reset_weekly
+    recommend_by_guest, guest_favorites, toggle_favorite, toggle_favorites_bulk, roll_popularity, refresh_influence,
+    result_cache_stats,
 )
 
 urlpatterns = [
     path("search/", search_papers),
+    path("autocomplete/", autocomplete_suggest),
     path("advanced-search/", advanced_search),
+    path("advanced-search/export/", advanced_search_export),
+    path("advanced-search/facets/", advanced_search_facets),
+    path("detail/", paper_detail_batch),
     path("detail/<int:pid>/", paper_detail),
+    path("similar/<int:pid>/", similar_papers),
+    path("also-saved/<int:pid>/", also_saved_papers),
+
+    # 공동 저자
+    path("authors/<int:author_id>/collaborators/", author_collaborators),
+    path("authors/<int:author_id>/network/", author_network),
 
     # 인기
     path("popular-weekly/", weekly_popular_papers),
@@ -20,7 +32,15 @@ urlpatterns = [
     # 즐겨찾기
     path("favorites/<int:guest_id>/", guest_favorites),
     path("toggle-favorite/", toggle_favorite),
+    path("toggle-favorite/bulk/", toggle_favorites_bulk),
     
-    # weekly_count 초기화
-    path("reset-weekly/", reset_weekly),
+    # 인기도 7일 창 이동 (cron 매시간), reset-weekly 는 예전 cron 설정 호환용
+    path("popular/roll/", roll_popularity),
+    path("reset-weekly/", roll_popularity),
+
+    # 인용 그래프 influence 재계산 (cron 매일)
+    path("influence/refresh/", refresh_influence),
+
+    # 결과 캐시 통계
+    path("cache-stats/", result_cache_stats),
 ]
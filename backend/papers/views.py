@@ -1,173 +1,692 @@
-from datetime import datetime
-from django.db.models import Q, Count
-from rest_framework.decorators import api_view
+import functools
+from contextlib import nullcontext
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
-from .models import Paper
 
-
-from .models import (
-    Paper, Category, Guest, GuestFavorite, GuestCategoryCount
-)
+from .models import Author, Paper, CategoryInterestDaily, Guest, GuestFavorite
 from .serializers import (
-    PaperSerializer, PaperDetailSerializer, GuestFavoriteSerializer
+    GUEST_FAVORITE_ROWS, PAPER_ROWS, PaperDetailSerializer, parse_fields
+)
+from .renderers import FAST_RENDERERS
+from .caching import (
+    cache_stats, cached_view, conditional_view, data_version,
+    list_etag, make_etag, representation,
 )
+from .export import stream_csv, stream_ndjson
+from .facets import get_facets
+from .filters import filter_papers, parse_filters
+from .pagination import ORDER_FIELDS, InvalidPage, keyset_paginate, ranked_paginate
+from .services import autocomplete, bm25, coauthor, influence, itemcf, popularity, recommend, semantic, viewcounter
+from .search import (
+    FUZZY_THRESHOLD, contains_search, fulltext_search, fuzzy_search, trigram_threshold
+)
+
+# ?fields= 로 고를 수 있는 상세 필드
+DETAIL_FIELDS = tuple(PaperDetailSerializer().fields)
+
+# guestcategorycount 는 즐겨찾기마다 바뀌고 data version 을 올리지 않으므로 짧게
+TRENDING_CACHE_TIMEOUT = 60
+# weekly_count 도 조회수 flush(services/viewcounter.py)마다 바뀜 → 같은 이유로 짧게
+POPULAR_CACHE_TIMEOUT = 60
+
+# Cache-Control max-age (브라우저 / CDN), 지나면 ETag 로 재검증
+DETAIL_MAX_AGE = getattr(settings, "DETAIL_MAX_AGE", 300)
+LIST_MAX_AGE = getattr(settings, "LIST_MAX_AGE", 60)
+
+
+# advanced_search / export 의 정렬 옵션 (relevance 는 검색어가 있을 때만이라 search_papers 에서만)
+ADVANCED_ORDERS = ("latest", "cited", "influence")
+
+
+def sparse_paper_rows(request):
+    # ?fields=title,citation → 그 필드만 SELECT / 출력하는 RowSerializer (없으면 전체)
+    return PAPER_ROWS.only(parse_fields(request.GET.get("fields"), PAPER_ROWS.fields))
+
+
+def ranked_papers(hits, paper_rows=PAPER_ROWS):
+    # 메모리 검색 엔진 결과 [(paper_id, score)] → 같은 순서의 PaperSerializer 형태 dict 목록
+    rows = paper_rows.values(Paper.objects.filter(pk__in=[pid for pid, _ in hits]))
+    found = {row["paper_id"]: row for row in paper_rows.to_dicts(rows)}
+    return [found[pid] for pid, _ in hits if pid in found]
+
 
 # --------------------------------------------------------
 # 📌 1. 일반 검색 + 기준 검색 (최신순, 인용순)
 # --------------------------------------------------------
 @api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+@cached_view("search")
 def search_papers(request):
     keyword = request.GET.get("q", "")
-    limit = int(request.GET.get("limit", 10))
+    try:
+        paper_rows = sparse_paper_rows(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+
+    # 검색 모드: fulltext(기본, tsvector) / fuzzy(pg_trgm, 오타 허용) / contains(기존 ILIKE)
+    #           bm25(worker 메모리 인덱스), semantic(임베딩 유사도) → 둘 다 관련도순 고정
+    mode = request.GET.get("mode", "fulltext")
+    if mode == "bm25":
+        if not keyword:
+            return Response({"error": "q is required for bm25 mode"}, status=400)
+        try:
+            hits, next_cursor = ranked_paginate(
+                request, lambda k, after: bm25.search(keyword, k, after), "bm25", default_size=10
+            )
+        except InvalidPage as e:
+            return Response({"error": str(e)}, status=400)
+        except bm25.IndexNotReady as e:
+            return Response({"error": str(e)}, status=503)
+        return Response({"results": ranked_papers(hits, paper_rows), "next": next_cursor})
+    if mode == "semantic":
+        if not keyword:
+            return Response({"error": "q is required for semantic mode"}, status=400)
+        try:
+            hits, next_cursor = ranked_paginate(
+                request, lambda k, after: semantic.search(keyword, k, after), "semantic", default_size=10
+            )
+        except InvalidPage as e:
+            return Response({"error": str(e)}, status=400)
+        except semantic.IndexNotBuilt as e:
+            return Response({"error": str(e)}, status=503)
+        return Response({"results": ranked_papers(hits, paper_rows), "next": next_cursor})
 
-    # 기본 필터
-    qs = Paper.objects.filter(
-        Q(title__icontains=keyword) |
-        Q(submit__icontains=keyword)
-    )
+    qs = Paper.objects.all()
+    if mode == "contains":
+        qs = contains_search(qs, keyword)
+    elif mode == "fulltext":
+        if keyword:
+            qs = fulltext_search(qs, keyword)
+    elif mode == "fuzzy":
+        if not keyword:
+            return Response({"error": "q is required for fuzzy mode"}, status=400)
+        try:
+            threshold = float(request.GET.get("threshold", FUZZY_THRESHOLD))
+        except ValueError:
+            return Response({"error": "threshold must be a number"}, status=400)
+        if not 0 <= threshold <= 1:
+            return Response({"error": "threshold must be between 0 and 1"}, status=400)
+        qs = fuzzy_search(qs, keyword)
+    else:
+        return Response({"error": f"Unknown mode: {mode}"}, status=400)
+
+    # 정렬 옵션 (fuzzy 는 유사도순이 기본)
+    order = request.GET.get("order", "relevance" if mode == "fuzzy" else "latest")
+    if order == "relevance" and "rank" not in qs.query.annotations:
+        order = "latest"
+    if order not in ORDER_FIELDS:
+        return Response({"error": f"Unknown order: {order}"}, status=400)
+
+    # fuzzy 는 임계값 설정과 같은 트랜잭션 안에서 평가해야 함
+    scope = trigram_threshold(threshold) if mode == "fuzzy" else nullcontext()
+    try:
+        with scope:
+            rows, next_cursor = keyset_paginate(
+                request, qs, ORDER_FIELDS[order], order, default_size=10, columns=paper_rows.columns
+            )
+    except InvalidPage as e:
+        return Response({"error": str(e)}, status=400)
 
-    # 정렬 옵션
-    order = request.GET.get("order", "latest")  
-    if order == "latest":
-        qs = qs.order_by("-announcement_date")
-    elif order == "cited":
-        qs = qs.order_by("-citation")
+    return Response({"results": paper_rows.to_dicts(rows), "next": next_cursor})
 
-    qs = qs[:limit]
 
-    return Response(PaperSerializer(qs, many=True).data)
+# --------------------------------------------------------
+# 📌 1-1. 검색창 자동완성 (제목 / 저자 / 카테고리 / 학회 접두어, worker 메모리)
+# --------------------------------------------------------
+@api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+def autocomplete_suggest(request):
+    prefix = request.GET.get("q", "")
+    kind = request.GET.get("type")
+    if kind is not None and kind not in autocomplete.KINDS:
+        return Response({"error": f"Unknown type: {kind}"}, status=400)
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), 20))
+    except ValueError:
+        return Response({"error": "Invalid limit"}, status=400)
+
+    kind_no = autocomplete.KINDS.index(kind) if kind else None
+    return Response({"results": autocomplete.suggest(prefix, limit, kind_no)})
 
 
 # --------------------------------------------------------
 # 📌 2. 상세 검색
 # --------------------------------------------------------
 @api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+@cached_view("advanced_search")
 def advanced_search(request):
-    qs = Paper.objects.all()
-
-    # 기간 조건
-    start = request.GET.get("start")
-    end = request.GET.get("end")
-    if start:
-        qs = qs.filter(announcement_date__gte=start)
-    if end:
-        qs = qs.filter(announcement_date__lte=end)
-
-    # category 조건
-    category_id = request.GET.get("category_id")
-    if category_id:
-        qs = qs.filter(category_id=category_id)
-
-    # 기관 국가코드
-    country = request.GET.get("country")
-    if country:
-        qs = qs.filter(institution__country_code=country)
-
-    # 오픈액세스
-    oa = request.GET.get("open_access")
-    if oa in ["true", "True", "1"]:
-        qs = qs.filter(open_access=True)
+    try:
+        paper_rows = sparse_paper_rows(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    try:
+        qs = filter_papers(Paper.objects.all(), request.GET)
+    except ValueError:
+        return Response({"error": "Invalid filter value"}, status=400)
 
     # 정렬 옵션
     order = request.GET.get("order", "latest")
-    if order == "latest":
-        qs = qs.order_by("-announcement_date")
-    elif order == "cited":
-        qs = qs.order_by("-citation")
+    if order not in ADVANCED_ORDERS:
+        return Response({"error": f"Unknown order: {order}"}, status=400)
+
+    try:
+        rows, next_cursor = keyset_paginate(request, qs, ORDER_FIELDS[order], order, columns=paper_rows.columns)
+    except InvalidPage as e:
+        return Response({"error": str(e)}, status=400)
 
-    return Response(PaperSerializer(qs, many=True).data)
+    return Response({"results": paper_rows.to_dicts(rows), "next": next_cursor})
+
+
+# --------------------------------------------------------
+# 📌 2-1. 상세 검색 결과 전체 내보내기 (NDJSON / CSV streaming)
+# --------------------------------------------------------
+@api_view(["GET"])
+def advanced_search_export(request):
+    try:
+        qs = filter_papers(Paper.objects.all(), request.GET)
+    except ValueError:
+        return Response({"error": "Invalid filter value"}, status=400)
+
+    order = request.GET.get("order", "latest")
+    if order not in ADVANCED_ORDERS:
+        return Response({"error": f"Unknown order: {order}"}, status=400)
+    qs = qs.order_by(F(ORDER_FIELDS[order]).desc(nulls_last=True), "-pk")
+
+    # format 은 DRF 가 선점하는 query 파라미터라 fmt 로 받음
+    fmt = request.GET.get("fmt", "ndjson")
+    if fmt == "ndjson":
+        response = StreamingHttpResponse(stream_ndjson(qs), content_type="application/x-ndjson")
+    elif fmt == "csv":
+        response = StreamingHttpResponse(stream_csv(qs), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = 'attachment; filename="papers.csv"'
+    else:
+        return Response({"error": f"Unknown fmt: {fmt}"}, status=400)
+    return response
+
+
+# --------------------------------------------------------
+# 📌 2-2. 상세 검색 사이드바 facet 집계 (category / country / year / open_access)
+# --------------------------------------------------------
+@api_view(["GET"])
+def advanced_search_facets(request):
+    try:
+        filters = parse_filters(request.GET)
+    except ValueError:
+        return Response({"error": "Invalid filter value"}, status=400)
+
+    return Response(get_facets(filters))
 
 
 # --------------------------------------------------------
 # 📌 3. 논문 상세 API
+#   ETag / Last-Modified 는 paper.updated_at
+#   조건부 요청이면 pk 조회 1번으로 먼저 비교 → 안 바뀌었으면 상세 쿼리 없이 304
 # --------------------------------------------------------
+def paper_updated_at(request, pid):
+    # etag / last_modified 함수가 같은 요청에서 한 번만 조회하도록 request 에 저장 (view 가 읽은 값도 여기로)
+    if not hasattr(request, "_paper_updated_at"):
+        request._paper_updated_at = Paper.objects.filter(pk=pid).values_list("updated_at", flat=True).first()
+    return request._paper_updated_at
+
+
+def paper_detail_etag(request, pid):
+    updated_at = paper_updated_at(request, pid)
+    if updated_at is None:
+        return None
+    return make_etag("paper_detail", pid, updated_at.timestamp(), *representation(request))
+
+
+def counted_view(view):
+    # 조회수는 conditional_view 바깥에서 셈 → 304 재검증도 조회 1번
+    #   (200 / 304 는 논문이 있을 때만, 메모리에 모았다가 주기적으로 weekly_count 에 반영)
+    @functools.wraps(view)
+    def wrapper(request, pid, *args, **kwargs):
+        response = view(request, pid, *args, **kwargs)
+        if response.status_code in (200, 304):
+            viewcounter.record(pid)
+        return response
+    return wrapper
+
+
+# CDN / 공유 캐시가 응답하면 조회수가 빠지므로 private (브라우저 캐시만)
+@counted_view
+@conditional_view(paper_detail_etag, paper_updated_at, max_age=DETAIL_MAX_AGE, public=False)
 @api_view(["GET"])
 def paper_detail(request, pid):
     try:
-        paper = Paper.objects.get(pk=pid)
+        fields = parse_fields(request.GET.get("fields"), DETAIL_FIELDS)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+
+    try:
+        paper = Paper.objects.with_detail(fields).get(pk=pid)
     except Paper.DoesNotExist:
         return Response({"error": "Paper not found"}, status=404)
 
-    return Response(PaperDetailSerializer(paper).data)
+    request._request._paper_updated_at = paper.updated_at
+    return Response(PaperDetailSerializer(paper, fields=fields).data)
+
+
+# --------------------------------------------------------
+# 📌 3-0. 논문 상세 일괄 조회 (카드 목록용)
+#   GET /detail/?ids=3,1,2  또는  POST {"ids": [3, 1, 2]}
+#   id 개수와 상관없이 쿼리 2번 (with_detail), 요청한 순서대로 반환
+# --------------------------------------------------------
+BATCH_DETAIL_MAX = getattr(settings, "BATCH_DETAIL_MAX", 200)
+
+
+def parse_ids(raw):
+    if isinstance(raw, str):
+        raw = [part for part in raw.split(",") if part.strip()]
+    if not isinstance(raw, (list, tuple)):
+        raise ValueError("ids must be a list")
+    ids = []
+    for value in raw:
+        if isinstance(value, bool):
+            raise ValueError("ids must be integers")
+        ids.append(int(value))
+    # 중복 제거 (첫 등장 순서 유지)
+    return list(dict.fromkeys(ids))
+
+
+@api_view(["GET", "POST"])
+@renderer_classes(FAST_RENDERERS)
+def paper_detail_batch(request):
+    if request.method == "POST":
+        # {"ids": [...]} 또는 [...] 그대로
+        raw = request.data.get("ids", []) if hasattr(request.data, "get") else request.data
+    else:
+        raw = ",".join(request.GET.getlist("ids"))
+    try:
+        ids = parse_ids(raw)
+    except (TypeError, ValueError):
+        return Response({"error": "ids must be a comma separated list of integers"}, status=400)
+    if not ids:
+        return Response({"error": "ids is required"}, status=400)
+    if len(ids) > BATCH_DETAIL_MAX:
+        return Response({"error": f"At most {BATCH_DETAIL_MAX} ids per request"}, status=400)
+    try:
+        fields = parse_fields(request.GET.get("fields"), DETAIL_FIELDS)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+
+    found = {p.pk: p for p in Paper.objects.with_detail(fields).filter(pk__in=ids)}
+    papers = [found[pid] for pid in ids if pid in found]
+    return Response({
+        "results": PaperDetailSerializer(papers, many=True, fields=fields).data,
+        "missing": [pid for pid in ids if pid not in found],
+    })
+
+
+# --------------------------------------------------------
+# 📌 3-1. 비슷한 논문 (semantic 임베딩 최근접 이웃)
+# --------------------------------------------------------
+@api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+def similar_papers(request, pid):
+    try:
+        paper_rows = sparse_paper_rows(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    try:
+        hits, next_cursor = ranked_paginate(
+            request, lambda k, after: semantic.similar(pid, k, after), "similar", default_size=10
+        )
+    except InvalidPage as e:
+        return Response({"error": str(e)}, status=400)
+    except semantic.IndexNotBuilt as e:
+        return Response({"error": str(e)}, status=503)
+    except semantic.NotIndexed:
+        # 없는 논문이거나 아직 임베딩 전 (다음 refresh 에서 반영)
+        return Response({"error": "Paper not found"}, status=404)
+
+    return Response({"results": ranked_papers(hits, paper_rows), "next": next_cursor})
+
+
+# --------------------------------------------------------
+# 📌 3-2. 같이 저장한 논문 ("이 논문을 저장한 사람들이 같이 저장한")
+#   즐겨찾기 공동 저장 cosine 상위 이웃 (paper_neighbor, services/itemcf.py)
+#   상세 응답의 ETag 는 paper.updated_at 기준이라 이웃 목록은 상세와 따로 둠
+# --------------------------------------------------------
+@api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+def also_saved_papers(request, pid):
+    try:
+        paper_rows = sparse_paper_rows(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    try:
+        hits, next_cursor = ranked_paginate(
+            request, lambda k, after: itemcf.also_saved(pid, k, after), "also_saved", default_size=10
+        )
+    except InvalidPage as e:
+        return Response({"error": str(e)}, status=400)
+
+    return Response({"results": ranked_papers(hits, paper_rows), "next": next_cursor})
+
+
+# --------------------------------------------------------
+# 📌 3-3. 공동 저자 (같이 쓴 논문 수 순)
+#   authorpaper 로 미리 만든 CSR 인접 배열 (worker 메모리, services/coauthor.py)
+#   새 authorpaper 행은 data version 이 바뀐 뒤 background 증분 갱신에서 반영
+# --------------------------------------------------------
+COAUTHOR_NETWORK_MAX = getattr(settings, "COAUTHOR_NETWORK_MAX", 50)
+
+
+def author_names(author_ids):
+    return dict(Author.objects.filter(pk__in=author_ids).values_list("author_id", "author_name"))
+
+
+@api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+def author_collaborators(request, author_id):
+    try:
+        hits, next_cursor = ranked_paginate(
+            request, lambda k, after: coauthor.collaborators(author_id, k, after), "collaborators"
+        )
+    except InvalidPage as e:
+        return Response({"error": str(e)}, status=400)
+
+    names = author_names([author_id] + [aid for aid, _ in hits])
+    if author_id not in names:
+        return Response({"error": "Author not found"}, status=404)
+
+    return Response({
+        "author_id": author_id,
+        "author_name": names[author_id],
+        "results": [
+            {"author_id": aid, "author_name": names.get(aid), "shared_papers": shared} for aid, shared in hits
+        ],
+        "next": next_cursor,
+    })
+
+
+# --------------------------------------------------------
+# 📌 3-4. 공동 저자 ego network (1~2 hop)
+#   ?hops=1: 같이 쓴 논문 수 상위 limit 명, ?hops=2: 그 사람들의 공동 저자 중 상위 limit 명 추가
+#   nodes 의 score: 1 hop 은 ego 와 같이 쓴 논문 수, 2 hop 은 1 hop 저자들과 같이 쓴 논문 수 합
+#   edges: 고른 저자들 사이의 간선 전부 (source < target)
+# --------------------------------------------------------
+@api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+def author_network(request, author_id):
+    try:
+        hops = int(request.GET.get("hops", 1))
+        limit = max(1, min(int(request.GET.get("limit", 20)), COAUTHOR_NETWORK_MAX))
+    except ValueError:
+        return Response({"error": "hops and limit must be integers"}, status=400)
+    if hops not in (1, 2):
+        return Response({"error": "hops must be 1 or 2"}, status=400)
+
+    nodes, edges = coauthor.ego_network(author_id, hops, limit)
+    names = author_names([aid for aid, _, _ in nodes])
+    if author_id not in names:
+        return Response({"error": "Author not found"}, status=404)
+
+    return Response({
+        "nodes": [
+            {"author_id": aid, "author_name": names.get(aid), "hop": hop, "score": score}
+            for aid, hop, score in nodes
+        ],
+        "edges": [{"source": a, "target": b, "weight": w} for a, b, w in edges],
+    })
 
 
 # --------------------------------------------------------
 # 📌 4. 주간 인기 논문
+#   순위는 매시간 roll 때 계산해 둔 popular_paper (상위 POPULAR_TOP_K), 값(weekly_count 등)은 paper 에서
+#   popular_paper 가 비어 있으면 (첫 roll 전) weekly_count 인덱스로 직접
 # --------------------------------------------------------
+# weekly_count 가 version 과 무관하게 바뀌므로 Last-Modified 없이 ETag 만
+@conditional_view(list_etag("popular_weekly", bucket=POPULAR_CACHE_TIMEOUT), max_age=LIST_MAX_AGE)
 @api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+@cached_view("popular_weekly", timeout=POPULAR_CACHE_TIMEOUT)
 def weekly_popular_papers(request):
-    limit = int(request.GET.get("limit", 10))
-    qs = Paper.objects.order_by("-weekly_count")[:limit]
-    return Response(PaperSerializer(qs, many=True).data)
+    try:
+        paper_rows = sparse_paper_rows(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), popularity.POPULAR_TOP_K))
+    except ValueError:
+        return Response({"error": "Invalid limit"}, status=400)
+
+    rows = paper_rows.values(Paper.objects.filter(popular__rank__lte=limit).order_by("popular__rank"))
+    if not rows:
+        rows = paper_rows.values(Paper.objects.order_by("-weekly_count", "-pk")[:limit])
+    return Response(paper_rows.to_dicts(rows))
 
 
 # --------------------------------------------------------
-# 📌 5. 전체 인기 Category (트렌드)
+# 📌 5. 인기 Category (트렌드)
+#   ?days=7 (기본): 최근 N일 동안 늘어난 관심 (category_interest_daily 의 day 범위 합, 카테고리 수 × N 행)
+#   ?days=all: 전체 누적 (= guestcategorycount 합)
+#   결과 캐시와 같은 주기로 ETag 도 바뀜 (최대 그 시간만큼 늦게 반영)
 # --------------------------------------------------------
+TRENDING_MAX_DAYS = getattr(settings, "TRENDING_MAX_DAYS", 365)
+
+
+@conditional_view(
+    list_etag("trending_category", bucket=TRENDING_CACHE_TIMEOUT), max_age=TRENDING_CACHE_TIMEOUT
+)
 @api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
+@cached_view("trending_category", timeout=TRENDING_CACHE_TIMEOUT)
 def trending_categories(request):
-    qs = (
-        GuestCategoryCount.objects
-        .values("category_id")
-        .annotate(total=Sum("count"))
-        .order_by("-total")
+    days = request.GET.get("days", "7")
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 20)), 100))
+        days = None if days == "all" else int(days)
+    except ValueError:
+        return Response({"error": "days must be an integer or 'all'"}, status=400)
+    if days is not None and not 1 <= days <= TRENDING_MAX_DAYS:
+        return Response({"error": f"days must be between 1 and {TRENDING_MAX_DAYS}"}, status=400)
+
+    qs = CategoryInterestDaily.objects.all()
+    if days is not None:
+        # 오늘 포함 N일 (rollup 트리거와 같은 UTC 날짜)
+        qs = qs.filter(day__gt=timezone.now().date() - timedelta(days=days))
+    rows = (
+        qs.values("category_id")
+        .annotate(total=Sum("delta"))
+        .filter(total__gt=0)
+        .order_by("-total", "category_id")
+        .values_list("category_id", "category__category_name", "total")[:limit]
     )
-
-    return Response(qs)
+    return Response({
+        "days": days if days is not None else "all",
+        "results": [
+            {"category_id": cid, "category_name": name, "total": total} for cid, name, total in rows
+        ],
+    })
 
 
 # --------------------------------------------------------
 # 📌 6. Guest 관심주제 기반 추천
+#   interest_1..3 + 즐겨찾기 카테고리 count 로 카테고리 가중치 → 카테고리별 미리 계산한 후보
+#   (recommend_candidate) 를 합친 상위 목록, 최근 즐겨찾기의 "같이 저장한 논문" 은 가산점
+#   이미 즐겨찾기한 논문 제외 (services/recommend.py)
+#   cursor 페이지도 카테고리당 RECOMMEND_CANDIDATES 편 안에서 끝남
 # --------------------------------------------------------
 @api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
 def recommend_by_guest(request, guest_id):
     try:
-        guest = Guest.objects.get(pk=guest_id)
+        paper_rows = sparse_paper_rows(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    try:
+        guest = Guest.objects.only("interest_1", "interest_2", "interest_3").get(pk=guest_id)
     except Guest.DoesNotExist:
         return Response({"error": "Guest not found"}, status=404)
 
-    interest_ids = []
-    for field in ["interest_1", "interest_2", "interest_3"]:
-        cid = getattr(guest, field, None)
-        if cid:
-            interest_ids.append(cid)
-
-    qs = Paper.objects.filter(category_id__in=interest_ids)
+    weights = recommend.guest_weights(guest)
+    try:
+        hits, next_cursor = ranked_paginate(
+            request, lambda k, after: recommend.recommend(guest.pk, weights, k, after), "recommend"
+        )
+    except InvalidPage as e:
+        return Response({"error": str(e)}, status=400)
 
-    return Response(PaperSerializer(qs, many=True).data)
+    return Response({"results": ranked_papers(hits, paper_rows), "next": next_cursor})
 
 
 # --------------------------------------------------------
 # 📌 7. Guest 즐겨찾기 목록
+#   기본: 최근 추가순 (favorite_id DESC) keyset 페이지, paper 는 JOIN 한 번으로 같이 읽음
+#   ?mode=ids: 즐겨찾기한 paper_id 전체 (카드 목록에 ♥ 표시용, 페이지 없음)
+#              &paper_ids=1,2,3 이면 그중 즐겨찾기한 것만 → (guest_id, paper_id) unique 인덱스만 읽음
 # --------------------------------------------------------
 @api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
 def guest_favorites(request, guest_id):
     favs = GuestFavorite.objects.filter(guest_id=guest_id)
-    return Response(GuestFavoriteSerializer(favs, many=True).data)
+
+    mode = request.GET.get("mode", "page")
+    if mode == "ids":
+        if "paper_ids" in request.GET:
+            try:
+                paper_ids = parse_ids(request.GET["paper_ids"])
+            except ValueError:
+                return Response({"error": "paper_ids must be a comma separated list of integers"}, status=400)
+            if len(paper_ids) > BATCH_DETAIL_MAX:
+                return Response({"error": f"At most {BATCH_DETAIL_MAX} paper_ids per request"}, status=400)
+            favs = favs.filter(paper_id__in=paper_ids)
+        return Response({"paper_ids": list(favs.order_by("paper_id").values_list("paper_id", flat=True))})
+    if mode != "page":
+        return Response({"error": f"Unknown mode: {mode}"}, status=400)
+
+    try:
+        rows, next_cursor = keyset_paginate(request, favs, columns=GUEST_FAVORITE_ROWS.columns)
+    except InvalidPage as e:
+        return Response({"error": str(e)}, status=400)
+
+    return Response({"results": GUEST_FAVORITE_ROWS.to_dicts(rows), "next": next_cursor})
 
 
 # --------------------------------------------------------
 # 📌 8. 즐겨찾기 추가/삭제
+#   SQL 한 문장: 즐겨찾기 DELETE / INSERT + guestcategorycount ±1 (GuestFavoriteManager.apply)
+#   같은 guest 의 요청은 guest 행 lock 순서대로 → 빠르게 두 번 눌러도 added → removed (또는 반대)
 # --------------------------------------------------------
+BULK_FAVORITE_MAX = getattr(settings, "BULK_FAVORITE_MAX", 500)
+INT4_MIN, INT4_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def parse_int(value):
+    # bool 은 int 의 subclass 라 따로 거름, id 컬럼이 INTEGER 라 범위 밖이면 SQL 에서 DataError
+    if isinstance(value, bool):
+        raise ValueError
+    value = int(value)
+    if not INT4_MIN <= value <= INT4_MAX:
+        raise ValueError
+    return value
+
+
 @api_view(["POST"])
 def toggle_favorite(request):
-    guest_id = request.data.get("guest_id")
-    paper_id = request.data.get("paper_id")
+    try:
+        guest_id = parse_int(request.data.get("guest_id"))
+        paper_id = parse_int(request.data.get("paper_id"))
+    except (TypeError, ValueError):
+        return Response({"error": "guest_id and paper_id must be integers"}, status=400)
+
+    try:
+        [(_, _, status)] = GuestFavorite.objects.apply(guest_id, [(paper_id, "toggle")])
+    except IntegrityError:
+        return Response({"error": "Guest or paper not found"}, status=404)
+    return Response({"status": status})
+
+
+# --------------------------------------------------------
+# 📌 8-0. 즐겨찾기 일괄 반영 (frontend offline sync)
+#   {"guest_id": 1, "toggles": [{"paper_id": 3}, {"paper_id": 5, "favorite": true}, ...]}
+#   favorite 가 없으면 toggle, 있으면 그 상태로 (다시 보내도 결과가 같음)
+#   같은 논문이 여러 번 나오면 순서대로 적용한 결과, 전체가 한 문장 / 한 transaction
+#   응답: 논문마다 {"paper_id", "favorite": 지금 상태, "status": added / removed / unchanged}
+# --------------------------------------------------------
+def parse_favorite_ops(raw):
+    if not isinstance(raw, list):
+        raise ValueError("toggles must be a list")
+    if len(raw) > BULK_FAVORITE_MAX:
+        raise ValueError(f"At most {BULK_FAVORITE_MAX} toggles per request")
+    ops = []
+    for item in raw:
+        if not isinstance(item, dict):
+            raise ValueError("Each toggle must be an object")
+        try:
+            paper_id = parse_int(item.get("paper_id"))
+        except (TypeError, ValueError):
+            raise ValueError("paper_id must be an integer")
+        favorite = item.get("favorite")
+        if favorite is None:
+            ops.append((paper_id, "toggle"))
+        elif isinstance(favorite, bool):
+            ops.append((paper_id, "add" if favorite else "remove"))
+        else:
+            raise ValueError("favorite must be true or false")
+    return ops
 
-    obj, created = GuestFavorite.objects.get_or_create(
-        guest_id=guest_id,
-        paper_id=paper_id
-    )
 
-    if not created:
-        obj.delete()
-        return Response({"status": "removed"})
+@api_view(["POST"])
+def toggle_favorites_bulk(request):
+    try:
+        guest_id = parse_int(request.data.get("guest_id"))
+    except (TypeError, ValueError, AttributeError):
+        return Response({"error": "guest_id must be an integer"}, status=400)
+    try:
+        ops = parse_favorite_ops(request.data.get("toggles"))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+
+    try:
+        results = GuestFavorite.objects.apply(guest_id, ops)
+    except IntegrityError:
+        return Response({"error": "Guest or paper not found"}, status=404)
+    return Response({"results": [
+        {"paper_id": pid, "favorite": favorite, "status": status} for pid, favorite, status in results
+    ]})
+
 
-    return Response({"status": "added"})
+# --------------------------------------------------------
+# 📌 8-1. 인기도 창 이동 (cron 매시간)
+#   7일 창 밖으로 나간 조회수만 weekly_count 에서 빼고 popular_paper 재계산 (services/popularity.py)
+#   예전 주간 reset(reset-weekly) 대신, 전체 행을 0 으로 만들지 않음
+#   weekly_count 가 바뀌므로 추천 후보(recommend_candidate)도 같이 다시 계산
+#   지난 roll 뒤로 즐겨찾기가 바뀐 논문의 "같이 저장한 논문" 도 여기서 갱신
+# --------------------------------------------------------
+@api_view(["POST"])
+def roll_popularity(request):
+    changed = popularity.roll()
+    candidates = recommend.refresh_candidates()
+    neighbors = itemcf.refresh()
+    return Response({
+        "status": "ok", "expired_papers": changed, "recommend_candidates": candidates, "neighbor_papers": neighbors,
+    })
 
-## Weekly_count reset
 
+# --------------------------------------------------------
+# 📌 8-2. 인용 그래프 influence 재계산 (cron 매일)
+#   paperreference PageRank → paper.influence (services/influence.py), 이전 값에서 시작
+#   ?cold=1 이면 균등 분포에서 다시 시작
+# --------------------------------------------------------
 @api_view(["POST"])
-def reset_weekly(request):
-    Paper.objects.update(weekly_count=0)
-    return Response({"status": "ok", "msg": "weekly_count reset"})
\ No newline at end of file
+def refresh_influence(request):
+    stats = influence.run(warm=request.GET.get("cold") not in ("1", "true"))
+    return Response({"status": "ok", **stats})
+
+
+# --------------------------------------------------------
+# 📌 9. 결과 캐시 hit/miss 통계
+# --------------------------------------------------------
+@api_view(["GET"])
+def result_cache_stats(request):
+    return Response({"data_version": data_version(), "endpoints": cache_stats()})
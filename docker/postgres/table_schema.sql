@@ -47,6 +47,9 @@ CREATE TABLE IF NOT EXISTS paper(
   weekly_count INTEGER DEFAULT 0,
   submit TEXT,
   alex_paper_id TEXT UNIQUE,
+  search_vector TSVECTOR,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  influence DOUBLE PRECISION,
   FOREIGN KEY (category_id) REFERENCES category(category_id),
   FOREIGN KEY (institution_id) REFERENCES institution(institution_id)
 );
@@ -119,3 +122,232 @@ CREATE TABLE IF NOT EXISTS authorpaper(
   FOREIGN KEY (paper_id) REFERENCES paper(paper_id),
   FOREIGN KEY (author_id) REFERENCES author(author_id)
 );
+
+----------------------------------------------------
+-- DATA VERSION (단일 행, ingest 때마다 +1)
+-- API 결과 캐시 키에 포함 → 값이 바뀌면 이전 캐시는 더 이상 조회되지 않음
+----------------------------------------------------
+CREATE TABLE IF NOT EXISTS data_version(
+  id SMALLINT PRIMARY KEY CHECK (id = 1),
+  version BIGINT NOT NULL DEFAULT 0,
+  changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO data_version (id) VALUES (1) ON CONFLICT DO NOTHING;
+
+----------------------------------------------------
+-- POPULARITY (paper.weekly_count = 최근 7일 조회수)
+-- 조회수는 시간 단위 bucket 에 누적, 창 밖 bucket 은 weekly_count 에서 빼고 삭제
+-- popular_paper: weekly_count 상위 K 편 (popular-weekly 는 이 표만 읽음)
+----------------------------------------------------
+CREATE TABLE IF NOT EXISTS paper_view_hourly(
+  id BIGSERIAL PRIMARY KEY,
+  paper_id INTEGER NOT NULL,
+  hour TIMESTAMPTZ NOT NULL,
+  hits INTEGER NOT NULL DEFAULT 0,
+  UNIQUE(paper_id, hour),
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS paper_view_hourly_hour_idx ON paper_view_hourly (hour);
+
+CREATE TABLE IF NOT EXISTS popular_paper(
+  rank SMALLINT PRIMARY KEY,
+  paper_id INTEGER NOT NULL UNIQUE,
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE
+);
+
+----------------------------------------------------
+-- CITATION GRAPH (OpenAlex referenced_works)
+-- 인용 대상은 아직 DB 에 없을 수도 있으므로 alex id 로 저장, paper.alex_paper_id 와 join
+-- paper.influence: 이 그래프의 PageRank (평균 1.0, services/influence.py 가 계산)
+----------------------------------------------------
+CREATE TABLE IF NOT EXISTS paperreference(
+  reference_id BIGSERIAL PRIMARY KEY,
+  paper_id INTEGER NOT NULL,
+  referenced_alex_id TEXT NOT NULL,
+  UNIQUE(paper_id, referenced_alex_id),
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE
+);
+
+----------------------------------------------------
+-- RECOMMEND CANDIDATES (recommend_by_guest)
+-- 카테고리마다 점수(최신성 + 인용 + 최근 인용 속도 + weekly_count) 상위 K 편
+-- 요청은 guest 의 상위 카테고리 몇 개의 (category_id, rank) 앞부분만 읽음
+----------------------------------------------------
+CREATE TABLE IF NOT EXISTS recommend_candidate(
+  paper_id INTEGER PRIMARY KEY,
+  category_id INTEGER NOT NULL,
+  rank INTEGER NOT NULL,
+  score DOUBLE PRECISION NOT NULL,
+  UNIQUE(category_id, rank),
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE,
+  FOREIGN KEY (category_id) REFERENCES category(category_id) ON DELETE CASCADE
+);
+
+----------------------------------------------------
+-- ALSO SAVED (item-item collaborative filtering, services/itemcf.py)
+-- paper_neighbor: 논문마다 공동 저장 cosine 상위 K 개
+-- paper_neighbor_dirty: 즐겨찾기가 바뀌어 다시 계산할 논문 (트리거가 기록, refresh 가 비움)
+----------------------------------------------------
+CREATE TABLE IF NOT EXISTS paper_neighbor(
+  id BIGSERIAL PRIMARY KEY,
+  paper_id INTEGER NOT NULL,
+  rank SMALLINT NOT NULL,
+  neighbor_id INTEGER NOT NULL,
+  score REAL NOT NULL,
+  UNIQUE(paper_id, rank),
+  FOREIGN KEY (paper_id) REFERENCES paper(paper_id) ON DELETE CASCADE,
+  FOREIGN KEY (neighbor_id) REFERENCES paper(paper_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS paper_neighbor_dirty(
+  paper_id INTEGER PRIMARY KEY
+);
+
+-- 저장: 그 논문의 저장 수가 바뀜 (같이 저장한 논문들은 refresh 때 공동 저장으로 찾음)
+--   단 이번 저장으로 즐겨찾기가 CF_MAX_GUEST_FAVORITES(500) 를 넘으면 그 guest 는 계산에서 빠짐
+--   → refresh 가 공동 저장으로 찾지 못하므로 그 guest 의 즐겨찾기 전부 표시
+-- 취소: 그 guest 의 나머지 즐겨찾기와의 공동 저장도 줄어듦 → 같이 표시
+CREATE OR REPLACE FUNCTION guestfavorite_mark_neighbors() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    -- 이 행 앞의 즐겨찾기 수 (여러 행 INSERT 에서도 경계를 넘는 행 하나만 해당)
+    IF (SELECT COUNT(*) FROM guestfavorite WHERE guest_id = NEW.guest_id AND favorite_id < NEW.favorite_id) = 500 THEN
+      INSERT INTO paper_neighbor_dirty (paper_id)
+      SELECT paper_id FROM guestfavorite WHERE guest_id = NEW.guest_id
+      ON CONFLICT DO NOTHING;
+    ELSE
+      INSERT INTO paper_neighbor_dirty (paper_id) VALUES (NEW.paper_id) ON CONFLICT DO NOTHING;
+    END IF;
+  ELSE
+    INSERT INTO paper_neighbor_dirty (paper_id)
+    SELECT OLD.paper_id UNION SELECT paper_id FROM guestfavorite WHERE guest_id = OLD.guest_id
+    ON CONFLICT DO NOTHING;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS guestfavorite_mark_neighbors_trigger ON guestfavorite;
+CREATE TRIGGER guestfavorite_mark_neighbors_trigger
+AFTER INSERT OR DELETE ON guestfavorite
+FOR EACH ROW EXECUTE FUNCTION guestfavorite_mark_neighbors();
+
+----------------------------------------------------
+-- CATEGORY INTEREST ROLLUP (trending-category)
+-- guestcategorycount 변화량을 (category, day) 별로 누적 → 최근 N일 트렌드는 day 범위 합
+-- 1970-01-01 행은 rollup 도입 전 누적분 (전체 기간 합 = guestcategorycount 합)
+----------------------------------------------------
+CREATE TABLE IF NOT EXISTS category_interest_daily(
+  id BIGSERIAL PRIMARY KEY,
+  category_id INTEGER NOT NULL,
+  day DATE NOT NULL,
+  delta INTEGER NOT NULL DEFAULT 0,
+  UNIQUE(category_id, day),
+  FOREIGN KEY (category_id) REFERENCES category(category_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS category_interest_day_idx ON category_interest_daily (day);
+
+CREATE OR REPLACE FUNCTION category_interest_add(cid INTEGER, amount INTEGER) RETURNS VOID AS $$
+  INSERT INTO category_interest_daily (category_id, day, delta)
+  VALUES (cid, (now() AT TIME ZONE 'UTC')::date, amount)
+  ON CONFLICT (category_id, day) DO UPDATE
+  SET delta = category_interest_daily.delta + EXCLUDED.delta;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION guestcategorycount_rollup() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'UPDATE' AND NEW.category_id = OLD.category_id THEN
+    IF NEW.count IS DISTINCT FROM OLD.count THEN
+      PERFORM category_interest_add(NEW.category_id, COALESCE(NEW.count, 0) - COALESCE(OLD.count, 0));
+    END IF;
+    RETURN NULL;
+  END IF;
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM category_interest_add(OLD.category_id, -COALESCE(OLD.count, 0));
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM category_interest_add(NEW.category_id, COALESCE(NEW.count, 0));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS guestcategorycount_rollup_trigger ON guestcategorycount;
+CREATE TRIGGER guestcategorycount_rollup_trigger
+AFTER INSERT OR UPDATE OF count, category_id OR DELETE ON guestcategorycount
+FOR EACH ROW EXECUTE FUNCTION guestcategorycount_rollup();
+
+----------------------------------------------------
+-- FULL-TEXT SEARCH (paper.search_vector)
+-- title(A) > submit(B) > abstract.context(C)
+-- ingest 스크립트(api_call.py, merge_and_insert.py)가 어떤 경로로 쓰든 트리거가 벡터를 최신으로 유지
+----------------------------------------------------
+CREATE OR REPLACE FUNCTION paper_search_document(title TEXT, submit TEXT, context TEXT)
+RETURNS TSVECTOR AS $$
+  SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+         setweight(to_tsvector('english', coalesce(submit, '')), 'B') ||
+         setweight(to_tsvector('english', coalesce(context, '')), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION paper_search_vector_update() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.search_vector := paper_search_document(
+    NEW.title, NEW.submit,
+    (SELECT context FROM abstract WHERE paper_id = NEW.paper_id)
+  );
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION abstract_search_vector_update() RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE paper
+  SET search_vector = paper_search_document(title, submit, NEW.context)
+  WHERE paper_id = NEW.paper_id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS paper_search_vector_trigger ON paper;
+CREATE TRIGGER paper_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, submit ON paper
+FOR EACH ROW EXECUTE FUNCTION paper_search_vector_update();
+
+DROP TRIGGER IF EXISTS abstract_search_vector_trigger ON abstract;
+CREATE TRIGGER abstract_search_vector_trigger
+AFTER INSERT OR UPDATE OF context ON abstract
+FOR EACH ROW EXECUTE FUNCTION abstract_search_vector_update();
+
+CREATE INDEX IF NOT EXISTS paper_search_vector_idx ON paper USING GIN (search_vector);
+
+----------------------------------------------------
+-- TRIGRAM SEARCH (search_papers?mode=fuzzy)
+----------------------------------------------------
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS paper_title_trgm_idx ON paper USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS paper_submit_trgm_idx ON paper USING GIN (submit gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS author_name_trgm_idx ON author USING GIN (author_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS authorpaper_author_id_idx ON authorpaper (author_id);
+
+----------------------------------------------------
+-- FILTER / SORT INDEXES (advanced_search, keyset pagination, 인기 논문)
+-- 정렬 키는 (정렬 컬럼 DESC NULLS LAST, paper_id DESC)
+----------------------------------------------------
+CREATE INDEX IF NOT EXISTS paper_announce_idx ON paper (announcement_date DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_citation_idx ON paper (citation DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_weekly_count_idx ON paper (weekly_count DESC, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_cat_announce_idx ON paper (category_id, announcement_date DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_cat_citation_idx ON paper (category_id, citation DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_influence_idx ON paper (influence DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_cat_influence_idx ON paper (category_id, influence DESC NULLS LAST, paper_id DESC);
+CREATE INDEX IF NOT EXISTS paper_oa_announce_idx ON paper (announcement_date DESC NULLS LAST, paper_id DESC) WHERE open_access;
+CREATE INDEX IF NOT EXISTS paper_oa_citation_idx ON paper (citation DESC NULLS LAST, paper_id DESC) WHERE open_access;
+CREATE INDEX IF NOT EXISTS paper_institution_idx ON paper (institution_id);
+-- BM25 / semantic 인덱스 증분 반영 (updated_at >= 마지막 반영 시각)
+CREATE INDEX IF NOT EXISTS paper_updated_at_idx ON paper (updated_at);
+CREATE INDEX IF NOT EXISTS institution_country_idx ON institution (country_code);
+CREATE INDEX IF NOT EXISTS guestfavorite_guest_idx ON guestfavorite (guest_id, favorite_id DESC);